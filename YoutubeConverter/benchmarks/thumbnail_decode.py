@@ -0,0 +1,76 @@
+"""Thumbnail decode benchmark: full decode vs. the service's draft decode.
+
+Run from the application directory:
+
+    python benchmarks/thumbnail_decode.py [image.jpg ...]
+
+Without arguments a maxresdefault-sized synthetic JPEG is used.
+"""
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+from io import BytesIO
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from services.thumbnail_service import ThumbnailService
+
+
+def full_decode(data: bytes, size: Tuple[int, int]) -> Image.Image:
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+
+def measure(decode: Callable[[], Image.Image], runs: int = 20) -> Tuple[float, int]:
+    decode()
+    started = time.perf_counter()
+    for _ in range(runs):
+        decode()
+    elapsed_ms = (time.perf_counter() - started) * 1000 / runs
+    tracemalloc.start()
+    decode()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed_ms, peak
+
+
+def main(paths) -> None:
+    if paths:
+        samples = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                samples.append((os.path.basename(path), f.read()))
+    else:
+        # A maxresdefault-sized JPEG with photo-like noise
+        buffer = BytesIO()
+        Image.effect_noise((1280, 720), 64).convert('RGB').save(buffer, 'JPEG', quality=85)
+        samples = [('synthetic 1280x720', buffer.getvalue())]
+
+    service = ThumbnailService(cache_dir=tempfile.mkdtemp(prefix='thumbnails-'))
+    # tracemalloc only sees Python allocations, not Pillow's pixel buffers,
+    # so the decoded buffer size is reported next to its peak
+    for name, data in samples:
+        source = Image.open(BytesIO(data))
+        print(f"{name} ({source.size[0]}x{source.size[1]} {source.format})")
+        for width in (180, 320, 640):
+            height = max(1, round(width * source.height / source.width))
+            full_ms, full_peak = measure(lambda: full_decode(data, (width, height)))
+            draft_ms, draft_peak = measure(lambda: service._decode(data, (width, height), False))
+            decoded = service.get_stats()['last_decode']
+            full_bytes = source.size[0] * source.size[1] * len(source.getbands())
+            print(
+                f"  {width}x{height}: full {full_ms:.2f} ms, {full_bytes / 1024:.0f} KiB decoded, "
+                f"{full_peak / 1024:.0f} KiB traced peak | draft {draft_ms:.2f} ms, "
+                f"{decoded['decoded_bytes'] / 1024:.0f} KiB decoded "
+                f"({decoded['decoded_size'][0]}x{decoded['decoded_size'][1]}), "
+                f"{draft_peak / 1024:.0f} KiB traced peak"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
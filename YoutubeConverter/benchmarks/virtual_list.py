@@ -0,0 +1,62 @@
+"""VirtualList render-time benchmark (needs a display).
+
+Run from the application directory:
+
+    python benchmarks/virtual_list.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter as ctk
+from components.virtual_list import VirtualList
+
+ROW_HEIGHT = 60
+
+
+def create_row(parent):
+    row = ctk.CTkFrame(parent, height=ROW_HEIGHT, fg_color="#232323")
+    row.pack_propagate(False)
+    row.title = ctk.CTkLabel(row, text="")
+    row.title.pack(anchor="w", padx=15)
+    row.desc = ctk.CTkLabel(row, text="", text_color="#888888")
+    row.desc.pack(anchor="w", padx=15)
+    return row
+
+
+def bind_row(row, item):
+    row.title.configure(text=item['title'])
+    row.desc.configure(text=item['desc'])
+
+
+def main() -> None:
+    root = ctk.CTk()
+    root.geometry("800x600")
+    virtual_list = VirtualList(root, row_height=ROW_HEIGHT, create_row=create_row, bind_row=bind_row)
+    virtual_list.pack(fill="both", expand=True)
+    root.update()
+
+    for count in (1_000, 10_000, 100_000):
+        items = [{'title': f"Download {i}", 'desc': f"Format: MP4 • Quality: 1080p • #{i}"} for i in range(count)]
+        fetch = lambda offset, limit, items=items: items[offset:offset + limit]
+        started = time.perf_counter()
+        virtual_list.set_source(count, fetch)
+        root.update()
+        first_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        steps = 200
+        for step in range(steps):
+            virtual_list.scroll_to(step * count * ROW_HEIGHT / steps)
+            root.update()
+        scroll_ms = (time.perf_counter() - started) * 1000 / steps
+        stats = virtual_list.get_stats()
+        print(f"{count:>7} rows: first render {first_ms:.1f} ms, {scroll_ms:.2f} ms per scroll, "
+              f"{stats['rows_alive']} rows alive, max render {stats['max_render_ms']:.2f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
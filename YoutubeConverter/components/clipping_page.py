@@ -1,12 +1,15 @@
 import customtkinter as ctk
 from ui_helper import UIHelper
 from PIL import Image
-import urllib.request
-from io import BytesIO
 import threading
 import logging
-import requests
+import humanize
+from datetime import timedelta
 from services.youtube_api import api
+from services.thumbnail_service import thumbnail_service
+from services.download_queue import download_queue, PRIORITY_HIGH
+from services.clip_engine import clip_engine
+from utils.url_parser import parse_timestamp
 from utils.cookie_manager import cookie_manager
 import os
 
@@ -182,15 +185,54 @@ class ClippingPage(ctk.CTkFrame):
         )
         self.end_time.pack(pady=5)
 
-        # Clip button
-        self.clip_button = ctk.CTkButton(
+        # Clip buttons
+        self.clip_buttons_frame = ctk.CTkFrame(
             self.preview_frame,
+            fg_color="transparent",
+        )
+        self.clip_buttons_frame.pack(pady=15)
+
+        self.add_range_button = ctk.CTkButton(
+            self.clip_buttons_frame,
+            text="Add to Batch",
+            font=("Segoe UI", 14),
+            height=35,
+            fg_color=ACCENT_COLOR,
+            hover_color=HOVER_COLOR,
+            command=self.add_clip_range
+        )
+        self.add_range_button.pack(side="left", padx=5)
+
+        self.clip_button = ctk.CTkButton(
+            self.clip_buttons_frame,
             text="Create Clip",
             font=("Segoe UI", 14),
             height=35,
             command=self.create_clip
         )
-        self.clip_button.pack(pady=15)
+        self.clip_button.pack(side="left", padx=5)
+
+        # Ranges queued for a batch; all of them are cut from one download
+        self.clip_ranges = []
+        self.clip_ranges_url = None
+        self.clip_ranges_label = ctk.CTkLabel(
+            self.preview_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color="#888888",
+            wraplength=400
+        )
+        self.clip_ranges_label.pack()
+
+        # Clip status
+        self.clip_status_label = ctk.CTkLabel(
+            self.preview_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color="#888888",
+            wraplength=400
+        )
+        self.clip_status_label.pack(pady=(0, 15))
 
     def paste_url(self):
         """Paste URL from clipboard"""
@@ -265,22 +307,22 @@ class ClippingPage(ctk.CTkFrame):
             return
 
         try:
-            # Update thumbnail
-            if 'thumbnail_url' in video_info:
-                response = requests.get(video_info['thumbnail_url'])
-                if response.status_code == 200:
-                    img = Image.open(BytesIO(response.content))
-                    
-                    # Resize image for preview
-                    img = UIHelper.resize_image(img, (320, 180))
-                    
-                    # Create CTkImage
-                    ctk_img = ctk.CTkImage(light_image=img, dark_image=img, 
-                                         size=(320, 180))
-                    
-                    # Update thumbnail label
-                    self.thumbnail_label.configure(image=ctk_img)
-                    self.current_thumbnail = ctk_img
+            # Update thumbnail off the UI thread (instant if already cached)
+            thumbnail_url = video_info.get('thumbnail_url')
+            self.current_thumbnail_url = thumbnail_url
+
+            def show_thumbnail(img):
+                if img is None or thumbnail_url != self.current_thumbnail_url:
+                    return
+                # Create CTkImage
+                ctk_img = ctk.CTkImage(light_image=img, dark_image=img,
+                                     size=(320, 180))
+
+                # Update thumbnail label
+                self.thumbnail_label.configure(image=ctk_img)
+                self.current_thumbnail = ctk_img
+
+            thumbnail_service.load(thumbnail_url, (320, 180), self, show_thumbnail, pad=True)
 
             # Update title
             self.title_label.configure(text=video_info.get('title', 'Unknown Title'))
@@ -297,13 +339,102 @@ class ClippingPage(ctk.CTkFrame):
         """Show error message"""
         self.title_label.configure(text=message)
         self.thumbnail_label.configure(image=None)
+        self.current_thumbnail_url = None
 
     def show_home(self):
         """Show the home page"""
         self.preview_frame.pack_forget()
         self.home_frame.pack(fill="both", expand=True)
 
+    def _read_range(self):
+        """Return the (start, end) seconds in the time fields, or None if invalid"""
+        start = parse_timestamp(self.start_time.get() or "0")
+        end = parse_timestamp(self.end_time.get())
+        if start is None or end is None or end <= start:
+            self.clip_status_label.configure(text="Enter a start and end time, e.g. 1:30 and 2:00")
+            return None
+        return start, end
+
+    def add_clip_range(self):
+        """Queue the current time range for a batch of clips"""
+        clip_range = self._read_range()
+        if clip_range is None:
+            return
+        url = self.url_entry.get().strip()
+        if url != self.clip_ranges_url:
+            # A batch only ever holds ranges of one video
+            self.clip_ranges = []
+            self.clip_ranges_url = url
+        if clip_range not in self.clip_ranges:
+            self.clip_ranges.append(clip_range)
+        self._update_clip_ranges_label()
+        self.clip_status_label.configure(text="")
+        self.start_time.delete(0, "end")
+        self.end_time.delete(0, "end")
+
+    def _update_clip_ranges_label(self):
+        if not self.clip_ranges:
+            self.clip_ranges_label.configure(text="")
+            return
+        ranges = ", ".join(
+            f"{timedelta(seconds=int(start))}-{timedelta(seconds=int(end))}" for start, end in self.clip_ranges
+        )
+        self.clip_ranges_label.configure(text=f"Batch ({len(self.clip_ranges)}): {ranges}")
+
     def create_clip(self):
-        """Create a clip from the video"""
-        # This will be implemented later
-        pass
+        """Create a clip, or every clip in the batch, from the video"""
+        url = self.url_entry.get().strip()
+        if not url:
+            self.clip_status_label.configure(text="Enter a YouTube URL first")
+            return
+        ranges = list(self.clip_ranges) if url == self.clip_ranges_url else []
+        if self.end_time.get().strip() or not ranges:
+            clip_range = self._read_range()
+            if clip_range is None:
+                return
+            if clip_range not in ranges:
+                ranges.append(clip_range)
+
+        output_path = os.path.join(os.path.expanduser("~"), "Downloads", "YouTube Converter", "clips")
+        self.clip_button.configure(state="disabled")
+        self.clip_status_label.configure(
+            text="Creating clip..." if len(ranges) == 1 else f"Creating {len(ranges)} clips..."
+        )
+
+        def run_clip(job):
+            try:
+                report = clip_engine.create_clips(url, ranges, output_path, cancel_token=job.cancel_token)
+                self.after(0, lambda: self._show_clip_report(report))
+            except Exception as e:
+                logging.error(f"Error creating clip: {e}")
+                self.after(0, lambda: self._show_clip_error("Error creating clip"))
+
+        # Clips are interactive, so they jump ahead of queued downloads
+        download_queue.submit(url, run_clip, priority=PRIORITY_HIGH)
+
+    def _show_clip_report(self, report):
+        """Show where the clips went and how much was downloaded for them"""
+        self.clip_button.configure(state="normal")
+        self.clip_ranges = []
+        self._update_clip_ranges_label()
+        clips = report['clips']
+        if len(clips) == 1:
+            text = f"Clip saved: {os.path.basename(clips[0]['filepath'])}\n"
+        else:
+            text = f"{len(clips)} clips saved from {report['sections']} download section(s)\n"
+        text += f"Downloaded {humanize.naturalsize(report['bytes_transferred'])}"
+        if report['full_size']:
+            text += (f" of {humanize.naturalsize(report['full_size'])} for the full video"
+                     f" ({report['transfer_ratio']:.1%})")
+        strategies = sorted({clip['strategy'] for clip in clips})
+        text += f"\nCut: {', '.join(strategies)}"
+        if len(clips) == 1:
+            text += f" ({clips[0]['reason']})"
+        saved = sum(clip['encode_time_saved'] or 0 for clip in clips)
+        if saved:
+            text += f", about {saved:.1f}s of encoding saved"
+        self.clip_status_label.configure(text=text)
+
+    def _show_clip_error(self, message):
+        self.clip_button.configure(state="normal")
+        self.clip_status_label.configure(text=message)
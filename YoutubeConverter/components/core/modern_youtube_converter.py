@@ -16,6 +16,7 @@ from components.notification_popover import NotificationPopover
 from components.custom_dropdown import CustomDropdown
 from components.tooltip import ModernTooltip
 from services.youtube_api import YouTubeAPI
+from services.service_stats import log_service_stats
 
 # Configure logging
 logging.basicConfig(
@@ -833,6 +834,7 @@ class YoutubeConverterApp(ctk.CTk):
         self.notifications.append(notification)
         if not notification["read"]:
             self.unread_notifications.append(notification)
+        self.notification_popover.index_notification(notification)
         self.update_notification_button()
         self._save_notifications()
 
@@ -923,6 +925,7 @@ class YoutubeConverterApp(ctk.CTk):
     def on_closing(self):
         """Handle window closing event"""
         logger.info("Window closing")
+        log_service_stats()
         self.quit()
         
     def start_move(self, event):
@@ -73,6 +73,48 @@ class DownloadCard(ctk.CTkFrame):
         if self.winfo_exists():
             self.after(0, update)
 
+    def show_progress(self, update: dict):
+        """Render a coalesced progress update (must be called on the UI thread)"""
+        if self._is_cancelled or not self.winfo_exists():
+            return
+
+        phase = update.get('phase')
+        if phase == 'extracting':
+            self.status_label.configure(text="Fetching video details...")
+            return
+        if phase == 'postprocessing':
+            self.progress_bar.set(1)
+            self.status_label.configure(text="Processing...")
+            return
+
+        percent = update.get('percent')
+        if percent is not None:
+            self.progress_bar.set(percent / 100)
+
+        parts = []
+        if percent is not None:
+            parts.append(f"Downloading... {percent:.1f}%")
+        else:
+            parts.append("Downloading...")
+        if update.get('bytes_total'):
+            parts.append(f"{humanize.naturalsize(update['bytes_done'])} of {humanize.naturalsize(update['bytes_total'])}")
+        bandwidth = update.get('bandwidth') or {}
+        if update.get('speed') and bandwidth.get('allocated'):
+            parts.append(f"{humanize.naturalsize(update['speed'])}/s of {humanize.naturalsize(bandwidth['allocated'])}/s allotted")
+        elif update.get('speed'):
+            parts.append(f"{humanize.naturalsize(update['speed'])}/s")
+        if update.get('eta') is not None:
+            parts.append(f"{humanize.precisedelta(int(update['eta']))} left")
+        fragments = update.get('fragment_stats')
+        if fragments:
+            connections = fragments['connections']
+            text = (f"fragment {update.get('fragment_index') or 0}/{update.get('fragment_count') or '?'}"
+                    f" over {connections} connection{'s' if connections != 1 else ''}")
+            if fragments['retries']:
+                text += f", {fragments['retries']} retried"
+            parts.append(text)
+        self.status_label.configure(text=" • ".join(parts))
+
     def _handle_cancel(self):
         """Handle cancel button click"""
         self._is_cancelled = True
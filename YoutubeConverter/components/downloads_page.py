@@ -1,14 +1,24 @@
 import customtkinter as ctk
 import os
-import json
 from datetime import datetime
 from utils.ui_helper import UIHelper
+from services.history_store import history_store
+from services.download_journal import download_journal
+from utils.debounced_lookup import DebouncedLookup
+from .virtual_list import VirtualList
 
 DARKER_COLOR = "#1a1a1a"
 ACCENT_COLOR = "#333333"
 HOVER_COLOR = "#404040"
 TEXT_COLOR = "#ffffff"
 
+# Downloads fetched from the history per page
+PAGE_SIZE = 50
+# A 70px item plus its 5px margins
+ROW_HEIGHT = 80
+# Typing pause before a search runs
+SEARCH_DELAY_MS = 150
+
 class DownloadsPage(ctk.CTkFrame):
     def __init__(self, master, app, on_back_click=None, **kwargs):
         super().__init__(master, **kwargs)
@@ -95,19 +105,49 @@ class DownloadsPage(ctk.CTkFrame):
         )
         self.folder_button.pack(side="right", padx=10)
         
-        # Create content area with scrollable frame
-        self.content = ctk.CTkScrollableFrame(
+        # Create content area
+        self.content = ctk.CTkFrame(
             self,
             fg_color="#1a1a1a",
             corner_radius=0
         )
         self.content.pack(fill="both", expand=True, padx=15, pady=15)
+        self.add_section_title()
+        
+        # Empty state, shown instead of the list
+        self.empty_frame = ctk.CTkFrame(self.content, fg_color="#232323", corner_radius=8)
+        self.empty_label = ctk.CTkLabel(
+            self.empty_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=14),
+            text_color="#888888"
+        )
+        self.empty_label.pack(padx=15, pady=30)
+        
+        # Only the visible rows exist; they are refilled while scrolling
+        self.download_list = VirtualList(
+            self.content,
+            row_height=ROW_HEIGHT,
+            create_row=self.create_download_row,
+            bind_row=self.bind_download_row,
+            page_size=PAGE_SIZE,
+            fg_color="#1a1a1a"
+        )
+        
+        # Searches run on a worker thread once typing pauses
+        self.search = DebouncedLookup(
+            self,
+            fetch=history_store.search,
+            on_result=self._on_search_result,
+            delay_ms=SEARCH_DELAY_MS
+        )
         
         # Add downloads content
+        self.query = ""
         self.add_downloads_sections()
     
-    def add_section_title(self, text):
-        """Add a section title to the downloads page"""
+    def add_section_title(self):
+        """Add the section title above the downloads list"""
         frame = UIHelper.create_section_frame(
             self.content,
             height=50,
@@ -115,25 +155,27 @@ class DownloadsPage(ctk.CTkFrame):
         )
         frame.pack(fill="x", pady=(20, 10))
         
-        label = ctk.CTkLabel(
+        self.section_label = ctk.CTkLabel(
             frame,
-            text=text,
+            text="Recent Downloads",
             font=ctk.CTkFont(family="Segoe UI", size=16, weight="bold"),
             text_color="#ffffff"
         )
-        label.pack(side="left")
+        self.section_label.pack(side="left")
         
         # Add separator
         separator = ctk.CTkFrame(self.content, fg_color="#333333", height=1)
         separator.pack(fill="x", pady=(0, 10))
 
-    def add_download_item(self, download):
-        """Add a download item to the list"""
+    def create_download_row(self, parent):
+        """Create an empty download row; bind_download_row fills it"""
+        row = ctk.CTkFrame(parent, fg_color="transparent", height=ROW_HEIGHT, corner_radius=0)
+        row.pack_propagate(False)
+        row.download = None
         frame = UIHelper.create_section_frame(
-            self.content,
+            row,
             fg_color="#232323"
         )
-        frame.pack(fill="x", pady=5)
         
         # Main content frame
         content_frame = ctk.CTkFrame(frame, fg_color="transparent")
@@ -143,35 +185,41 @@ class DownloadsPage(ctk.CTkFrame):
         info_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         info_frame.pack(side="left", fill="x", expand=True)
         
-        # Create text container for title and info
-        UIHelper.create_text_container(
-            info_frame,
-            title=download["title"],
-            description=f"Format: {download['format']} • Quality: {download['quality']} • Size: {self.format_size(download['size'])}",
-            title_font=("Segoe UI", 14),
-            desc_font=("Segoe UI", 12),
-            title_color="#ffffff",
-            desc_color="#888888"
+        text_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+        text_frame.pack(side="left", fill="both", expand=True)
+        row.title_label = ctk.CTkLabel(
+            text_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=14),
+            text_color="#ffffff"
         )
+        row.title_label.pack(anchor="w")
+        row.desc_label = ctk.CTkLabel(
+            text_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            text_color="#888888"
+        )
+        row.desc_label.pack(anchor="w")
         
         # Add date
-        date_label = ctk.CTkLabel(
+        row.date_label = ctk.CTkLabel(
             info_frame,
-            text=datetime.fromtimestamp(download["timestamp"]).strftime("%Y-%m-%d %H:%M"),
+            text="",
             font=ctk.CTkFont(size=12),
             text_color="#888888"
         )
-        date_label.pack(side="right")
+        row.date_label.pack(side="right")
         
         # Buttons frame
         buttons_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         buttons_frame.pack(side="right", padx=(15, 0))
         
-        # Open button
+        # Buttons act on whichever download the row currently shows
         open_button = UIHelper.create_button(
             buttons_frame,
             text="Open",
-            command=lambda: self.open_file(download["path"]),
+            command=lambda: self.open_file(row.download["path"]),
             width=70,
             height=30,
             fg_color=ACCENT_COLOR,
@@ -179,17 +227,26 @@ class DownloadsPage(ctk.CTkFrame):
         )
         open_button.pack(side="left", padx=5)
         
-        # Delete button
         delete_button = UIHelper.create_button(
             buttons_frame,
             text="Delete",
-            command=lambda: self.delete_download(download, frame),
+            command=lambda: self.delete_download(row.download),
             width=70,
             height=30,
             fg_color="#d32f2f",
             hover_color="#b71c1c"
         )
         delete_button.pack(side="left", padx=5)
+        return row
+
+    def bind_download_row(self, row, download):
+        """Show a download in a (possibly recycled) row"""
+        row.download = download
+        row.title_label.configure(text=download["title"])
+        row.desc_label.configure(
+            text=f"Format: {download['format']} • Quality: {download['quality']} • Size: {self.format_size(download['size'] or 0)}"
+        )
+        row.date_label.configure(text=datetime.fromtimestamp(download["timestamp"]).strftime("%Y-%m-%d %H:%M"))
 
     def format_size(self, size_bytes):
         """Format size in bytes to human readable format"""
@@ -199,17 +256,6 @@ class DownloadsPage(ctk.CTkFrame):
             size_bytes /= 1024
         return f"{size_bytes:.1f} TB"
 
-    def load_downloads(self):
-        """Load downloads from the downloads file"""
-        downloads_file = os.path.join(os.path.dirname(__file__), "downloads.json")
-        try:
-            with open(downloads_file, "r") as f:
-                return json.load(f)
-        except:
-            return {
-                "downloads": []
-            }
-
     def add_downloads_sections(self):
         """Add downloads content sections"""
         self.update_search_results(None)
@@ -226,27 +272,25 @@ class DownloadsPage(ctk.CTkFrame):
         except Exception as e:
             print(f"Error opening file: {e}")
 
-    def delete_download(self, download, frame):
+    def delete_download(self, download):
         """Delete a download and update the UI"""
         try:
             # Delete the actual file
             if os.path.exists(download["path"]):
                 os.remove(download["path"])
             
-            # Remove from downloads.json
-            downloads_data = self.load_downloads()
-            downloads_data["downloads"] = [d for d in downloads_data["downloads"] if d["path"] != download["path"]]
-            
-            downloads_file = os.path.join(os.path.dirname(__file__), "downloads.json")
-            with open(downloads_file, "w") as f:
-                json.dump(downloads_data, f, indent=4)
-            
-            # Remove from UI
-            frame.destroy()
+            # Remove from the history (a tombstone in the download journal)
+            download_journal.remove(download["path"])
             
-            # If no downloads left, show empty state
-            if not downloads_data["downloads"]:
-                self.add_downloads_sections()
+            # Refill the rows; if no downloads are left, show the empty state
+            if self.query:
+                self.search.submit(self.query, immediate=True)
+                return
+            total = history_store.count()
+            if total:
+                self.download_list.refresh(total)
+            else:
+                self.update_search_results(None)
                 
         except Exception as e:
             print(f"Error deleting download: {e}")
@@ -278,54 +322,43 @@ class DownloadsPage(ctk.CTkFrame):
 
     def update_search_results(self, event):
         """Update the downloads list based on search query"""
-        # Clear current content
-        for widget in self.content.winfo_children():
-            widget.destroy()
-            
         # Get search query
-        query = self.search_entry.get().lower().strip()
-        
-        # Load all downloads
-        downloads_data = self.load_downloads()
+        self.query = self.search_entry.get().strip()
+        if self.query:
+            self.search.submit(self.query)
+            return
         
-        if not downloads_data["downloads"]:
-            self.add_section_title("Recent Downloads")
+        # Without a query the whole history is paged from the store, newest first
+        self.search.cancel()
+        self.section_label.configure(text="Recent Downloads")
+        total = history_store.count()
+        if not total:
             self.show_empty_state()
             return
-            
-        # Filter downloads based on search query
-        filtered_downloads = []
-        for download in downloads_data["downloads"]:
-            if query:
-                # Search in title, format, and quality
-                if (query in download["title"].lower() or
-                    query in download["format"].lower() or
-                    query in download["quality"].lower()):
-                    filtered_downloads.append(download)
-            else:
-                filtered_downloads.append(download)
-        
-        # Show results
-        if filtered_downloads:
-            self.add_section_title("Recent Downloads")
-            for download in reversed(filtered_downloads):  # Show newest first
-                self.add_download_item(download)
-        else:
-            self.add_section_title("Search Results")
+        self.show_downloads(total, history_store.query)
+    
+    def _on_search_result(self, query, results):
+        """Show ranked search results (called on the UI thread)"""
+        if query != self.query or not self.winfo_exists():
+            return
+        self.section_label.configure(text=f"Search Results ({len(results)})" if results else "Search Results")
+        if not results:
             self.show_empty_state("No matching downloads found")
+            return
+        # Matches are ranked up front; rows are looked up a page at a time
+        self.show_downloads(len(results), results.page)
+    
+    def show_downloads(self, total, fetch):
+        """Show total downloads read through fetch(offset, limit)"""
+        self.empty_frame.pack_forget()
+        self.download_list.pack(fill="both", expand=True)
+        self.download_list.set_source(total, fetch)
     
     def show_empty_state(self, message="No downloads yet"):
         """Show empty state message"""
-        empty_frame = ctk.CTkFrame(self.content, fg_color="#232323", corner_radius=8)
-        empty_frame.pack(fill="x", pady=5)
-        
-        empty_label = ctk.CTkLabel(
-            empty_frame,
-            text=message,
-            font=ctk.CTkFont(family="Segoe UI", size=14),
-            text_color="#888888"
-        )
-        empty_label.pack(padx=15, pady=30)
+        self.download_list.pack_forget()
+        self.empty_label.configure(text=message)
+        self.empty_frame.pack(fill="x", pady=5)
 
     @staticmethod
     def open(parent_frame, app, on_back_click):
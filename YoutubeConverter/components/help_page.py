@@ -130,7 +130,8 @@ class HelpPage(ctk.CTkFrame):
 A: We support MP4, MKV, and WebM formats.
 
 Q: What audio formats can I extract?
-A: You can extract audio in MP3, WAV, AAC, and M4A formats.
+A: You can extract audio in MP3, M4A, AAC, OPUS, FLAC, and WAV formats. Choose the format in Settings;
+when the video's audio is already in that format it is copied without re-encoding.
 
 Q: Where are my downloads saved?
 A: By default, files are saved to your Downloads folder. You can change this in Settings.
@@ -2,23 +2,30 @@ import customtkinter as ctk
 from components.buttons import AnimatedButton
 from components.download_card import DownloadCard
 from PIL import Image
-import urllib.request
-from io import BytesIO
 import threading
-import re
 import os
 from datetime import timedelta
 import humanize
 import logging
 import json
 from datetime import datetime
-import requests
+from typing import Optional
 from services.youtube_api import api
+from services.download_queue import download_queue, DownloadJob
+from services.job_journal import job_journal
+from services.download_journal import download_journal
+from services.progress_aggregator import progress_aggregator
+from services.playlist_ingest import PlaylistIngestion
+from services.thumbnail_service import thumbnail_service
+from yt_dlp.utils import DownloadCancelled
 from utils.widget_manager import manager as widget_manager
 from utils.settings_manager import SettingsManager
 from utils.ui_helper import UIHelper
 from utils.browser_automation import BrowserAutomation
 from utils.cookie_manager import cookie_manager
+from utils.event_manager import EventManager
+from utils.url_parser import parse_youtube_url, is_collection_url
+from utils.debounced_lookup import DebouncedLookup
 
 # Set up logging
 log_dir = os.path.join(os.path.expanduser("~"), "Downloads", "YouTube Converter", "logs")
@@ -106,6 +113,10 @@ class MainPage(ctk.CTkFrame):
         )
         self.url_entry.pack(side="left", padx=5, fill="x", expand=True)
         self.url_entry.bind('<KeyRelease>', self._on_url_change)  # Add URL change handler
+        # Waits for typing to settle; only the newest lookup updates the preview
+        self.url_lookup = DebouncedLookup(self, self.fetch_video_info, self._on_lookup_result)
+        # (url, video_info) currently shown in the preview
+        self.preview_info = None
         
         # Create a frame for the action buttons to keep them together
         self.buttons_frame = ctk.CTkFrame(self.controls_frame, fg_color=DARKER_COLOR)
@@ -278,7 +289,7 @@ class MainPage(ctk.CTkFrame):
         self.format_var = ctk.StringVar(value="MP4")
         self.format_menu = UIHelper.create_dropdown(
             self.controls_frame,
-            values=["MP4", "MP3"],
+            values=["MP4", "Audio"],
             variable=self.format_var,
             width=80
         )
@@ -345,6 +356,12 @@ class MainPage(ctk.CTkFrame):
         
         # Active downloads
         self.active_downloads = {}
+        self.download_jobs = {}
+        self.playlist_ingestions = {}
+        self._preview_thumbnail_url = None
+        EventManager.subscribe("download_queue_changed", self._on_queue_changed)
+        self.after(500, self._resume_interrupted_downloads)
+        progress_aggregator.attach(self)
         
         self.show_home_page()  # Show home page by default
 
@@ -355,59 +372,184 @@ class MainPage(ctk.CTkFrame):
             return
             
         try:
-            # Get video info
-            video_info = api.get_video_info(url)
-            if not video_info:
+            # Format and quality are captured now since the job may start much later
+            format, quality = self._get_format()
+            output_path = self._get_output_path()
+
+            if is_collection_url(url):
+                # Entries are discovered while downloading, so skip the upfront info lookup
+                self._start_playlist_download(url, f"Playlist: {url}", format, quality, output_path)
                 return
-            
-            # Create download card
-            download_card = DownloadCard(
-                self,
-                title=video_info['title'],
-                on_cancel=lambda: self.cancel_download(url)
-            )
-            download_card.pack(fill="x", padx=40, pady=10)
-            self.active_downloads[url] = download_card
-            
-            # Start download in background thread
-            thread = threading.Thread(
-                target=self._download_thread,
-                args=(url, video_info),
-                daemon=True
-            )
-            thread.start()
+
+            # The preview already looked this URL up; only ask again for a different one
+            if self.preview_info and self.preview_info[0] == url:
+                title = self.preview_info[1]['title']
+            else:
+                video_info = api.get_video_info(url)
+                if not video_info:
+                    return
+                title = video_info['title']
+
+            journal_id = job_journal.add(url, title, format, quality, output_path)
+            self._queue_download(url, title, format, quality, output_path, journal_id,
+                                 extracted_info=api.get_extracted_info(url), interactive=True)
         except Exception as e:
             logging.error(f"Error starting download: {e}")
 
-    def _download_thread(self, url: str, video_info: dict):
-        """Handle download in background thread"""
+    def queue_urls(self, urls):
+        """Queue several pasted video URLs, looking their titles up concurrently"""
+        format, quality = self._get_format()
+        output_path = self._get_output_path()
+
+        def queue(url: str, title: str):
+            journal_id = job_journal.add(url, title, format, quality, output_path)
+            self._queue_download(url, title, format, quality, output_path, journal_id,
+                                 extracted_info=api.get_extracted_info(url))
+
+        def resolve():
+            # Each URL is queued as soon as its lookup finishes
+            for url, video_info in api.prefetch_video_info(urls):
+                if not video_info:
+                    logging.error(f"Could not fetch video information for pasted URL: {url}")
+                    continue
+                self.after(0, lambda url=url, title=video_info['title']: queue(url, title))
+
+        threading.Thread(target=resolve, daemon=True).start()
+
+    def _get_format(self):
+        """Format and quality of new downloads"""
+        format = self.format_var.get().lower()
+        quality = self.quality_var.get()
+        if format != 'mp4':
+            # Audio jobs use the codec and bitrate chosen in Settings
+            format = self.settings_manager.get_setting('audio_format').lower()
+            quality = self.settings_manager.get_setting('audio_quality')
+        return format, quality
+
+    def _get_output_path(self) -> str:
+        """Get the directory downloads are written to"""
+        return os.path.join(os.path.expanduser("~"), "Downloads", "YouTube Converter", "downloads")
+
+    def _queue_download(self, url: str, title: str, format: str, quality: str,
+                        output_path: str, journal_id: str, status: str = "Queued...",
+                        extracted_info: Optional[dict] = None, interactive: bool = False):
+        """Create a download card and hand the job to the shared worker pool.
+
+        extracted_info is the preview's full extraction, reused by the
+        download while its stream URLs are valid. interactive downloads get
+        bandwidth ahead of resumed and playlist downloads.
+        """
+        download_card = DownloadCard(
+            self,
+            title=title,
+            on_cancel=lambda: self.cancel_download(url)
+        )
+        download_card.pack(fill="x", padx=40, pady=10)
+        download_card.update_progress(0, status)
+        self.active_downloads[url] = download_card
+
+        job = download_queue.submit(
+            url,
+            lambda job: self._download_thread(url, format, quality, output_path, job, journal_id,
+                                              extracted_info, interactive)
+        )
+        self.download_jobs[url] = job
+        progress_aggregator.subscribe(job.id, download_card.show_progress)
+
+    def _start_playlist_download(self, url: str, title: str, format: str, quality: str, output_path: str):
+        """Stream a playlist or channel into the download queue entry by entry"""
+        download_card = DownloadCard(
+            self,
+            title=title,
+            on_cancel=lambda: self.cancel_download(url)
+        )
+        download_card.pack(fill="x", padx=40, pady=10)
+        download_card.update_progress(0, "Fetching playlist entries...")
+        self.active_downloads[url] = download_card
+
+        def make_job_body(entry: dict):
+            # Playlist entries have no card of their own; the playlist card
+            # shows the aggregate counts. The ingestion prefetches entries
+            # waiting in the queue, so their extraction may be ready.
+            return lambda job: self._download_thread(entry['url'], format, quality, output_path, job, None,
+                                                     api.get_extracted_info(entry['url']))
+
+        def on_progress(progress: dict):
+            completed = progress['finished'] + progress['failed']
+            text = f"{progress['discovered']} found • {progress['queued']} queued • {progress['finished']} downloaded"
+            if progress['failed']:
+                text += f" • {progress['failed']} failed"
+            if progress['cancelled']:
+                text = "Download cancelled"
+            elif progress['done'] and completed >= progress['queued']:
+                text = f"Playlist complete: {text}"
+            elif not progress['done']:
+                text += " • still fetching..."
+            percent = completed / progress['queued'] * 100 if progress['queued'] else 0
+            download_card.update_progress(percent, text)
+
+        self.playlist_ingestions[url] = PlaylistIngestion(url, make_job_body, on_progress).start()
+
+    def _resume_interrupted_downloads(self):
+        """Re-queue jobs a previous run left unfinished; yt-dlp continues their .part files"""
+        for entry in job_journal.take_orphans():
+            logging.info(f"Resuming interrupted download ({entry['phase']}): {entry['url']}")
+            if entry['partial_bytes']:
+                status = f"Resuming ({humanize.naturalsize(entry['partial_bytes'])} already downloaded)..."
+            else:
+                status = "Resuming..."
+            self._queue_download(
+                entry['url'],
+                entry['title'],
+                entry['format'],
+                entry['quality'],
+                entry['output_path'],
+                entry['id'],
+                status=status
+            )
+
+    def _download_thread(self, url: str, format: str, quality: str, output_path: str,
+                         job: DownloadJob, journal_id: Optional[str],
+                         extracted_info: Optional[dict] = None, interactive: bool = False):
+        """Download job body, run on a download queue worker"""
         try:
-            # Get selected format and quality
-            format = self.format_var.get().lower()
-            quality = self.quality_var.get()
-            
-            # Get output path from settings
-            output_path = os.path.join(os.path.expanduser("~"), "Downloads", "YouTube Converter", "downloads")
             os.makedirs(output_path, exist_ok=True)
             
-            # Progress callback
-            def progress_callback(progress: float):
-                if url in self.active_downloads:
-                    card = self.active_downloads[url]
-                    if not card.is_cancelled:
-                        card.update_progress(
-                            progress,
-                            f"Downloading... {progress:.1f}%"
-                        )
+            def phase_callback(phase: str, details: dict):
+                job_journal.update_phase(journal_id, phase, details)
+                progress_aggregator.set_phase(job.id, phase)
             
-            # Download the video
+            # Download the video; raw progress events are coalesced by the
+            # aggregator and drawn once per UI frame
+            final_info = {}
             output_file = api.download_video(
                 url,
                 output_path,
                 format=format,
                 quality=quality,
-                progress_callback=progress_callback
+                cancel_token=job.cancel_token,
+                phase_callback=phase_callback,
+                progress_hook=lambda d: progress_aggregator.report(job.id, d),
+                extracted_info=extracted_info,
+                interactive=interactive,
+                info_callback=final_info.update
             )
+            progress_aggregator.finish(job.id)
+            
+            # Add it to the download history before the job leaves the job journal
+            queued = job_journal.get(journal_id) or {}
+            info = final_info or extracted_info or {}
+            download_journal.add({
+                'title': info.get('title') or queued.get('title'),
+                'channel': info.get('channel') or info.get('uploader'),
+                'video_id': info.get('id'),
+                'url': url,
+                'format': format.upper(),
+                'quality': quality,
+                'size': os.path.getsize(output_file) if os.path.isfile(output_file) else None,
+                'path': output_file,
+            })
+            job_journal.remove(journal_id)
             
             # Update download card on completion
             if url in self.active_downloads:
@@ -415,64 +557,95 @@ class MainPage(ctk.CTkFrame):
                 if not card.is_cancelled:
                     card.update_progress(100, "Download complete!")
                     
+        except DownloadCancelled:
+            logging.info(f"Download cancelled: {url}")
+            job_journal.remove(journal_id)
         except Exception as e:
+            # Left in the journal so the next start can retry it
             logging.error(f"Error in download thread: {e}")
+            job_journal.mark_failed(journal_id)
             if url in self.active_downloads:
                 card = self.active_downloads[url]
                 card.update_progress(0, f"Error: {str(e)}")
+        finally:
+            progress_aggregator.finish(job.id)
+            if self.download_jobs.get(url) is job:
+                del self.download_jobs[url]
+
+    def _on_queue_changed(self, metrics: dict):
+        """Show queue depth and worker usage (called from worker threads)"""
+        if not metrics['active'] and not metrics['queued']:
+            text = ""
+        else:
+            text = f"{metrics['active']}/{metrics['max_workers']} active • {metrics['queued']} queued"
+            if metrics['paused']:
+                text += " (paused)"
+        try:
+            self.after(0, lambda: self.progress_label.configure(text=text))
+        except RuntimeError:
+            pass
+
+    def destroy(self):
+        EventManager.unsubscribe("download_queue_changed", self._on_queue_changed)
+        super().destroy()
 
     def cancel_download(self, url: str):
         """Cancel an active download"""
+        ingestion = self.playlist_ingestions.pop(url, None)
+        if ingestion is not None:
+            # Stops expanding the playlist and cancels its queued entries
+            ingestion.cancel()
+        job = self.download_jobs.pop(url, None)
+        if job is not None:
+            # Aborts the transfer, kills ffmpeg and frees the worker slot
+            download_queue.cancel(job)
         if url in self.active_downloads:
             self.active_downloads[url].update_progress(
                 0, "Download cancelled"
             )
-            # Thread will check cancelled flag and stop
             
     def paste_url(self):
         """Paste URL from clipboard and process it immediately"""
         try:
             url = self.clipboard_get().strip()
-            if url:
+            # Several video URLs pasted at once are queued together
+            urls = list(dict.fromkeys(part for part in url.split() if self.is_valid_youtube_url(part)))
+            if len(urls) > 1:
+                logging.info(f"Pasted {len(urls)} URLs")
+                self.queue_urls(urls)
+            elif url:
                 logging.info(f"Pasted URL: {url}")
                 self.url_entry.delete(0, 'end')
                 self.url_entry.insert(0, url)
-                # Switch to converter page and process URL
-                self.smooth_transition_to_converter()
                 self.process_url(url)
         except Exception as e:
             logging.error(f"Error pasting URL: {e}")
             
     def is_valid_youtube_url(self, url):
         """Check if the URL is a valid YouTube URL"""
-        youtube_pattern = r'(youtube|youtu|youtube-nocookie)\.(com|be)/'
-        video_pattern = r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})'
-        youtube_regex = rf'(https?://)?(www\.)?{youtube_pattern}{video_pattern}'
-        youtube_regex_match = re.match(youtube_regex, url)
-        return bool(youtube_regex_match)
+        parsed = parse_youtube_url(url)
+        return bool(parsed and parsed.video_id)
 
     def process_url(self, url):
-        """Process the YouTube URL and update the preview"""
-        try:
-            logging.info(f"Starting to fetch video info for URL: {url}")
-            video_info = self.fetch_video_info(url)
-            
-            if video_info:
-                # Update preview in main thread
-                self.after(0, lambda: self.update_preview(video_info))
-                self.after(0, self.hide_loading)
-            else:
-                self.after(0, lambda: self.show_error("Could not fetch video information"))
-                self.after(0, self.smooth_transition_to_home)
-                
-        except Exception as e:
-            logging.error(f"Error processing URL: {e}")
-            self.after(0, lambda: self.show_error(str(e)))
-            self.after(0, self.smooth_transition_to_home)
+        """Look up the URL right away, superseding any pending lookup"""
+        self.smooth_transition_to_converter()
+        self.url_lookup.submit(url, immediate=True)
+
+    def _on_lookup_result(self, url, video_info):
+        """Apply the result of the newest URL lookup (runs on the UI thread)"""
+        self.preview_info = (url, video_info) if video_info else None
+        if video_info:
+            self.show_converter_page()
+            self.update_preview(video_info)
+            self.hide_loading()
+        else:
+            self.show_error("Could not fetch video information")
+            self.smooth_transition_to_home()
 
     def fetch_video_info(self, url):
-        """Fetch video information using yt-dlp"""
+        """Fetch video information using yt-dlp (runs on a background thread)"""
         try:
+            logging.info(f"Starting to fetch video info for URL: {url}")
             # Extract video info using the YouTube API
             info = api.get_video_info(url)
             
@@ -480,7 +653,7 @@ class MainPage(ctk.CTkFrame):
                 return None
                 
             # Format the video information
-            video_info = {
+            return {
                 'id': info.get('id', ''),
                 'title': info.get('title', 'Unknown Title'),
                 'channel': info.get('author', 'Unknown channel'),
@@ -489,16 +662,8 @@ class MainPage(ctk.CTkFrame):
                 'formats': info.get('formats', [])
             }
             
-            # Show converter page before updating preview
-            self.after(0, self.show_converter_page)
-            
-            # Update the UI with the fetched information
-            self.after(0, lambda: self.update_preview(video_info))
-            return video_info
-            
         except Exception as e:
             logging.error(f"Error fetching video info: {e}")
-            self.after(0, lambda: self.show_error("Error fetching video information"))
             return None
 
     def show_error(self, message):
@@ -507,6 +672,7 @@ class MainPage(ctk.CTkFrame):
         self.channel_label.configure(text="")
         self.duration_label.configure(text="")
         self.thumbnail_label.configure(image=None)
+        self._preview_thumbnail_url = None
         
     def update_preview(self, video_info):
         """Update the preview card with video information"""
@@ -527,21 +693,21 @@ class MainPage(ctk.CTkFrame):
             duration = timedelta(seconds=int(video_info.get('duration', 0)))
             self.duration_label.configure(text=str(duration))
             
-            # Update thumbnail in background
-            def load_thumbnail():
-                thumbnail_url = video_info.get('thumbnail_url')
-                if thumbnail_url:
-                    try:
-                        response = requests.get(thumbnail_url)
-                        img_data = Image.open(BytesIO(response.content))
-                        img_data = img_data.resize((180, 120), Image.Resampling.LANCZOS)
-                        thumbnail = ctk.CTkImage(img_data, size=(180, 120))
-                        self.after(0, lambda: self.thumbnail_label.configure(image=thumbnail, text=""))
-                    except Exception as e:
-                        logging.error(f"Error loading thumbnail: {e}")
-                        self.after(0, lambda: self.thumbnail_label.configure(text="Thumbnail unavailable"))
-            
-            threading.Thread(target=load_thumbnail, daemon=True).start()
+            # Update thumbnail; cached thumbnails are drawn immediately
+            thumbnail_url = video_info.get('thumbnail_url')
+            self._preview_thumbnail_url = thumbnail_url
+
+            def show_thumbnail(image):
+                if thumbnail_url != self._preview_thumbnail_url:
+                    # A newer preview replaced this one while it was loading
+                    return
+                if image is None:
+                    self.thumbnail_label.configure(text="Thumbnail unavailable")
+                    return
+                thumbnail = ctk.CTkImage(image, size=(180, 120))
+                self.thumbnail_label.configure(image=thumbnail, text="")
+
+            thumbnail_service.load(thumbnail_url, (180, 120), self, show_thumbnail)
             
             # Stop progress animation
             self.progress_bar.stop()
@@ -614,18 +780,19 @@ class MainPage(ctk.CTkFrame):
         
         # Quick validation of URL format
         if not url:
+            self.url_lookup.cancel()
             return
             
-        # Show loading state immediately if URL looks valid
-        if 'youtube.com' in url or 'youtu.be' in url:
-            # Smooth transition to converter page
-            self.smooth_transition_to_converter()
-            
-            # Start fetching in background
-            threading.Thread(target=lambda: self.process_url(url), daemon=True).start()
+        if self.is_valid_youtube_url(url) or is_collection_url(url):
+            # Show loading state once per new URL; the lookup waits for typing to settle
+            if not self.url_lookup.is_tracking(url):
+                self.smooth_transition_to_converter()
+            self.url_lookup.submit(url)
         else:
-            self.show_error("Invalid YouTube URL")
-            self.smooth_transition_to_home()
+            self.url_lookup.cancel()
+            if self.active_page != "home":
+                self.show_error("Invalid YouTube URL")
+                self.smooth_transition_to_home()
 
     def show_home_page(self):
         self.preview_frame.pack_forget()
@@ -10,6 +10,8 @@ from datetime import datetime
 import logging
 from components.custom_dropdown import CustomDropdown
 from components.tooltip import ModernTooltip
+from services.search_index import SearchIndex
+from utils.debounced_lookup import DebouncedLookup
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,12 @@ class NotificationPopover(ctk.CTkToplevel):
         self.visible = False
         self._drag_data = {"x": 0, "y": 0, "dragging": False}
         
+        # Notifications matching the search box, best match first (None when not searching)
+        self.search_results = None
+        self.search_index = SearchIndex({"message": 1.0, "level": 0.5})
+        for notification in self.app.notifications:
+            self.index_notification(notification)
+        
         # Configure window
         self.title("")
         self.overrideredirect(True)
@@ -134,6 +142,24 @@ class NotificationPopover(ctk.CTkToplevel):
         )
         self.sort_filter.pack(side="left", padx=5, pady=5)
         
+        # Search entry; queries run off the UI thread once typing pauses
+        self.search_entry = ctk.CTkEntry(
+            self.main_frame,
+            placeholder_text="Search notifications...",
+            height=30,
+            fg_color="#2D2D2D",
+            border_color="#333333",
+            font=ctk.CTkFont(family="Segoe UI", size=12)
+        )
+        self.search_entry.pack(fill="x", padx=15, pady=(0, 5))
+        self.search_entry.bind("<KeyRelease>", self.on_search_change)
+        self.search = DebouncedLookup(
+            self,
+            fetch=self.search_index.search,
+            on_result=self._on_search_result,
+            delay_ms=150
+        )
+        
         # Create scrollable frame for notifications
         self.scrollable = ctk.CTkScrollableFrame(
             self.main_frame,
@@ -254,7 +280,37 @@ class NotificationPopover(ctk.CTkToplevel):
         if not self._drag_data["dragging"]:
             self.hide()
     
+    def index_notification(self, notification):
+        """Make a notification searchable (called when the app adds one)"""
+        self.search_index.add(
+            id(notification),
+            {"message": notification["message"], "level": notification["level"]},
+            payload=notification,
+            order=self._parse_timestamp(notification["timestamp"]).timestamp()
+        )
+    
+    def on_search_change(self, event):
+        """Search the notifications as the user types"""
+        query = self.search_entry.get().strip()
+        if query:
+            self.search.submit(query)
+            return
+        self.search.cancel()
+        if self.search_results is not None:
+            self.search_results = None
+            self.update_notifications()
+    
+    def _on_search_result(self, query, results):
+        """Show ranked search results (called on the UI thread)"""
+        if query != self.search_entry.get().strip():
+            return
+        self.search_results = results.page(0, len(results)) if results else []
+        self.update_notifications()
+    
     def clear_all(self):
+        self.search_index.clear()
+        if self.search_results is not None:
+            self.search_results = []
         self.app.notifications.clear()
         self.app._save_notifications()
         self.app.update_notification_button()
@@ -303,16 +359,28 @@ class NotificationPopover(ctk.CTkToplevel):
             return
         
         # Filter notifications
-        filtered_notifications = self.app.notifications.copy()
+        searching = self.search_results is not None
+        filtered_notifications = list(self.search_results) if searching else self.app.notifications.copy()
         if self.type_filter_var.get() != "all":
             filtered_notifications = [n for n in filtered_notifications if n["level"] == self.type_filter_var.get()]
         
-        # Sort notifications using the new parse function
-        reverse_sort = self.sort_filter_var.get() == "newest"
-        filtered_notifications.sort(
-            key=lambda x: self._parse_timestamp(x["timestamp"]),
-            reverse=reverse_sort
-        )
+        # Search results keep their ranking; otherwise sort using the new parse function
+        if not searching:
+            reverse_sort = self.sort_filter_var.get() == "newest"
+            filtered_notifications.sort(
+                key=lambda x: self._parse_timestamp(x["timestamp"]),
+                reverse=reverse_sort
+            )
+        
+        if searching and not filtered_notifications:
+            self.empty_label = ctk.CTkLabel(
+                self.scrollable,
+                text="No matching notifications",
+                font=ctk.CTkFont(family="Segoe UI", size=13),
+                text_color="#666666"
+            )
+            self.empty_label.pack(pady=20)
+            return
         
         # Add notifications
         for notification in filtered_notifications:
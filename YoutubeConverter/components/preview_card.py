@@ -2,8 +2,7 @@ import customtkinter as ctk
 from PIL import Image, ImageTk
 import logging
 from utils.widget_manager import manager as widget_manager
-import urllib.request
-from io import BytesIO
+from services.thumbnail_service import thumbnail_service
 from datetime import timedelta
 import humanize
 
@@ -53,53 +52,41 @@ class PreviewCard:
         for widget in self.video_info_frame.winfo_children():
             widget.destroy()
 
-        try:
-            # Load and display thumbnail
-            response = urllib.request.urlopen(video_info['thumbnail_url'])
-            image_data = response.read()
-            image = Image.open(BytesIO(image_data))
-            
-            # Calculate new dimensions maintaining aspect ratio
-            target_width = 400
-            aspect_ratio = image.width / image.height
-            new_width = target_width
-            new_height = int(target_width / aspect_ratio)
-            
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Load and display thumbnail; cached thumbnails are drawn immediately
+        thumbnail_label = widget_manager.create_managed_widget(
+            ctk.CTkLabel,
+            self.preview_frame,
+            text="Loading thumbnail...",
+            font=ctk.CTkFont(size=14),
+            text_color=DISABLED_COLOR
+        )
+        thumbnail_label.pack(expand=True)
+        preview_key = str(self.preview_frame)
+
+        def show_thumbnail(image):
+            if not thumbnail_label.winfo_exists():
+                return
+            if image is None:
+                thumbnail_label.configure(text="Thumbnail unavailable")
+                return
             photo = ImageTk.PhotoImage(image)
-            
+
             # Store reference to prevent garbage collection
-            preview_key = str(self.preview_frame)
             PreviewCard._image_references[preview_key] = {
                 'image': image,
                 'photo': photo
             }
-            
-            preview_label = widget_manager.create_managed_widget(
-                ctk.CTkLabel,
-                self.preview_frame,
-                image=photo,
-                text=""
-            )
-            preview_label.image = photo  # Keep a reference at widget level too
-            preview_label.pack(expand=True)
-
-            # Bind cleanup to widget destruction
-            def cleanup_image(widget=preview_label, key=preview_key):
-                if key in PreviewCard._image_references:
-                    del PreviewCard._image_references[key]
-            preview_label.bind("<Destroy>", lambda e: cleanup_image())
-
-        except Exception as thumb_error:
-            logging.error(f"Error loading thumbnail: {thumb_error}")
-            error_label = widget_manager.create_managed_widget(
-                ctk.CTkLabel,
-                self.preview_frame,
-                text="Thumbnail unavailable",
-                font=ctk.CTkFont(size=14),
-                text_color=DISABLED_COLOR
-            )
-            error_label.pack(expand=True)
+            thumbnail_label.configure(image=photo, text="")
+            thumbnail_label.image = photo  # Keep a reference at widget level too
+
+        # Bind cleanup to widget destruction
+        def cleanup_image(key=preview_key):
+            if key in PreviewCard._image_references:
+                del PreviewCard._image_references[key]
+        thumbnail_label.bind("<Destroy>", lambda e: cleanup_image())
+
+        # Width of 400 with the height following the aspect ratio
+        thumbnail_service.load(video_info.get('thumbnail_url'), (400, None), self.preview_frame, show_thumbnail)
 
         # Add video information using managed widgets
         info_container = widget_manager.create_managed_widget(
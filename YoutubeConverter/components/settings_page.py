@@ -7,6 +7,7 @@ from .custom_dropdown import CustomDropdown
 from utils.settings_manager import SettingsManager
 from utils.event_manager import EventManager
 from threads.settings_page_thread import SettingsPageThread
+from services.bandwidth_scheduler import bandwidth_scheduler, parse_rate
 import threading
 import time
 import logging
@@ -160,7 +161,7 @@ class SettingsPage(ctk.CTkFrame):
             
             format_dropdown = CustomDropdown(
                 format_frame,
-                values=["MP4", "MP3"],
+                values=["MP4", "Audio"],
                 width=100,
                 command=lambda _: self.on_setting_changed()
             )
@@ -201,6 +202,39 @@ class SettingsPage(ctk.CTkFrame):
             quality_dropdown.pack(side="right", padx=15)
             self.controls['video_quality'] = quality_dropdown
             
+            # Bandwidth Limit
+            bandwidth_frame = ctk.CTkFrame(self.content, fg_color="#232323", height=70, corner_radius=CORNER_RADIUS)
+            bandwidth_frame.pack(fill="x", pady=5)
+            bandwidth_frame.pack_propagate(False)
+            
+            text_frame = ctk.CTkFrame(bandwidth_frame, fg_color="transparent")
+            text_frame.pack(side="left", fill="both", expand=True, padx=15, pady=10)
+            
+            title_label = ctk.CTkLabel(
+                text_frame,
+                text="Bandwidth Limit",
+                font=ctk.CTkFont(family="Segoe UI", size=13),
+                text_color=TEXT_COLOR
+            )
+            title_label.pack(anchor="w")
+            
+            desc_label = ctk.CTkLabel(
+                text_frame,
+                text="Total download speed shared by all downloads",
+                font=ctk.CTkFont(family="Segoe UI", size=11),
+                text_color="#888888"
+            )
+            desc_label.pack(anchor="w")
+            
+            bandwidth_dropdown = CustomDropdown(
+                bandwidth_frame,
+                values=["Unlimited", "1 MB/s", "2 MB/s", "5 MB/s", "10 MB/s", "25 MB/s"],
+                width=120,
+                command=lambda _: self.on_setting_changed()
+            )
+            bandwidth_dropdown.pack(side="right", padx=15)
+            self.controls['bandwidth_limit'] = bandwidth_dropdown
+            
             # Audio Settings
             self.add_section_header("Audio Settings")
             
@@ -230,7 +264,7 @@ class SettingsPage(ctk.CTkFrame):
             
             audio_format_dropdown = CustomDropdown(
                 audio_format_frame,
-                values=["MP3", "WAV", "AAC", "M4A"],
+                values=["MP3", "M4A", "AAC", "OPUS", "FLAC", "WAV"],
                 width=120,
                 height=32,
                 command=lambda value: self.on_setting_changed("audio_format", value)
@@ -369,6 +403,10 @@ class SettingsPage(ctk.CTkFrame):
         if 'default_format' in settings:
             self.controls['default_format'].set(settings['default_format'])
             
+        # Update bandwidth limit selection if available
+        if 'bandwidth_limit' in settings:
+            self.controls['bandwidth_limit'].set(settings['bandwidth_limit'])
+            
         # Update audio format selection if available
         if 'audio_format' in settings:
             self.controls['audio_format'].set(settings['audio_format'])
@@ -411,6 +449,9 @@ class SettingsPage(ctk.CTkFrame):
             # Emit settings updated event
             self.event_manager.emit("settings_updated", self.initial_settings)
             
+            # Running downloads follow the new limit right away
+            bandwidth_scheduler.set_rate(parse_rate(current_settings.get('bandwidth_limit')))
+            
             # Clean up settings page
             self.cleanup()
             
@@ -0,0 +1,182 @@
+import time
+import math
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import customtkinter as ctk
+
+logger = logging.getLogger(__name__)
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrolling list that only keeps the visible rows plus a small buffer alive.
+
+    Every row is row_height pixels high. create_row(parent) builds one row
+    widget and bind_row(row, item) fills it with an item. Items come from
+    fetch(offset, limit) one page at a time and fetched pages are cached, so
+    only the pages being looked at are ever loaded. Scrolling moves the
+    existing rows and rebinds them instead of creating widgets.
+    """
+
+    def __init__(
+        self,
+        master: Any,
+        row_height: int,
+        create_row: Callable[[Any], Any],
+        bind_row: Callable[[Any, Dict], None],
+        buffer: int = 4,
+        page_size: int = 100,
+        cached_pages: int = 20,
+        **kwargs
+    ):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.buffer = buffer
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+
+        self._count = 0
+        self._fetch: Callable[[int, int], List[Dict]] = lambda offset, limit: []
+        self._pages: OrderedDict = OrderedDict()
+        self._rows: List[Any] = []
+        self._bound: Dict[int, Optional[int]] = {}
+        self._top = 0.0
+        self._render_pending = False
+        self._max_render_ms = 0.0
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.viewport.bind("<Configure>", lambda _: self._schedule_render())
+        # Added next to other bindings (e.g. scrollable frames); events outside the list are ignored
+        self._wheel_bindings = [
+            (sequence, self.bind_all(sequence, self._on_wheel, add="+"))
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>")
+        ]
+
+    def destroy(self):
+        # unbind_all would drop every handler of the sequence, so only remove this list's own
+        for sequence, funcid in self._wheel_bindings:
+            script = self.tk.call('bind', 'all', sequence)
+            kept = '\n'.join(line for line in script.split('\n') if funcid not in line)
+            self.tk.call('bind', 'all', sequence, kept)
+        self._wheel_bindings = []
+        super().destroy()
+
+    def set_source(self, count: int, fetch: Callable[[int, int], List[Dict]]) -> None:
+        """Show count items loaded through fetch(offset, limit), scrolled to the top"""
+        self._count = count
+        self._fetch = fetch
+        self._top = 0.0
+        self._invalidate()
+        self.render()
+
+    def refresh(self, count: int) -> None:
+        """Reload the items (e.g. after one was deleted) keeping the scroll position"""
+        self._count = count
+        self._top = min(self._top, self._max_top())
+        self._invalidate()
+        self.render()
+
+    def _invalidate(self) -> None:
+        self._pages.clear()
+        for row in self._rows:
+            row.place_forget()
+            self._bound[id(row)] = None
+
+    def item(self, index: int) -> Optional[Dict]:
+        """Return item index, fetching its page when it is not cached"""
+        page_index = index // self.page_size
+        page = self._pages.get(page_index)
+        if page is None:
+            page = self._fetch(page_index * self.page_size, self.page_size)
+            self._pages[page_index] = page
+            while len(self._pages) > self.cached_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_index)
+        offset = index - page_index * self.page_size
+        return page[offset] if offset < len(page) else None
+
+    def _viewport_height(self) -> int:
+        return max(self.viewport.winfo_height(), 1)
+
+    def _max_top(self) -> float:
+        return max(0.0, self._count * self.row_height - self._viewport_height())
+
+    def _ensure_rows(self) -> None:
+        needed = math.ceil(self._viewport_height() / self.row_height) + 1 + self.buffer
+        while len(self._rows) < needed:
+            row = self.create_row(self.viewport)
+            self._bound[id(row)] = None
+            self._rows.append(row)
+
+    def _schedule_render(self) -> None:
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self.render)
+
+    def render(self) -> None:
+        """Place and bind the rows for the current scroll position"""
+        self._render_pending = False
+        started = time.perf_counter()
+        self._ensure_rows()
+        first = int(self._top // self.row_height)
+        # The buffer rows sit above the first visible row so scrolling up is covered too
+        first = max(0, first - self.buffer // 2)
+        for slot, row in enumerate(self._rows):
+            index = first + slot
+            item = self.item(index) if index < self._count else None
+            if item is None:
+                if self._bound[id(row)] is not None:
+                    row.place_forget()
+                    self._bound[id(row)] = None
+                continue
+            if self._bound[id(row)] != index:
+                self.bind_row(row, item)
+                self._bound[id(row)] = index
+            row.place(x=0, y=index * self.row_height - self._top, relwidth=1.0)
+
+        total = self._count * self.row_height
+        if total > self._viewport_height():
+            self.scrollbar.set(self._top / total, (self._top + self._viewport_height()) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        self._max_render_ms = max(self._max_render_ms, (time.perf_counter() - started) * 1000)
+
+    def scroll_to(self, top: float) -> None:
+        """Scroll so the pixel offset top is at the top of the viewport"""
+        top = min(max(0.0, top), self._max_top())
+        if top != self._top:
+            self._top = top
+            self.render()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == 'moveto':
+            self.scroll_to(float(amount) * self._count * self.row_height)
+        elif action == 'scroll':
+            step = self._viewport_height() if unit == 'pages' else self.row_height
+            self.scroll_to(self._top + int(amount) * step)
+
+    def _on_wheel(self, event) -> None:
+        try:
+            if not self.winfo_exists() or not str(event.widget).startswith(str(self)):
+                return
+        except Exception:
+            return
+        if getattr(event, 'num', None) in (4, 5):
+            direction = -1 if event.num == 4 else 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self.scroll_to(self._top + direction * self.row_height * 3)
+
+    def get_stats(self) -> Dict:
+        """Rows alive vs. items and the slowest render (read by benchmarks/virtual_list.py)"""
+        return {'items': self._count, 'rows_alive': len(self._rows), 'max_render_ms': self._max_render_ms}
@@ -0,0 +1,208 @@
+import re
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+from utils.settings_manager import SettingsManager
+from services.cancellation import CancelToken
+
+logger = logging.getLogger(__name__)
+
+# Every job keeps at least this much so preempted transfers do not time out
+DEFAULT_MINIMUM = 32 * 1024
+# Seconds of allocation a job may spend in one burst
+BURST_SECONDS = 1.0
+# How often allocations follow the measured throughput
+REBALANCE_INTERVAL = 1.0
+# Longest single sleep, so cancellation stays responsive
+MAX_SLEEP = 0.25
+
+RATE_RE = re.compile(r'^\s*([\d.]+)\s*([KMG]?)B/s\s*$', re.IGNORECASE)
+
+
+def parse_rate(text: Optional[str]) -> Optional[int]:
+    """Bytes per second from a setting such as 5 MB/s, or None when unlimited"""
+    match = RATE_RE.match(text or '')
+    if not match:
+        return None
+    scale = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}[match.group(2).upper()]
+    return int(float(match.group(1)) * scale) or None
+
+
+class BandwidthJob:
+    """Allocation and measured throughput of one transfer"""
+
+    def __init__(self, interactive: bool, weight: float, minimum: int) -> None:
+        self.interactive = interactive
+        self.weight = weight
+        self.minimum = minimum
+        self.allocated: Optional[float] = None
+        self.actual: Optional[float] = None
+        self.demand: Optional[float] = None
+        self.bytes = 0
+        self.tokens = 0.0
+        self._refilled = time.monotonic()
+        self._window_start = self._refilled
+        self._window_bytes = 0
+        self._seen: Dict[str, int] = {}
+
+    def snapshot(self) -> Dict:
+        return {
+            'interactive': self.interactive,
+            'allocated': self.allocated,
+            'actual': self.actual,
+            'bytes': self.bytes,
+        }
+
+
+class BandwidthScheduler:
+    """Shares one download rate limit between all running transfers.
+
+    The global rate is split into per-job token buckets: every job first gets
+    its minimum, the rest is divided by weight. While an interactive job (one
+    the user is waiting on) runs, background jobs drop to their minimum.
+    Jobs that cannot use their share (the server is slower) are capped just
+    above their measured rate and the difference goes to the others.
+
+    Transfers are throttled from the yt-dlp progress hook: sleeping there
+    stops the downloader reading the socket until the job has tokens again.
+    """
+
+    def __init__(self, rate: Optional[int] = None) -> None:
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._jobs: List[BandwidthJob] = []
+        self._last_rebalance = time.monotonic()
+        self._stats = {'jobs': 0, 'throttled_seconds': 0.0, 'preemptions': 0}
+
+    def set_rate(self, rate: Optional[int]) -> None:
+        """Change the global limit (None for unlimited); running jobs follow at once"""
+        with self._lock:
+            self.rate = rate
+            self._rebalance()
+
+    def register(self, interactive: bool = False, weight: float = 1.0,
+                 minimum: int = DEFAULT_MINIMUM) -> BandwidthJob:
+        with self._lock:
+            job = BandwidthJob(interactive, weight, minimum)
+            if interactive and any(not other.interactive for other in self._jobs):
+                self._stats['preemptions'] += 1
+            self._jobs.append(job)
+            self._stats['jobs'] += 1
+            self._rebalance()
+            return job
+
+    def unregister(self, job: BandwidthJob) -> None:
+        with self._lock:
+            if job in self._jobs:
+                self._jobs.remove(job)
+                self._rebalance()
+
+    def throttle(self, job: BandwidthJob, d: Dict, cancel_token: Optional[CancelToken] = None) -> None:
+        """Account the new bytes of a raw yt-dlp progress event and sleep while job is over its allocation"""
+        downloaded = d.get('downloaded_bytes') or 0
+        key = d.get('filename') or ''
+        with self._lock:
+            delta = max(0, downloaded - job._seen.get(key, 0))
+            job._seen[key] = max(downloaded, job._seen.get(key, 0))
+            if d.get('status') == 'finished':
+                job._seen.pop(key, None)
+            job.bytes += delta
+            job._window_bytes += delta
+
+            now = time.monotonic()
+            if now - self._last_rebalance >= REBALANCE_INTERVAL:
+                self._measure(now)
+                self._rebalance()
+            if job.allocated is None or not delta:
+                return
+            job.tokens = min(job.allocated * BURST_SECONDS,
+                             job.tokens + (now - job._refilled) * job.allocated)
+            job._refilled = now
+            job.tokens -= delta
+            wait = -job.tokens / job.allocated if job.tokens < 0 else 0.0
+
+        slept = 0.0
+        while slept < wait and not (cancel_token and cancel_token.cancelled):
+            step = min(MAX_SLEEP, wait - slept)
+            time.sleep(step)
+            slept += step
+        if slept:
+            with self._lock:
+                self._stats['throttled_seconds'] += slept
+
+    def _measure(self, now: float) -> None:
+        for job in self._jobs:
+            elapsed = now - job._window_start
+            if elapsed <= 0:
+                continue
+            rate = job._window_bytes / elapsed
+            job.actual = rate if job.actual is None else job.actual + 0.5 * (rate - job.actual)
+            job._window_start = now
+            job._window_bytes = 0
+            # A job well below its share is limited elsewhere; leave it a little headroom
+            if job.allocated and job.actual < 0.8 * job.allocated:
+                job.demand = max(job.minimum, job.actual * 1.25)
+            else:
+                job.demand = None
+        self._last_rebalance = now
+
+    def _rebalance(self) -> None:
+        if self.rate is None:
+            for job in self._jobs:
+                job.allocated = None
+            return
+        interactive = [job for job in self._jobs if job.interactive]
+        background = [job for job in self._jobs if not job.interactive]
+        if interactive:
+            for job in background:
+                job.allocated = job.minimum
+            self._share(interactive, self.rate - sum(job.minimum for job in background))
+        else:
+            self._share(background, self.rate)
+
+    def _share(self, jobs: List[BandwidthJob], budget: float) -> None:
+        if not jobs:
+            return
+        guaranteed = sum(job.minimum for job in jobs)
+        if guaranteed >= budget:
+            for job in jobs:
+                job.allocated = max(1.0, budget * job.minimum / guaranteed) if budget > 0 else float(job.minimum)
+            return
+
+        # Water-fill the rest by weight; jobs capped by their demand free up their remainder
+        spare = budget - guaranteed
+        remaining = list(jobs)
+        while remaining:
+            total_weight = sum(job.weight for job in remaining)
+            capped = [
+                job for job in remaining
+                if job.demand is not None and job.minimum + spare * job.weight / total_weight > job.demand
+            ]
+            if not capped:
+                break
+            for job in capped:
+                job.allocated = job.demand
+                spare -= job.demand - job.minimum
+                remaining.remove(job)
+        for job in remaining:
+            job.allocated = job.minimum + spare * job.weight / sum(other.weight for other in remaining)
+
+    def job_stats(self, job: BandwidthJob) -> Dict:
+        with self._lock:
+            return job.snapshot()
+
+    def get_stats(self) -> Dict:
+        """Global limit, per-job allocations and time spent throttling"""
+        with self._lock:
+            return dict(
+                self._stats,
+                rate=self.rate,
+                allocated=sum(job.allocated or 0 for job in self._jobs),
+                jobs_running=[job.snapshot() for job in self._jobs],
+            )
+
+
+# Global instance
+_settings = SettingsManager()
+bandwidth_scheduler = BandwidthScheduler(rate=parse_rate(_settings.get_setting('bandwidth_limit')))
@@ -0,0 +1,153 @@
+import os
+import glob
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, Set, Iterator
+from yt_dlp.utils import Popen, DownloadCancelled
+
+logger = logging.getLogger(__name__)
+
+_current = threading.local()
+
+
+def is_temporary_path(path: str) -> bool:
+    """Check whether path is one of yt-dlp's partial, fragment or temporary files"""
+    name = os.path.basename(path)
+    return name.endswith(('.part', '.ytdl')) or '-Frag' in name or '.temp.' in name
+
+
+class CancelToken:
+    """Cooperative cancellation handle shared between the UI and a download.
+
+    The progress hook polls the token and aborts the transfer, subprocesses
+    started by yt-dlp while the token is bound are killed on cancel, and the
+    files the download touched are tracked so they can be removed afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: Set[Popen] = set()
+        self._paths: Set[str] = set()
+        # Paths that already existed when the download first reported them
+        self._preexisting: Set[str] = set()
+        self.requested_at: Optional[float] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation and kill any running ffmpeg subprocess"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.requested_at = time.monotonic()
+            self._event.set()
+            processes = list(self._processes)
+        for proc in processes:
+            try:
+                proc.kill()
+            except OSError as e:
+                logger.debug(f"Could not kill subprocess {proc.pid}: {e}")
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise DownloadCancelled()
+
+    def track_process(self, proc: Popen) -> None:
+        with self._lock:
+            self._processes.add(proc)
+            cancelled = self._event.is_set()
+        if cancelled:
+            proc.kill()
+
+    def untrack_process(self, proc: Popen) -> None:
+        with self._lock:
+            self._processes.discard(proc)
+
+    def track_path(self, path: Optional[str]) -> None:
+        """Remember a file the download wrote to.
+
+        A final file that already exists the first time it is reported was
+        not written by this download (yt-dlp reports finished for files it
+        skips as already downloaded), so cleanup never removes it.
+        """
+        if path:
+            with self._lock:
+                if path not in self._paths:
+                    self._paths.add(path)
+                    if not is_temporary_path(path) and os.path.exists(path):
+                        self._preexisting.add(path)
+
+    def cleanup_files(self) -> int:
+        """Remove partial, fragment and temporary files; return how many were deleted"""
+        with self._lock:
+            paths = list(self._paths)
+            preexisting = set(self._preexisting)
+        candidates = set()
+        for path in paths:
+            base, ext = os.path.splitext(path)
+            candidates.update({
+                path,
+                path + '.part',
+                path + '.ytdl',
+                f"{base}.temp{ext}",
+            })
+            candidates.update(glob.glob(glob.escape(path) + '*-Frag*'))
+            candidates.update(glob.glob(glob.escape(path) + '.part-Frag*'))
+        removed = 0
+        for candidate in candidates - preexisting:
+            try:
+                if os.path.isfile(candidate):
+                    os.remove(candidate)
+                    removed += 1
+            except OSError as e:
+                logger.warning(f"Could not remove {candidate}: {e}")
+        return removed
+
+
+def current_token() -> Optional[CancelToken]:
+    """Return the token bound to the calling thread, if any"""
+    return getattr(_current, 'token', None)
+
+
+@contextmanager
+def bind_token(token: Optional[CancelToken]) -> Iterator[None]:
+    """Bind a token to the calling thread so spawned subprocesses are tracked"""
+    previous = current_token()
+    _current.token = token
+    try:
+        yield
+    finally:
+        _current.token = previous
+
+
+class TrackedPopen(Popen):
+    """yt-dlp Popen that registers itself with the thread's cancel token"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._token = current_token()
+        if self._token is not None:
+            self._token.track_process(self)
+
+    def __exit__(self, *args):
+        if self._token is not None:
+            self._token.untrack_process(self)
+        return super().__exit__(*args)
+
+
+def install_process_tracking() -> None:
+    """Route yt-dlp's ffmpeg and external downloader subprocesses through TrackedPopen"""
+    from yt_dlp.postprocessor import ffmpeg
+    from yt_dlp.downloader import external
+
+    for module in (ffmpeg, external):
+        if module.Popen is not TrackedPopen:
+            module.Popen = TrackedPopen
+
+
+install_process_tracking()
@@ -0,0 +1,361 @@
+import os
+import json
+import time
+import shutil
+import subprocess
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+from services.cancellation import CancelToken, TrackedPopen, bind_token
+from services.youtube_api import api
+
+logger = logging.getLogger(__name__)
+
+# Video codecs we can re-encode edge GOPs for so they concat with copied packets
+EDGE_ENCODERS = {
+    'h264': 'libx264',
+    'hevc': 'libx265',
+    'vp9': 'libvpx-vp9',
+}
+
+# Seconds fetched around the clip so the edge GOPs can be re-encoded
+SOURCE_PADDING = 5.0
+
+# Padded clips closer than this (seconds) are fetched as one section
+SECTION_MERGE_GAP = 30.0
+
+# Cuts this close to a keyframe are treated as landing on it (seconds)
+KEYFRAME_TOLERANCE = 0.01
+
+
+class ClipEngineError(Exception):
+    """ffmpeg/ffprobe failed while cutting a clip"""
+
+
+class ClipEngine:
+    """Frame-accurate clip cutting that re-encodes as little as possible.
+
+    The source is probed for video keyframes. The span between the first
+    keyframe at or after the start and the last keyframe at or before the end
+    is stream-copied; only the partial GOPs at the two edges are re-encoded
+    (with the source's codec and pixel format) and the pieces are joined with
+    the concat demuxer. Clips that land on keyframes are copied outright and
+    clips with no whole GOP inside, or in a codec we cannot match, fall back
+    to a full re-encode.
+    """
+
+    def __init__(self, preset: str = 'veryfast', crf: int = 18, max_parallel: int = 3) -> None:
+        self.preset = preset
+        self.crf = crf
+        self.max_parallel = max_parallel
+        self._ffmpeg = None
+
+    def _executables(self) -> Tuple[str, str]:
+        if self._ffmpeg is None:
+            pp = FFmpegPostProcessor()
+            if not pp.available or not pp.probe_available:
+                raise ClipEngineError("ffmpeg and ffprobe are required to cut clips")
+            self._ffmpeg = (pp.executable, pp.probe_executable)
+        return self._ffmpeg
+
+    def _run(self, args: List[str], cancel_token: Optional[CancelToken]) -> str:
+        """Run ffmpeg/ffprobe so cancel_token can kill it; return stdout"""
+        with bind_token(cancel_token):
+            stdout, stderr, returncode = TrackedPopen.run(
+                args, text=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        if returncode != 0:
+            raise ClipEngineError(f"{os.path.basename(args[0])} failed: {stderr.strip()[-500:]}")
+        return stdout
+
+    def probe(self, source: str, cancel_token: Optional[CancelToken] = None) -> Dict:
+        """Return the source's video stream details and keyframe timestamps"""
+        _, ffprobe = self._executables()
+        streams = json.loads(self._run([
+            ffprobe, '-v', 'error', '-show_entries',
+            'stream=index,codec_type,codec_name,pix_fmt',
+            '-of', 'json', source,
+        ], cancel_token)).get('streams', [])
+        video = next((s for s in streams if s.get('codec_type') == 'video'), None)
+        has_audio = any(s.get('codec_type') == 'audio' for s in streams)
+
+        keyframes = []
+        if video is not None:
+            # Packet flags come from the demuxer, so no frame is decoded here
+            output = self._run([
+                ffprobe, '-v', 'error', '-select_streams', 'v:0',
+                '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', source,
+            ], cancel_token)
+            for line in output.splitlines():
+                pts_time, _, flags = line.partition(',')
+                if 'K' in flags and pts_time not in ('', 'N/A'):
+                    keyframes.append(float(pts_time))
+            keyframes.sort()
+        return {'video': video, 'has_audio': has_audio, 'keyframes': keyframes}
+
+    def plan(self, probe: Dict, start: float, end: float) -> Dict:
+        """Pick the cheapest strategy that still cuts at exactly start and end"""
+        video = probe['video']
+        if video is None:
+            return {'strategy': 'copy', 'reason': 'audio only'}
+        if video.get('codec_name') not in EDGE_ENCODERS:
+            return {'strategy': 'reencode', 'reason': f"cannot match codec {video.get('codec_name')}"}
+
+        inside = [k for k in probe['keyframes'] if start - KEYFRAME_TOLERANCE <= k <= end + KEYFRAME_TOLERANCE]
+        if not inside:
+            return {'strategy': 'reencode', 'reason': 'no keyframe inside the clip'}
+        first, last = inside[0], inside[-1]
+        starts_on_key = abs(first - start) <= KEYFRAME_TOLERANCE
+        if abs(last - end) <= KEYFRAME_TOLERANCE:
+            # The clip already ends on a keyframe, so nothing trails after it
+            last = end
+        if starts_on_key and last == end:
+            return {'strategy': 'copy', 'reason': 'cuts land on keyframes'}
+        if last <= first:
+            return {'strategy': 'reencode', 'reason': 'no whole GOP inside the clip'}
+        return {
+            'strategy': 'smart',
+            'reason': 'edge GOPs re-encoded',
+            'copy_start': start if starts_on_key else first,
+            'copy_end': last,
+        }
+
+    def _encode_args(self, video: Dict) -> List[str]:
+        args = ['-c:v', EDGE_ENCODERS[video['codec_name']], '-preset', self.preset, '-crf', str(self.crf)]
+        if video.get('pix_fmt'):
+            args += ['-pix_fmt', video['pix_fmt']]
+        return args
+
+    def _piece_ext(self, video: Dict) -> str:
+        """Container for intermediate pieces.
+
+        H.264/HEVC pieces go through MPEG-TS so each carries its parameter
+        sets in-band; concatenating MP4s would keep only the first piece's
+        extradata and corrupt the re-encoded edges.
+        """
+        return '.ts' if video['codec_name'] in ('h264', 'hevc') else '.mkv'
+
+    def cut(
+        self,
+        source: str,
+        start: float,
+        end: float,
+        output: str,
+        cancel_token: Optional[CancelToken] = None,
+        probe: Optional[Dict] = None,
+    ) -> Dict:
+        """Cut start-end (seconds into source) into output and report how.
+
+        probe may be passed in when several clips are cut from one source.
+        The report has the strategy used, seconds copied vs. re-encoded, the
+        time spent encoding and the estimated encode time a full re-encode
+        would have taken.
+        """
+        if end <= start:
+            raise ValueError("Clip end must be after its start")
+        ffmpeg, _ = self._executables()
+        started = time.monotonic()
+        if probe is None:
+            probe = self.probe(source, cancel_token)
+        plan = self.plan(probe, start, end)
+        video = probe['video']
+        duration = end - start
+        base = [ffmpeg, '-y', '-v', 'error']
+
+        encode_time = 0.0
+        reencoded = 0.0
+        if plan['strategy'] == 'copy':
+            self._run(base + [
+                '-ss', str(start), '-i', source, '-t', str(duration),
+                '-map', '0', '-c', 'copy', '-avoid_negative_ts', 'make_zero', output,
+            ], cancel_token)
+        elif plan['strategy'] == 'reencode':
+            if video.get('codec_name') in EDGE_ENCODERS:
+                encode_args = self._encode_args(video)
+            else:
+                encode_args = ['-c:v', 'libx264', '-preset', self.preset, '-crf', str(self.crf)]
+            encode_started = time.monotonic()
+            self._run(base + [
+                '-ss', str(start), '-i', source, '-t', str(duration),
+                '-map', '0:v:0', '-map', '0:a?', *encode_args, '-c:a', 'copy', output,
+            ], cancel_token)
+            encode_time = time.monotonic() - encode_started
+            reencoded = duration
+        else:
+            encode_time, reencoded = self._smart_cut(source, start, end, output, probe, plan, cancel_token)
+
+        copied = duration - reencoded
+        # Edge encodes tell us this machine's encode speed for this source
+        estimated_full = encode_time / reencoded * duration if reencoded else None
+        report = {
+            'output': output,
+            'strategy': plan['strategy'],
+            'reason': plan['reason'],
+            'copied_seconds': round(copied, 3),
+            'reencoded_seconds': round(reencoded, 3),
+            'encode_time': round(encode_time, 3),
+            'estimated_full_encode_time': round(estimated_full, 3) if estimated_full is not None else None,
+            'encode_time_saved': round(estimated_full - encode_time, 3) if estimated_full is not None else None,
+            'elapsed': round(time.monotonic() - started, 3),
+        }
+        logger.info(f"Clip cut: {report}")
+        return report
+
+    def _smart_cut(
+        self,
+        source: str,
+        start: float,
+        end: float,
+        output: str,
+        probe: Dict,
+        plan: Dict,
+        cancel_token: Optional[CancelToken],
+    ) -> Tuple[float, float]:
+        """Encode the edge GOPs, copy the middle and join them; return (encode time, seconds encoded)"""
+        ffmpeg, _ = self._executables()
+        base = [ffmpeg, '-y', '-v', 'error']
+        video = probe['video']
+        copy_start, copy_end = plan['copy_start'], plan['copy_end']
+        ext = self._piece_ext(video)
+        work_dir = tempfile.mkdtemp(prefix='clip-', dir=os.path.dirname(os.path.abspath(output)))
+        try:
+            pieces = []
+            encode_time = 0.0
+            reencoded = 0.0
+
+            def encode_piece(name: str, piece_start: float, piece_end: float) -> None:
+                nonlocal encode_time, reencoded
+                path = os.path.join(work_dir, name + ext)
+                encode_started = time.monotonic()
+                self._run(base + [
+                    '-ss', str(piece_start), '-i', source, '-t', str(piece_end - piece_start),
+                    '-map', '0:v:0', '-an', *self._encode_args(video), path,
+                ], cancel_token)
+                encode_time += time.monotonic() - encode_started
+                reencoded += piece_end - piece_start
+                pieces.append(path)
+
+            if copy_start > start:
+                encode_piece('head', start, copy_start)
+
+            middle = os.path.join(work_dir, 'middle' + ext)
+            # Input seeking to a keyframe lands exactly on it when copying
+            self._run(base + [
+                '-ss', str(copy_start), '-i', source, '-t', str(copy_end - copy_start),
+                '-map', '0:v:0', '-c', 'copy', '-avoid_negative_ts', 'make_zero', middle,
+            ], cancel_token)
+            pieces.append(middle)
+
+            if copy_end < end:
+                encode_piece('tail', copy_end, end)
+
+            list_path = os.path.join(work_dir, 'pieces.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for path in pieces:
+                    escaped = path.replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+
+            # Audio frames are tiny, so audio is simply copied for the whole clip
+            args = base + ['-f', 'concat', '-safe', '0', '-i', list_path]
+            if probe['has_audio']:
+                args += ['-ss', str(start), '-t', str(end - start), '-i', source, '-map', '0:v', '-map', '1:a']
+            args += ['-c', 'copy', output]
+            self._run(args, cancel_token)
+            return encode_time, reencoded
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+    def create_clip(
+        self,
+        url: str,
+        start: float,
+        end: float,
+        output_path: str,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Dict:
+        """Download just the section around start-end and cut it frame-accurately.
+
+        Returns the cut report plus the bytes transferred for it.
+        """
+        report = self.create_clips(url, [(start, end)], output_path, cancel_token)
+        return {**{k: v for k, v in report.items() if k != 'clips'}, **report['clips'][0]}
+
+    def create_clips(
+        self,
+        url: str,
+        ranges: List[Tuple[float, float]],
+        output_path: str,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Dict:
+        """Cut several clips from one video with a single download pass.
+
+        Ranges are padded by SOURCE_PADDING and those closer than
+        SECTION_MERGE_GAP are merged into one section, so overlapping or
+        nearby highlights share their bytes. All sections are fetched by one
+        range download; each section is probed once and the clips are cut
+        from it by up to max_parallel ffmpeg processes at a time.
+
+        The range download stream-copies from the keyframe before each
+        section's start; its timestamps are rebased so that point is zero
+        (earlier packets get negative timestamps), which the local cut
+        offsets rely on.
+        """
+        ranges = sorted(set(ranges))
+        if not ranges or any(end <= start for start, end in ranges):
+            raise ValueError("Every clip must end after it starts")
+        os.makedirs(output_path, exist_ok=True)
+
+        sections: List[List[float]] = []
+        for start, end in ranges:
+            padded_start, padded_end = max(0.0, start - SOURCE_PADDING), end + SOURCE_PADDING
+            if sections and padded_start - sections[-1][1] <= SECTION_MERGE_GAP:
+                sections[-1][1] = max(sections[-1][1], padded_end)
+            else:
+                sections.append([padded_start, padded_end])
+
+        started = time.monotonic()
+        work_dir = tempfile.mkdtemp(prefix='clip-source-', dir=output_path)
+        try:
+            download = api.download_sections(
+                url, [tuple(section) for section in sections], work_dir, cancel_token=cancel_token
+            )
+            sources = sorted(download['sections'], key=lambda section: section['start'])
+            probes: Dict[str, Dict] = {}
+
+            def cut_one(clip_range: Tuple[float, float]) -> Dict:
+                start, end = clip_range
+                source = next(
+                    section for section in reversed(sources) if section['start'] <= start + KEYFRAME_TOLERANCE
+                )
+                title = os.path.splitext(os.path.basename(source['filepath']))[0].rsplit(' [', 1)[0]
+                output = os.path.join(output_path, f"{title} [{int(start)}-{int(end)}].mp4")
+                offset = source['start']
+                report = self.cut(
+                    source['filepath'], start - offset, end - offset, output,
+                    cancel_token, probes[source['filepath']],
+                )
+                return {**report, 'filepath': output, 'start': start, 'end': end}
+
+            for source in sources:
+                probes[source['filepath']] = self.probe(source['filepath'], cancel_token)
+
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_parallel, len(ranges)))) as executor:
+                clips = list(executor.map(cut_one, ranges))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return {
+            'clips': clips,
+            'sections': len(sources),
+            'bytes_transferred': download['bytes_transferred'],
+            'full_size': download['full_size'],
+            'transfer_ratio': download['transfer_ratio'],
+            'elapsed': round(time.monotonic() - started, 3),
+        }
+
+# Global instance
+clip_engine = ClipEngine()
@@ -0,0 +1,267 @@
+import os
+import json
+import time
+import zlib
+import atexit
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+from services.history_store import HistoryStore, history_store
+
+logger = logging.getLogger(__name__)
+
+# Records written within this many seconds share one fsync
+FLUSH_INTERVAL = 0.5
+# Journal records after which the journal is folded into the snapshot
+COMPACT_RECORDS = 500
+
+
+def _encode(record: Dict) -> bytes:
+    payload = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+    data = payload.encode('utf-8')
+    return b'%08x %s\n' % (zlib.crc32(data), data)
+
+
+def _decode(line: bytes) -> Optional[Dict]:
+    """The record of a journal line, or None if the line is torn or corrupt"""
+    if not line.endswith(b'\n'):
+        return None
+    checksum, _, data = line.rstrip(b'\n').partition(b' ')
+    try:
+        if int(checksum, 16) != zlib.crc32(data):
+            return None
+        return json.loads(data.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class DownloadJournal:
+    """Durable, append-only record of completed and deleted downloads.
+
+    add() and remove() update the history store at once and queue one line
+    each for data/downloads.journal: an entry for a completed download, a
+    tombstone for a deleted one. A writer thread appends queued lines in
+    batches with a single fsync per batch, so recording a download never
+    rewrites the history. Every line carries a CRC; a line torn by a crash
+    is cut off at the next start and everything before it stays valid.
+
+    After COMPACT_RECORDS lines the journal is folded into
+    data/downloads.snapshot.json (written to a temporary file and atomically
+    replaced) and truncated. The first run seeds the snapshot with the
+    history already in the store (e.g. imported from downloads.json). At
+    startup the journal is replayed into the history store, which is
+    rebuilt from the snapshot if it was lost.
+    """
+
+    def __init__(
+        self,
+        store: HistoryStore,
+        journal_file: Optional[str] = None,
+        snapshot_file: Optional[str] = None,
+        flush_interval: float = FLUSH_INTERVAL,
+        compact_records: int = COMPACT_RECORDS,
+    ) -> None:
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+        if journal_file is None or snapshot_file is None:
+            os.makedirs(data_dir, exist_ok=True)
+        self.store = store
+        self.journal_file = journal_file or os.path.join(data_dir, 'downloads.journal')
+        self.snapshot_file = snapshot_file or os.path.join(data_dir, 'downloads.snapshot.json')
+        self.flush_interval = flush_interval
+        self.compact_records = compact_records
+
+        self._cond = threading.Condition()
+        self._pending: List[bytes] = []
+        self._written = 0
+        self._closed = False
+        self._stats = {'records': 0, 'batches': 0, 'fsyncs': 0, 'bytes': 0, 'compactions': 0, 'torn': 0}
+
+        records = self._recover()
+        self._journal_records = len(records)
+        if not os.path.exists(self.snapshot_file):
+            self._seed_snapshot()
+        self._replay(records)
+        self._file = open(self.journal_file, 'ab')
+        self._writer = threading.Thread(target=self._run, name='download-journal', daemon=True)
+        self._writer.start()
+
+    def _read_journal(self) -> Tuple[List[Dict], int, int]:
+        """Valid records, the offset just past the last one, and the file size"""
+        records, valid_end = [], 0
+        try:
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    record = _decode(line)
+                    if record is None:
+                        # Lines are appended in order, so only the tail can be torn
+                        break
+                    records.append(record)
+                    valid_end += len(line)
+                size = f.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            return [], 0, 0
+        return records, valid_end, size
+
+    def _recover(self) -> List[Dict]:
+        records, valid_end, size = self._read_journal()
+        if valid_end < size:
+            logger.warning(f"Cutting {size - valid_end} bytes of torn records off {self.journal_file}")
+            self._stats['torn'] += 1
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(valid_end)
+                f.flush()
+                os.fsync(f.fileno())
+        return records
+
+    def _load_snapshot(self) -> Dict[str, Dict]:
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('downloads', [])
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"Ignoring unreadable download snapshot {self.snapshot_file}: {e}")
+            return {}
+        return {entry['path']: entry for entry in entries if entry.get('path')}
+
+    def _write_snapshot(self, entries: List[Dict]) -> None:
+        tmp_file = self.snapshot_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'downloads': entries, 'compacted_at': time.time()}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+
+    def _seed_snapshot(self) -> None:
+        """Start the snapshot from the history recorded before there was a journal"""
+        entries = self.store.entries()
+        self._write_snapshot(entries)
+        if entries:
+            logger.info(f"Seeded the download snapshot with {len(entries)} existing downloads")
+
+    @staticmethod
+    def _apply(state: Dict[str, Optional[Dict]], records: List[Dict]) -> None:
+        for record in records:
+            if record.get('op') == 'add':
+                state[record['entry']['path']] = record['entry']
+            elif record.get('op') == 'delete':
+                state[record['path']] = None
+
+    def _replay(self, records: List[Dict]) -> None:
+        """Bring the history store up to date with the snapshot and journal"""
+        state: Dict[str, Optional[Dict]] = {}
+        if not self.store.count():
+            state.update(self._load_snapshot())
+        self._apply(state, records)
+        # Replaying is idempotent: entries replace the same path, tombstones delete it
+        self.store.add_many([entry for entry in state.values() if entry is not None])
+        for path, entry in state.items():
+            if entry is None:
+                self.store.remove(path)
+        if state:
+            logger.info(f"Replayed {len(records)} journal records into the download history")
+
+    def _append(self, record: Dict) -> None:
+        line = _encode(record)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Download journal is closed")
+            self._pending.append(line)
+            self._stats['records'] += 1
+            self._cond.notify()
+
+    def add(self, entry: Dict) -> None:
+        """Record a completed download"""
+        entry = dict(entry, timestamp=entry.get('timestamp') or time.time())
+        self.store.add(entry)
+        self._append({'op': 'add', 'entry': entry})
+
+    def remove(self, path: str) -> None:
+        """Record that the download at path was deleted (a tombstone)"""
+        self.store.remove(path)
+        self._append({'op': 'delete', 'path': path, 'timestamp': time.time()})
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # Give records arriving right behind this one a chance to share its fsync
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                batch, self._pending = self._pending, []
+            try:
+                self._write(batch)
+                if self._journal_records >= self.compact_records:
+                    self.compact()
+            except OSError as e:
+                logger.error(f"Error writing download journal: {e}")
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+    def _write(self, batch: List[bytes]) -> None:
+        data = b''.join(batch)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._journal_records += len(batch)
+        self._stats['batches'] += 1
+        self._stats['fsyncs'] += 1
+        self._stats['bytes'] += len(data)
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot and start an empty journal (writer thread only)"""
+        started = time.perf_counter()
+        records, _, _ = self._read_journal()
+        state: Dict[str, Optional[Dict]] = dict(self._load_snapshot())
+        self._apply(state, records)
+        entries = sorted((entry for entry in state.values() if entry is not None),
+                         key=lambda entry: entry.get('timestamp') or 0)
+
+        self._write_snapshot(entries)
+        # A crash before the truncate only replays records the snapshot already holds
+        self._file.truncate(0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._journal_records = 0
+        self._stats['compactions'] += 1
+        logger.info(
+            f"Compacted {len(records)} journal records into {len(entries)} downloads "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every record so far is on disk"""
+        with self._cond:
+            target = self._stats['records']
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self) -> None:
+        """Write the remaining records and stop the writer"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
+
+    def get_stats(self) -> Dict:
+        """Records written, fsyncs they shared and compactions"""
+        with self._cond:
+            batches = self._stats['batches']
+            return dict(
+                self._stats,
+                pending=len(self._pending),
+                journal_records=self._journal_records,
+                records_per_fsync=round(self._written / batches, 2) if batches else None,
+            )
+
+
+# Global instance
+download_journal = DownloadJournal(history_store)
+atexit.register(download_journal.close)
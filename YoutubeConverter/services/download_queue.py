@@ -0,0 +1,284 @@
+import time
+import heapq
+import logging
+import itertools
+import threading
+from typing import Dict, List, Optional, Callable, Any
+from urllib.parse import urlsplit
+from utils.event_manager import EventManager
+from services.cancellation import CancelToken
+from services.ydl_pool import ydl_pool, LEASE_HEADROOM
+from utils.settings_manager import SettingsManager
+from utils.url_parser import parse_youtube_url
+
+logger = logging.getLogger(__name__)
+
+# Higher runs first
+PRIORITY_LOW = -10
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+
+
+def host_key(url: str) -> str:
+    """Group URLs by the host that will serve them"""
+    if parse_youtube_url(url):
+        return 'youtube.com'
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class DownloadJob:
+    """A unit of work scheduled on the download queue"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, url: str, target: Callable[['DownloadJob'], Any], priority: int = PRIORITY_NORMAL):
+        self.id = next(DownloadJob._ids)
+        self.url = url
+        self.target = target
+        self.priority = priority
+        self.host = host_key(url)
+        self.state = 'queued'
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self.created_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_token = CancelToken()
+        self.worker: Optional[threading.Thread] = None
+        self._slot_released = False
+        self._done = threading.Event()
+
+    def __lt__(self, other: 'DownloadJob') -> bool:
+        # Heap order: highest priority first, then FIFO
+        return (-self.priority, self.id) < (-other.priority, other.id)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job has finished"""
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_token.cancelled
+
+
+class DownloadQueue:
+    """Priority download queue served by a bounded pool of worker threads.
+
+    Emits "download_queue_changed" through the EventManager with the current
+    metrics whenever a job is queued, started or finished.
+    """
+
+    def __init__(self, max_workers: int = 3, per_host_limit: Optional[int] = None) -> None:
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = per_host_limit
+        self._heap: List[DownloadJob] = []
+        self._running: Dict[int, DownloadJob] = {}
+        self._host_active: Dict[str, int] = {}
+        self._workers: List[threading.Thread] = []
+        self._paused = False
+        self._shutdown = False
+        self._cond = threading.Condition()
+        self._stats = {
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            # Seconds from cancel request to worker slot freed / transfer stopped
+            'last_cancel_latency': None,
+            'max_cancel_latency': 0.0,
+            'last_cancel_stop_latency': None,
+        }
+
+    def submit(
+        self,
+        url: str,
+        target: Callable[[DownloadJob], Any],
+        priority: int = PRIORITY_NORMAL,
+    ) -> DownloadJob:
+        """Queue target(job) to run on a worker thread"""
+        job = DownloadJob(url, target, priority)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Download queue has been shut down")
+            heapq.heappush(self._heap, job)
+            self._spawn_workers()
+            self._cond.notify()
+        self._publish()
+        return job
+
+    def _spawn_workers(self) -> None:
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < min(self.max_workers, len(self._heap) + len(self._running)):
+            worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _host_has_capacity(self, host: str) -> bool:
+        if self.per_host_limit is None:
+            return True
+        return self._host_active.get(host, 0) < self.per_host_limit
+
+    def _take_next(self) -> Optional[DownloadJob]:
+        """Pop the highest-priority job whose host has a free slot"""
+        skipped = []
+        job = None
+        while self._heap:
+            candidate = heapq.heappop(self._heap)
+            if self._host_has_capacity(candidate.host):
+                job = candidate
+                break
+            skipped.append(candidate)
+        for candidate in skipped:
+            heapq.heappush(self._heap, candidate)
+        return job
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    # Idle workers exit; submit()/resume() spawn new ones on demand
+                    if self._shutdown or not self._heap or len(self._workers) > self.max_workers:
+                        self._retire_worker()
+                        return
+                    if not self._paused:
+                        job = self._take_next()
+                    if job is None:
+                        self._cond.wait()
+                job.state = 'running'
+                job.started_at = time.monotonic()
+                job.worker = threading.current_thread()
+                self._running[job.id] = job
+                self._host_active[job.host] = self._host_active.get(job.host, 0) + 1
+            self._publish()
+            self._run(job)
+            if job._slot_released:
+                # The slot was handed back on cancel; a replacement worker exists
+                return
+
+    def _retire_worker(self) -> None:
+        current = threading.current_thread()
+        if current in self._workers:
+            self._workers.remove(current)
+
+    def _release_slot(self, job: DownloadJob) -> None:
+        """Free the job's worker slot (caller holds the lock)"""
+        self._running.pop(job.id, None)
+        self._host_active[job.host] -= 1
+        if not self._host_active[job.host]:
+            del self._host_active[job.host]
+
+    def _run(self, job: DownloadJob) -> None:
+        try:
+            job.result = job.target(job)
+            job.state = 'cancelled' if job.cancelled else 'done'
+        except Exception as e:
+            if job.cancelled:
+                job.state = 'cancelled'
+            else:
+                logger.error(f"Download job {job.id} failed: {e}")
+                job.error = e
+                job.state = 'failed'
+        finally:
+            job.finished_at = time.monotonic()
+            with self._cond:
+                if job._slot_released:
+                    # Cancelled: the slot is already free, only record how long
+                    # the transfer took to actually stop
+                    latency = job.finished_at - job.cancel_token.requested_at
+                    self._stats['last_cancel_stop_latency'] = latency
+                    if latency > 1.0:
+                        logger.warning(f"Download job {job.id} took {latency:.2f}s to stop after cancel")
+                else:
+                    self._release_slot(job)
+                    outcome = {'done': 'completed', 'cancelled': 'cancelled'}.get(job.state, 'failed')
+                    self._stats[outcome] += 1
+                self._cond.notify_all()
+            job._done.set()
+            self._publish()
+
+    def cancel(self, job: DownloadJob) -> None:
+        """Cancel a queued or running job and free its worker slot immediately"""
+        job.cancel_token.cancel()
+        with self._cond:
+            if job.state == 'queued' and job in self._heap:
+                self._heap.remove(job)
+                heapq.heapify(self._heap)
+                job.state = 'cancelled'
+                job.finished_at = time.monotonic()
+                job._done.set()
+            elif job.state == 'running' and not job._slot_released:
+                self._release_slot(job)
+                job._slot_released = True
+                if job.worker in self._workers:
+                    self._workers.remove(job.worker)
+                self._spawn_workers()
+            else:
+                return
+            latency = time.monotonic() - job.cancel_token.requested_at
+            self._stats['cancelled'] += 1
+            self._stats['last_cancel_latency'] = latency
+            self._stats['max_cancel_latency'] = max(self._stats['max_cancel_latency'], latency)
+            self._cond.notify_all()
+        self._publish()
+
+    def pause(self) -> None:
+        """Stop starting new jobs; running jobs are left to finish"""
+        with self._cond:
+            self._paused = True
+        self._publish()
+
+    def resume(self) -> None:
+        with self._cond:
+            self._paused = False
+            self._spawn_workers()
+            self._cond.notify_all()
+        self._publish()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Resize the worker pool; extra workers exit after their current job"""
+        with self._cond:
+            self.max_workers = max(1, max_workers)
+            self._spawn_workers()
+            self._cond.notify_all()
+        # Every worker holds a yt-dlp session for its whole download
+        ydl_pool.set_max_size(self.max_workers + LEASE_HEADROOM)
+        self._publish()
+
+    def get_metrics(self) -> Dict:
+        """Return queue depth and worker utilisation for the UI"""
+        with self._cond:
+            return {
+                'queued': len(self._heap),
+                'active': len(self._running),
+                'max_workers': self.max_workers,
+                'per_host': dict(self._host_active),
+                'paused': self._paused,
+                **self._stats,
+            }
+
+    def _publish(self) -> None:
+        EventManager.notify("download_queue_changed", self.get_metrics())
+
+    def shutdown(self) -> None:
+        """Drop queued jobs and let workers exit"""
+        with self._cond:
+            self._shutdown = True
+            self._heap.clear()
+            self._cond.notify_all()
+
+
+# Global instance
+_settings = SettingsManager()
+download_queue = DownloadQueue(
+    max_workers=int(_settings.get_setting('max_concurrent_downloads')),
+    per_host_limit=int(_settings.get_setting('max_downloads_per_host')),
+)
@@ -0,0 +1,162 @@
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Size of the ranged requests yt-dlp splits plain HTTP downloads into
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+
+
+class FragmentJob:
+    """Fragment counters for one download, measured per file"""
+
+    def __init__(self, connections: int) -> None:
+        self.connections = connections
+        self.fragments_done = 0
+        self.retries = 0
+        self.files = 0
+        self._file: Optional[str] = None
+        self._file_started = time.monotonic()
+        self._file_retries = 0
+        self._file_fragment_index = 0
+        self.fragment_count: Optional[int] = None
+
+    def snapshot(self) -> Dict:
+        return {
+            'connections': self.connections,
+            'fragments_done': self.fragments_done,
+            'fragment_count': self.fragment_count,
+            'retries': self.retries,
+        }
+
+
+class FragmentTuner:
+    """Chooses how many fragments each DASH/HLS download fetches at once.
+
+    Every finished fragmented file is a measurement: its throughput per
+    connection and its fragment retry rate. The per-job target grows by one
+    while extra connections keep their per-connection throughput, shrinks by
+    one when they stop paying off and is halved when the retry rate passes
+    error_threshold. The connections of all running jobs together stay
+    within global_max, although every job is always allowed one.
+    """
+
+    def __init__(
+        self,
+        global_max: int = 16,
+        per_job_max: int = 8,
+        initial: int = 4,
+        error_threshold: float = 0.05,
+    ) -> None:
+        self.global_max = global_max
+        self.per_job_max = per_job_max
+        self.error_threshold = error_threshold
+        self._target = min(initial, per_job_max)
+        self._best_per_connection: Optional[float] = None
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, FragmentJob] = {}
+        self._stats = {'jobs': 0, 'measurements': 0, 'increases': 0, 'decreases': 0, 'backoffs': 0}
+
+    def _allocation(self, job: Optional[FragmentJob] = None) -> int:
+        in_use = sum(other.connections for other in self._jobs.values() if other is not job)
+        return max(1, min(self._target, self.global_max - in_use))
+
+    def acquire(self) -> FragmentJob:
+        """Register a download and reserve its fragment connections"""
+        with self._lock:
+            job = FragmentJob(self._allocation())
+            self._jobs[id(job)] = job
+            self._stats['jobs'] += 1
+            return job
+
+    def release(self, job: FragmentJob) -> None:
+        """Return a finished, failed or cancelled download's connections"""
+        with self._lock:
+            self._jobs.pop(id(job), None)
+
+    def record_retry(self, job: FragmentJob) -> None:
+        """Count a fragment retry (called from yt-dlp's retry sleep function)"""
+        with self._lock:
+            job.retries += 1
+            job._file_retries += 1
+
+    def record_progress(self, job: FragmentJob, d: Dict) -> Optional[int]:
+        """Feed a raw yt-dlp progress event.
+
+        Returns the connection count to use for the job's next file when
+        this event finished a fragmented file, otherwise None.
+        """
+        with self._lock:
+            filename = d.get('filename')
+            if filename != job._file:
+                job._file = filename
+                job._file_started = time.monotonic()
+                job._file_fragment_index = 0
+            if d.get('fragment_count'):
+                job.fragment_count = d['fragment_count']
+                index = d.get('fragment_index') or 0
+                # With several connections the reported index may go backwards
+                if index > job._file_fragment_index:
+                    job.fragments_done += index - job._file_fragment_index
+                    job._file_fragment_index = index
+
+            if d.get('status') != 'finished':
+                return None
+            job.files += 1
+            fragments, retries = job._file_fragment_index, job._file_retries
+            job._file = None
+            job._file_retries = 0
+            if not fragments:
+                # A plain HTTP download says nothing about fragment concurrency
+                return None
+            elapsed = d.get('elapsed') or (time.monotonic() - job._file_started)
+            size = d.get('total_bytes') or d.get('downloaded_bytes') or 0
+            self._adapt(job, size / max(elapsed, 1e-3) / job.connections, retries / fragments)
+            job.connections = self._allocation(job)
+            return job.connections
+
+    def _adapt(self, job: FragmentJob, per_connection: float, error_rate: float) -> None:
+        self._stats['measurements'] += 1
+        before = self._target
+        if error_rate > self.error_threshold:
+            self._target = max(1, self._target // 2)
+            self._stats['backoffs'] += 1
+        elif self._best_per_connection is None or per_connection >= 0.75 * self._best_per_connection:
+            # Extra connections still pay off; probe higher only if this job used the full target
+            if job.connections >= self._target and self._target < self.per_job_max:
+                self._target += 1
+                self._stats['increases'] += 1
+        elif self._target > 1:
+            self._target -= 1
+            self._stats['decreases'] += 1
+
+        # Let the reference drift so one lucky file does not pin the target down
+        if self._best_per_connection is None:
+            self._best_per_connection = per_connection
+        else:
+            self._best_per_connection = max(per_connection, self._best_per_connection * 0.9)
+        logger.info(
+            f"Fragment concurrency {before} -> {self._target} "
+            f"({per_connection / 1024:.0f} KiB/s per connection, {error_rate:.1%} retries)"
+        )
+
+    def job_stats(self, job: FragmentJob) -> Dict:
+        with self._lock:
+            return job.snapshot()
+
+    def get_stats(self) -> Dict:
+        """Current target, connections in use and how often the target moved"""
+        with self._lock:
+            return dict(
+                self._stats,
+                target=self._target,
+                active_jobs=len(self._jobs),
+                connections_in_use=sum(job.connections for job in self._jobs.values()),
+                best_per_connection=self._best_per_connection,
+            )
+
+
+# Global instance
+fragment_tuner = FragmentTuner()
@@ -0,0 +1,302 @@
+import os
+import re
+import json
+import time
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+from utils.url_parser import parse_youtube_url
+
+logger = logging.getLogger(__name__)
+
+# Columns shown and searched on the downloads page
+FIELDS = ('video_id', 'title', 'channel', 'format', 'quality', 'size', 'path', 'url', 'timestamp')
+# Searched columns and the bm25 weight of a match in each
+SEARCH_WEIGHTS = {'title': 3.0, 'channel': 2.0, 'video_id': 1.5, 'format': 1.0, 'quality': 1.0}
+SEARCH_FIELDS = tuple(SEARCH_WEIGHTS)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _tokens(search: Optional[str]) -> List[str]:
+    return [token.casefold() for token in TOKEN_RE.findall(search or '')]
+
+
+def _narrows(tokens: List[str], previous: List[str]) -> bool:
+    """Whether every match of tokens also matches previous (the query only grew)"""
+    return len(tokens) >= len(previous) and all(
+        token.startswith(prior) for token, prior in zip(tokens, previous)
+    )
+
+
+class SearchResults:
+    """Ranked matches of one search, read from the history a page at a time"""
+
+    def __init__(self, store: 'HistoryStore', tokens: List[str], total: int) -> None:
+        self._store = store
+        self.tokens = tokens
+        self.total = total
+
+    def __len__(self) -> int:
+        return self.total
+
+    def page(self, offset: int, limit: int) -> List[Dict]:
+        if not self.total:
+            return []
+        return self._store._search_page(self.tokens, offset, limit)
+
+
+class HistoryStore:
+    """SQLite-backed history of completed downloads.
+
+    Every searchable column is indexed and an FTS5 table mirrors the text
+    columns, so the downloads page can ask for one page of matches at a time
+    without loading the whole history. Search results are ranked with bm25
+    (weighted per column), newest first on ties. Without FTS5 in the local
+    SQLite build, searches fall back to LIKE over the same columns, newest
+    first.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, legacy_path: Optional[str] = None) -> None:
+        if db_path is None:
+            data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'history.db')
+        if legacy_path is None:
+            legacy_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'components', 'downloads.json')
+        self.db_path = db_path
+        self.legacy_path = legacy_path
+
+        self._lock = threading.Lock()
+        self._stats = {'queries': 0, 'query_time': 0.0, 'added': 0, 'removed': 0, 'reused': 0}
+        self._last_search: Optional[SearchResults] = None
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS downloads (
+                    id INTEGER PRIMARY KEY,
+                    video_id TEXT,
+                    title TEXT NOT NULL,
+                    channel TEXT,
+                    format TEXT,
+                    quality TEXT,
+                    size INTEGER,
+                    path TEXT NOT NULL UNIQUE,
+                    url TEXT,
+                    timestamp REAL NOT NULL
+                )"""
+            )
+            for column in ('video_id', 'channel', 'format', 'quality'):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_downloads_{column} ON downloads ({column})"
+                )
+            # Lookups by date
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_downloads_timestamp ON downloads (timestamp, id)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.fts = self._create_fts()
+            self._conn.commit()
+        self._import_legacy()
+
+    def _create_fts(self) -> bool:
+        columns = ', '.join(SEARCH_FIELDS)
+        new_columns = ', '.join(f"new.{name}" for name in SEARCH_FIELDS)
+        old_columns = ', '.join(f"old.{name}" for name in SEARCH_FIELDS)
+        existed = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'downloads_fts'"
+        ).fetchone()
+        try:
+            self._conn.execute(
+                f"""CREATE VIRTUAL TABLE IF NOT EXISTS downloads_fts USING fts5(
+                    {columns}, content='downloads', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )"""
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite has no FTS5, history search falls back to LIKE: {e}")
+            return False
+        if not existed:
+            # Index the rows of a history recorded before the table existed
+            self._conn.execute("INSERT INTO downloads_fts (downloads_fts) VALUES ('rebuild')")
+        # External-content FTS tables are kept in sync by triggers
+        self._conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS downloads_ai AFTER INSERT ON downloads BEGIN
+                INSERT INTO downloads_fts (rowid, {columns}) VALUES (new.id, {new_columns});
+            END"""
+        )
+        self._conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS downloads_ad AFTER DELETE ON downloads BEGIN
+                INSERT INTO downloads_fts (downloads_fts, rowid, {columns}) VALUES ('delete', old.id, {old_columns});
+            END"""
+        )
+        self._conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS downloads_au AFTER UPDATE ON downloads BEGIN
+                INSERT INTO downloads_fts (downloads_fts, rowid, {columns}) VALUES ('delete', old.id, {old_columns});
+                INSERT INTO downloads_fts (rowid, {columns}) VALUES (new.id, {new_columns});
+            END"""
+        )
+        return True
+
+    def _import_legacy(self) -> None:
+        """Copy the entries of the old downloads.json in once"""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+                return
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('downloads', [])
+        except (OSError, json.JSONDecodeError, AttributeError):
+            entries = []
+        self.add_many(entries)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)", (str(time.time()),))
+            self._conn.commit()
+        if entries:
+            logger.info(f"Imported {len(entries)} downloads from {self.legacy_path}")
+
+    @staticmethod
+    def _row(entry: Dict) -> Dict:
+        row = {name: entry.get(name) for name in FIELDS}
+        if not row['video_id'] and row['url']:
+            parsed = parse_youtube_url(row['url'])
+            row['video_id'] = parsed.video_id if parsed else None
+        row['title'] = row['title'] or os.path.basename(row['path'] or '') or 'Unknown Title'
+        row['timestamp'] = row['timestamp'] or time.time()
+        return row
+
+    def add(self, entry: Dict) -> None:
+        """Record a completed download; an entry for the same path is replaced"""
+        self.add_many([entry])
+
+    def add_many(self, entries: List[Dict]) -> None:
+        latest = {row['path']: row for row in (self._row(entry) for entry in entries if entry.get('path'))}
+        rows = sorted(latest.values(), key=lambda row: row['timestamp'])
+        if not rows:
+            return
+        columns = ', '.join(FIELDS)
+        placeholders = ', '.join(f":{name}" for name in FIELDS)
+        with self._lock:
+            # Delete and insert rather than update, so a re-downloaded file
+            # gets a new rowid and moves to the top of the history
+            self._conn.executemany("DELETE FROM downloads WHERE path = :path", rows)
+            self._conn.executemany(f"INSERT INTO downloads ({columns}) VALUES ({placeholders})", rows)
+            self._conn.commit()
+            self._stats['added'] += len(rows)
+            self._last_search = None
+
+    def remove(self, path: str) -> bool:
+        """Forget the download stored at path"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM downloads WHERE path = ?", (path,))
+            self._conn.commit()
+            self._stats['removed'] += cursor.rowcount
+            self._last_search = None
+            return cursor.rowcount > 0
+
+    def entries(self) -> List[Dict]:
+        """Every download in the history, in the order they were recorded"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(FIELDS)} FROM downloads ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def _like(self, tokens: List[str]) -> tuple:
+        clauses, params = [], []
+        for token in tokens:
+            clauses.append('(' + ' OR '.join(f"{name} LIKE ? ESCAPE '\\'" for name in SEARCH_FIELDS) + ')')
+            escaped = token.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.extend([f"%{escaped}%"] * len(SEARCH_FIELDS))
+        return ' AND '.join(clauses), params
+
+    @staticmethod
+    def _match(tokens: List[str]) -> str:
+        # Every word must match the start of a word in some column
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def search(self, query: str) -> SearchResults:
+        """Downloads matching query, best match first, read a page at a time.
+
+        A query that only grew from the previous one (another letter or
+        word typed) cannot match more, so once a query matches nothing the
+        longer ones return at once without asking the database.
+        """
+        tokens = _tokens(query)
+        with self._lock:
+            last = self._last_search
+            if last is not None and _narrows(tokens, last.tokens) and (not last.total or tokens == last.tokens):
+                self._stats['reused'] += 1
+                return last if tokens == last.tokens else SearchResults(self, tokens, 0)
+
+        if not tokens:
+            sql, params = "SELECT COUNT(*) FROM downloads", []
+        elif self.fts:
+            sql, params = "SELECT COUNT(*) FROM downloads_fts WHERE downloads_fts MATCH ?", [self._match(tokens)]
+        else:
+            where, params = self._like(tokens)
+            sql = f"SELECT COUNT(*) FROM downloads WHERE {where}"
+        with self._lock:
+            results = SearchResults(self, tokens, self._conn.execute(sql, params).fetchone()[0])
+            self._last_search = results
+        return results
+
+    def _search_page(self, tokens: List[str], offset: int, limit: int) -> List[Dict]:
+        if not tokens:
+            return self.query(offset, limit)
+        columns = ', '.join(f"d.{name}" for name in ('id', *FIELDS))
+        if self.fts:
+            weights = ', '.join(str(SEARCH_WEIGHTS[name]) for name in SEARCH_FIELDS)
+            sql = (
+                f"SELECT {columns} FROM downloads_fts JOIN downloads d ON d.id = downloads_fts.rowid "
+                f"WHERE downloads_fts MATCH ? "
+                f"ORDER BY bm25(downloads_fts, {weights}), downloads_fts.rowid DESC LIMIT ? OFFSET ?"
+            )
+            params = [self._match(tokens), limit, offset]
+        else:
+            where, params = self._like(tokens)
+            sql = f"SELECT {columns} FROM downloads d WHERE {where} ORDER BY d.id DESC LIMIT ? OFFSET ?"
+            params += [limit, offset]
+
+        started = time.perf_counter()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._stats['queries'] += 1
+            self._stats['query_time'] += time.perf_counter() - started
+        return [dict(row) for row in rows]
+
+    def query(self, offset: int = 0, limit: int = 50) -> List[Dict]:
+        """One page of downloads, newest first (rowid order, so nothing is sorted)"""
+        started = time.perf_counter()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(FIELDS)} FROM downloads ORDER BY id DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+            self._stats['queries'] += 1
+            self._stats['query_time'] += time.perf_counter() - started
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        """Number of downloads in the history"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+
+    def get_stats(self) -> Dict:
+        """Entries, FTS availability and average query time"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+            queries = self._stats['queries']
+            return dict(
+                self._stats,
+                entries=entries,
+                fts=self.fts,
+                avg_query_ms=round(self._stats['query_time'] / queries * 1000, 2) if queries else None,
+            )
+
+
+# Global instance
+history_store = HistoryStore()
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Jobs that keep failing are dropped from the journal after this many failures
+MAX_RESUME_ATTEMPTS = 3
+
+
+class JobJournal:
+    """Durable record of unfinished download jobs.
+
+    Every phase change is written to data/jobs.json with an atomic replace, so
+    a crash or close mid-download leaves a consistent journal behind. Jobs
+    found in the journal at startup are handed out once via take_orphans() so
+    they can be re-queued; yt-dlp then continues their .part files.
+    """
+
+    def __init__(self, journal_file: Optional[str] = None) -> None:
+        if journal_file is None:
+            data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            journal_file = os.path.join(data_dir, 'jobs.json')
+        self.journal_file = journal_file
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict] = self._load()
+        # Everything on disk at startup was left over by a previous run
+        self._orphans = list(self._jobs)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('jobs', {})
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable job journal {self.journal_file}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """Write the journal atomically (caller holds the lock)"""
+        tmp_file = self.journal_file + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'jobs': self._jobs}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.journal_file)
+        except OSError as e:
+            logger.error(f"Error writing job journal: {e}")
+
+    def add(self, url: str, title: str, format: str, quality: str, output_path: str) -> str:
+        """Record a newly queued job and return its journal ID"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                'url': url,
+                'title': title,
+                'format': format,
+                'quality': quality,
+                'output_path': output_path,
+                'phase': 'queued',
+                'partial_files': [],
+                'attempts': 0,
+                'created_at': time.time(),
+                'updated_at': time.time(),
+            }
+            self._save()
+        return job_id
+
+    def mark_failed(self, job_id: str) -> None:
+        """Record a failed attempt; the job is retried on the next start"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['phase'] = 'failed'
+            job['attempts'] += 1
+            job['updated_at'] = time.time()
+            self._save()
+
+    def update_phase(self, job_id: str, phase: str, details: Optional[Dict] = None) -> None:
+        """Record the job's current phase and any partial file it is writing"""
+        details = details or {}
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            partial = details.get('tmpfilename')
+            if job['phase'] == phase and (not partial or partial in job['partial_files']):
+                return
+            job['phase'] = phase
+            if partial and partial not in job['partial_files']:
+                job['partial_files'].append(partial)
+            job['updated_at'] = time.time()
+            self._save()
+
+    def remove(self, job_id: str) -> None:
+        """Forget a job that completed, failed for good or was cancelled"""
+        with self._lock:
+            if self._jobs.pop(job_id, None) is not None:
+                self._save()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def take_orphans(self) -> List[Dict]:
+        """Return jobs left over from a previous run, once per process"""
+        with self._lock:
+            orphans, self._orphans = self._orphans, []
+            resumable = []
+            for job_id in orphans:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                if job['attempts'] >= MAX_RESUME_ATTEMPTS:
+                    logger.warning(f"Dropping job {job_id} after {job['attempts']} attempts: {job['url']}")
+                    del self._jobs[job_id]
+                    continue
+                partial_bytes = sum(
+                    os.path.getsize(path) for path in job['partial_files'] if os.path.isfile(path)
+                )
+                resumable.append({'id': job_id, **job, 'partial_bytes': partial_bytes})
+            self._save()
+            return resumable
+
+
+# Global instance
+job_journal = JobJournal()
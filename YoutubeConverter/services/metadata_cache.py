@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from typing import Dict, Optional, Callable, Any
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """SQLite-backed cache for extracted video metadata.
+
+    Entries are stored per namespace ("info", "metadata", ...) and keyed by the
+    canonical video ID. Lookups past the TTL but inside the stale window are
+    served immediately while a background refresh fetches a fresh copy.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 5000) -> None:
+        if db_path is None:
+            data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'metadata_cache.db')
+        self.db_path = db_path
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'evictions': 0}
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS metadata (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_metadata_accessed ON metadata (accessed_at)"
+            )
+            self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[Dict]:
+        """Return the cached payload and its age, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM metadata WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE metadata SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (time.time(), namespace, key)
+            )
+            self._conn.commit()
+        try:
+            return {'value': json.loads(row[0]), 'age': time.time() - row[1]}
+        except json.JSONDecodeError:
+            self.delete(namespace, key)
+            return None
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """Store a payload and evict least recently used entries over the cap"""
+        try:
+            payload = json.dumps(value, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not caching {namespace}/{key}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (namespace, key, payload, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, payload, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM metadata WHERE rowid IN "
+                    "(SELECT rowid FROM metadata ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self._stats['evictions'] += overflow
+            self._conn.commit()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM metadata WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM metadata")
+            self._conn.commit()
+
+    def get_or_fetch(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Optional[Any]],
+        ttl: float,
+        stale_ttl: float = 0,
+    ) -> Optional[Any]:
+        """Return a cached value, fetching (or revalidating) it as needed.
+
+        fetch() results that are None are treated as failures and never cached.
+        """
+        cached = self.get(namespace, key)
+        if cached is not None:
+            if cached['age'] < ttl:
+                self._count('hits')
+                return cached['value']
+            if cached['age'] < ttl + stale_ttl:
+                self._count('stale_hits')
+                self._refresh_async(namespace, key, fetch)
+                return cached['value']
+
+        self._count('misses')
+        value = fetch()
+        if value is not None:
+            self.put(namespace, key, value)
+        return value
+
+    def _refresh_async(self, namespace: str, key: str, fetch: Callable[[], Optional[Any]]) -> None:
+        """Refresh a stale entry in the background, once per key"""
+        with self._lock:
+            if (namespace, key) in self._refreshing:
+                return
+            self._refreshing.add((namespace, key))
+            self._stats['refreshes'] += 1
+
+        def refresh():
+            try:
+                value = fetch()
+                if value is not None:
+                    self.put(namespace, key, value)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {namespace}/{key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard((namespace, key))
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss counters and the current entry count"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+            return {**self._stats, 'entries': entries}
+
+
+# Global instance
+metadata_cache = MetadataCache()
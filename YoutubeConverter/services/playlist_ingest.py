@@ -0,0 +1,169 @@
+import time
+import logging
+import threading
+from typing import Dict, List, Callable, Any, Optional, Set
+from yt_dlp.utils import DownloadCancelled
+from services.youtube_api import api
+from services.cancellation import CancelToken
+from services.download_queue import download_queue, DownloadJob, PRIORITY_LOW
+
+logger = logging.getLogger(__name__)
+
+# Entries of one ingestion waiting in the download queue before extraction pauses
+MAX_QUEUED_ENTRIES = 10
+# How often a paused ingestion rechecks the queue (jobs cancelled elsewhere never start)
+BACKPRESSURE_POLL = 1.0
+
+
+class PlaylistIngestion:
+    """Streams the entries of a playlist or channel into the download queue.
+
+    Entries are submitted as soon as flat extraction yields them, so downloads
+    start while later pages are still being fetched. Once max_queued of its
+    entries wait in the queue, extraction pauses until workers pick them up,
+    so a huge playlist is never held in memory at once. While it waits, the
+    info of the waiting entries is prefetched concurrently, so their
+    downloads can reuse the extraction. on_progress receives a
+    counters dict (discovered, queued, finished, failed, done, cancelled) from
+    background threads whenever one of them changes.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        make_job_body: Callable[[Dict], Callable[[DownloadJob], Any]],
+        on_progress: Optional[Callable[[Dict], None]] = None,
+        priority: int = PRIORITY_LOW,
+        max_queued: int = MAX_QUEUED_ENTRIES,
+    ) -> None:
+        self.url = url
+        self.make_job_body = make_job_body
+        self.on_progress = on_progress
+        self.priority = priority
+        self.max_queued = max_queued
+        self.cancel_token = CancelToken()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pending_jobs: Dict[int, DownloadJob] = {}
+        self._prefetched: Set[int] = set()
+        self._counts = {'discovered': 0, 'queued': 0, 'finished': 0, 'failed': 0}
+        self._stats = {'paused': 0, 'paused_time': 0.0}
+        self._done = False
+        self.error: Optional[Exception] = None
+
+    def start(self) -> 'PlaylistIngestion':
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            for entry in api.iter_playlist_entries(self.url, self.cancel_token):
+                self._update('discovered')
+                if not entry.get('url'):
+                    continue
+                self._wait_for_room()
+                job = download_queue.submit(
+                    entry['url'],
+                    self._wrap(self.make_job_body(entry)),
+                    priority=self.priority,
+                )
+                with self._lock:
+                    if not job.done:
+                        self._pending_jobs[job.id] = job
+                self._update('queued')
+        except DownloadCancelled:
+            logger.info(f"Playlist ingestion cancelled: {self.url}")
+        except Exception as e:
+            logger.error(f"Error expanding playlist {self.url}: {e}")
+            self.error = e
+        finally:
+            self._done = True
+            if self._stats['paused']:
+                logger.info(
+                    f"Playlist {self.url}: extraction waited for the queue {self._stats['paused']} times "
+                    f"({self._stats['paused_time']:.1f}s)"
+                )
+            self._publish()
+
+    def _queued_entries(self) -> int:
+        return sum(1 for job in self._pending_jobs.values() if job.state == 'queued')
+
+    def _wait_for_room(self) -> None:
+        """Block extraction while too many of this playlist's entries wait in the queue"""
+        with self._cond:
+            if self._queued_entries() < self.max_queued:
+                return
+            self._stats['paused'] += 1
+            self._prefetch_waiting()
+            started = time.monotonic()
+            while self._queued_entries() >= self.max_queued and not self.cancel_token.cancelled:
+                self._cond.wait(BACKPRESSURE_POLL)
+            self._stats['paused_time'] += time.monotonic() - started
+        self.cancel_token.raise_if_cancelled()
+
+    def _prefetch_waiting(self) -> None:
+        """Look up the entries waiting in the queue in the background (lock held)"""
+        jobs = [job for job in self._pending_jobs.values()
+                if job.state == 'queued' and job.id not in self._prefetched]
+        if not jobs:
+            return
+        self._prefetched.update(job.id for job in jobs)
+
+        def prefetch():
+            for _ in api.prefetch_video_info([job.url for job in jobs]):
+                if self.cancel_token.cancelled:
+                    break
+
+        threading.Thread(target=prefetch, daemon=True).start()
+
+    def _wrap(self, body: Callable[[DownloadJob], Any]) -> Callable[[DownloadJob], Any]:
+        def run(job: DownloadJob) -> Any:
+            with self._cond:
+                # The job left the queue; extraction may continue
+                self._cond.notify()
+            try:
+                result = body(job)
+            except Exception:
+                self._finish_job(job, None if job.cancelled else 'failed')
+                raise
+            self._finish_job(job, None if job.cancelled else 'finished')
+            return result
+        return run
+
+    def _finish_job(self, job: DownloadJob, outcome: Optional[str]) -> None:
+        with self._lock:
+            self._pending_jobs.pop(job.id, None)
+            self._prefetched.discard(job.id)
+        if outcome:
+            self._update(outcome)
+
+    def _update(self, counter: str) -> None:
+        with self._lock:
+            self._counts[counter] += 1
+        self._publish()
+
+    def _publish(self) -> None:
+        if self.on_progress:
+            try:
+                self.on_progress(self.get_progress())
+            except Exception as e:
+                logger.error(f"Error in playlist progress callback: {e}")
+
+    def get_progress(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counts,
+                'done': self._done,
+                'cancelled': self.cancel_token.cancelled,
+            }
+
+    def cancel(self) -> None:
+        """Stop discovering entries and cancel every job not yet finished"""
+        self.cancel_token.cancel()
+        with self._cond:
+            jobs: List[DownloadJob] = list(self._pending_jobs.values())
+            self._pending_jobs.clear()
+            self._cond.notify()
+        for job in jobs:
+            download_queue.cancel(job)
+        self._publish()
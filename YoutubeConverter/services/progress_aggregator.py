@@ -0,0 +1,168 @@
+import time
+import logging
+import threading
+from typing import Dict, Callable, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds of samples folded into each speed measurement
+SPEED_WINDOW = 0.25
+
+
+class JobProgress:
+    """Progress state for one job, fed by raw yt-dlp hook events"""
+
+    def __init__(self, job_key: Any, smoothing: float) -> None:
+        self.job_key = job_key
+        self.smoothing = smoothing
+        self.phase = 'queued'
+        self.completed_files_bytes = 0
+        self.downloaded_bytes = 0
+        self.total_bytes: Optional[int] = None
+        self.speed: Optional[float] = None
+        self.fragment_index: Optional[int] = None
+        self.fragment_count: Optional[int] = None
+        self.fragment_stats: Optional[Dict] = None
+        self.bandwidth: Optional[Dict] = None
+        self._last_sample: Optional[tuple] = None
+        self.dirty = True
+
+    def feed(self, d: Dict) -> None:
+        status = d.get('status')
+        if status == 'downloading':
+            downloaded = d.get('downloaded_bytes') or 0
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            now = time.monotonic()
+            if self._last_sample is None or downloaded < self._last_sample[1]:
+                # First event, or a new file (e.g. the audio stream) restarted the counter
+                self._last_sample = (now, downloaded)
+            elif now - self._last_sample[0] >= SPEED_WINDOW:
+                last_time, last_bytes = self._last_sample
+                instant = (downloaded - last_bytes) / (now - last_time)
+                if self.speed is None:
+                    self.speed = instant
+                else:
+                    self.speed += self.smoothing * (instant - self.speed)
+                self._last_sample = (now, downloaded)
+            self.downloaded_bytes = downloaded
+            self.total_bytes = total
+            self.fragment_index = d.get('fragment_index')
+            self.fragment_count = d.get('fragment_count')
+            if d.get('fragment_stats'):
+                self.fragment_stats = d['fragment_stats']
+            if d.get('bandwidth'):
+                self.bandwidth = d['bandwidth']
+            self.phase = 'downloading'
+        elif status == 'finished':
+            self.completed_files_bytes += d.get('total_bytes') or d.get('downloaded_bytes') or 0
+            self.downloaded_bytes = 0
+            self.total_bytes = None
+            self._last_sample = None
+        self.dirty = True
+
+    def snapshot(self) -> Dict:
+        done = self.completed_files_bytes + self.downloaded_bytes
+        total = self.completed_files_bytes + self.total_bytes if self.total_bytes else None
+        eta = None
+        if total and self.speed:
+            eta = max(0.0, (total - done) / self.speed)
+        return {
+            'job_key': self.job_key,
+            'phase': self.phase,
+            'bytes_done': done,
+            'bytes_total': total,
+            'percent': (done / total * 100) if total else None,
+            'speed': self.speed,
+            'eta': eta,
+            'fragment_index': self.fragment_index,
+            'fragment_count': self.fragment_count,
+            'fragment_stats': self.fragment_stats,
+            'bandwidth': self.bandwidth,
+        }
+
+
+class ProgressAggregator:
+    """Collects raw progress events from workers and publishes them at a fixed frame rate.
+
+    Worker threads call report()/set_phase(), which only update in-memory
+    state. A single Tk after() loop, started with attach(), hands each job's
+    latest snapshot to its listener at most once per frame on the UI thread.
+    """
+
+    def __init__(self, fps: int = 10, smoothing: float = 0.3) -> None:
+        self.interval_ms = int(1000 / fps)
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._jobs: Dict[Any, JobProgress] = {}
+        self._listeners: Dict[Any, Callable[[Dict], None]] = {}
+        self._pump_widget = None
+        self._stats = {'events': 0, 'published': 0}
+
+    def subscribe(self, job_key: Any, listener: Callable[[Dict], None]) -> None:
+        """Register the UI callback for a job (called on the Tk thread)"""
+        with self._lock:
+            self._listeners[job_key] = listener
+            self._jobs.setdefault(job_key, JobProgress(job_key, self.smoothing))
+
+    def report(self, job_key: Any, d: Dict) -> None:
+        """Record a raw yt-dlp progress hook event (called on worker threads)"""
+        with self._lock:
+            job = self._jobs.get(job_key)
+            if job is None:
+                job = self._jobs[job_key] = JobProgress(job_key, self.smoothing)
+            job.feed(d)
+            self._stats['events'] += 1
+
+    def set_phase(self, job_key: Any, phase: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_key)
+            if job is None:
+                job = self._jobs[job_key] = JobProgress(job_key, self.smoothing)
+            job.phase = phase
+            job.dirty = True
+
+    def finish(self, job_key: Any) -> None:
+        """Drop a job's state so no further frames are published for it"""
+        with self._lock:
+            self._jobs.pop(job_key, None)
+            self._listeners.pop(job_key, None)
+
+    def attach(self, widget) -> None:
+        """Run the publish loop on widget's event loop, replacing any previous one"""
+        self._pump_widget = widget
+        widget.after(self.interval_ms, lambda: self._tick(widget))
+
+    def _tick(self, widget) -> None:
+        if widget is not self._pump_widget:
+            return
+        try:
+            if not widget.winfo_exists():
+                return
+        except Exception:
+            return
+
+        with self._lock:
+            pending = []
+            for job_key, job in self._jobs.items():
+                listener = self._listeners.get(job_key)
+                if job.dirty and listener is not None:
+                    job.dirty = False
+                    pending.append((listener, job.snapshot()))
+            self._stats['published'] += len(pending)
+
+        for listener, update in pending:
+            try:
+                listener(update)
+            except Exception as e:
+                logger.error(f"Error publishing progress for job {update['job_key']}: {e}")
+
+        widget.after(self.interval_ms, lambda: self._tick(widget))
+
+    def get_stats(self) -> Dict:
+        """Raw events received vs. UI updates published"""
+        with self._lock:
+            return dict(self._stats, jobs=len(self._jobs))
+
+
+# Global instance
+progress_aggregator = ProgressAggregator()
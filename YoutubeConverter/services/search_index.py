@@ -0,0 +1,170 @@
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Score of a query word found as a whole word, at the start of a word, or anywhere inside one
+EXACT_SCORE = 3
+PREFIX_SCORE = 2
+SUBSTRING_SCORE = 1
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lower-case text without accents or punctuation, words separated by single spaces"""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(WORD_RE.findall(text.casefold()))
+
+
+def trigrams(word: str) -> Set[str]:
+    """Every three-character slice of a word"""
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class _Document:
+    __slots__ = ('fields', 'text', 'grams', 'payload', 'order')
+
+    def __init__(self, fields: Dict[str, str], payload: Any, order: float) -> None:
+        # Padded with spaces so whole-word and word-start matches are plain substring checks
+        self.fields = {name: f" {normalize(value)} " for name, value in fields.items()}
+        # Words never contain spaces, so a query word cannot match across fields
+        self.text = ''.join(self.fields.values())
+        self.grams = set().union(*(trigrams(word) for word in self.text.split()))
+        self.payload = payload
+        self.order = order
+
+
+class SearchResults:
+    """Ranked matches of one query, turned into payloads a page at a time"""
+
+    def __init__(self, index: 'SearchIndex', keys: List[Hashable]) -> None:
+        self._index = index
+        self._keys = keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def page(self, offset: int, limit: int) -> List[Any]:
+        """Payloads of matches offset to offset + limit (documents removed since are skipped)"""
+        return self._index.payloads(self._keys[offset:offset + limit])
+
+
+class SearchIndex:
+    """In-memory trigram index for instant search as you type.
+
+    Every document is a few text fields plus a payload. A document matches
+    when each query word occurs somewhere in its fields; candidates come from
+    the trigram postings and are then checked against the normalized text.
+    Results are ranked by where the words matched (whole word, word start,
+    inside a word), weighted per field, newest (highest order) first on ties.
+
+    The matches of the last query are kept up to date as documents are added
+    and removed, so a query that only grows (another letter or word typed)
+    filters those instead of going back to the index. All methods are thread
+    safe; searches are meant to run off the Tk thread.
+    """
+
+    def __init__(self, weights: Dict[str, float]) -> None:
+        self.weights = weights
+        self._lock = threading.Lock()
+        self._docs: Dict[Hashable, _Document] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._last_query: Optional[str] = None
+        self._last_words: List[str] = []
+        self._last_keys: Set[Hashable] = set()
+
+    def add(self, key: Hashable, fields: Dict[str, str], payload: Any = None, order: float = 0.0) -> None:
+        """Index a document, replacing any document with the same key"""
+        doc = _Document(fields, key if payload is None else payload, order)
+        with self._lock:
+            self._remove(key)
+            self._docs[key] = doc
+            for gram in doc.grams:
+                self._postings.setdefault(gram, set()).add(key)
+            if self._last_query is not None and self._matches(doc, self._last_words):
+                self._last_keys.add(key)
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for gram in doc.grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+        self._last_keys.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._last_query = None
+            self._last_keys = set()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _matches(doc: _Document, words: List[str]) -> bool:
+        return all(word in doc.text for word in words)
+
+    def _candidates(self, words: List[str]) -> Set[Hashable]:
+        candidates: Optional[Set[Hashable]] = None
+        for word in words:
+            for gram in trigrams(word):
+                keys = self._postings.get(gram, set())
+                candidates = set(keys) if candidates is None else candidates & keys
+                if not candidates:
+                    return set()
+        # Words shorter than three characters have no trigrams to narrow the search
+        return set(self._docs) if candidates is None else candidates
+
+    def _score(self, doc: _Document, words: List[str]) -> float:
+        score = 0.0
+        for word in words:
+            best = 0.0
+            for name, field in doc.fields.items():
+                if word not in field:
+                    continue
+                weight = self.weights.get(name, 1.0)
+                if f" {word} " in field:
+                    best = max(best, weight * EXACT_SCORE)
+                elif f" {word}" in field:
+                    best = max(best, weight * PREFIX_SCORE)
+                else:
+                    best = max(best, weight * SUBSTRING_SCORE)
+            score += best
+        return score
+
+    def payloads(self, keys: List[Hashable]) -> List[Any]:
+        with self._lock:
+            return [self._docs[key].payload for key in keys if key in self._docs]
+
+    def search(self, query: str) -> SearchResults:
+        """The documents matching query, best match first"""
+        normalized = normalize(query)
+        words = normalized.split()
+        with self._lock:
+            # Every match of a longer query also matched the query it grew from
+            if self._last_query is not None and normalized.startswith(self._last_query):
+                candidates = self._last_keys
+            else:
+                candidates = self._candidates(words)
+            matched = {key for key in candidates if self._matches(self._docs[key], words)}
+            self._last_query = normalized
+            self._last_words = words
+            self._last_keys = matched
+
+            ranked = sorted(
+                matched,
+                key=lambda key: (-self._score(self._docs[key], words), -self._docs[key].order)
+            )
+        return SearchResults(self, ranked)
@@ -0,0 +1,39 @@
+import logging
+from services.ydl_pool import ydl_pool
+from services.youtube_api import api
+from services.metadata_cache import metadata_cache
+from services.thumbnail_service import thumbnail_service
+from services.transcode_planner import transcode_planner
+from services.fragment_tuner import fragment_tuner
+from services.bandwidth_scheduler import bandwidth_scheduler
+from services.progress_aggregator import progress_aggregator
+from services.history_store import history_store
+from services.download_journal import download_journal
+from utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+
+def log_service_stats() -> None:
+    """Write the counters of the shared services to the debug log (called on exit)"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    sources = (
+        ('yt-dlp pool', ydl_pool.get_metrics),
+        ('video info prefetch', api.get_prefetch_stats),
+        ('extraction handoff', api.get_handoff_stats),
+        ('metadata cache', metadata_cache.get_stats),
+        ('thumbnails', thumbnail_service.get_stats),
+        ('transcodes', transcode_planner.get_stats),
+        ('fragment tuner', fragment_tuner.get_stats),
+        ('bandwidth', bandwidth_scheduler.get_stats),
+        ('progress', progress_aggregator.get_stats),
+        ('history', history_store.get_stats),
+        ('download journal', download_journal.get_stats),
+        ('http', http_client.get_stats),
+    )
+    for name, get_stats in sources:
+        try:
+            logger.debug(f"{name} stats: {get_stats()}")
+        except Exception as e:
+            logger.error(f"Error reading {name} stats: {e}")
@@ -0,0 +1,57 @@
+import threading
+from typing import Dict, Callable, Hashable, Any, Optional
+
+
+class _Call:
+    """One in-flight execution shared by every caller asking for its key"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into a single execution.
+
+    The first caller for a key runs fn(); callers arriving while it is still
+    running wait for and share its result (or exception). Nothing is cached
+    once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {'calls': 0, 'shared': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['calls'] += 1
+            else:
+                self._stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def get_stats(self) -> Dict:
+        """Executions started vs. callers that joined one already in flight"""
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
@@ -0,0 +1,319 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Callable, Tuple
+import requests
+from utils.http_client import http_client
+from PIL import Image
+from services.singleflight import SingleFlight
+from utils.ui_helper import UIHelper
+
+logger = logging.getLogger(__name__)
+
+# Target size as (width, height); a height of None keeps the aspect ratio
+ThumbnailSize = Tuple[int, Optional[int]]
+
+YTIMG_URL_RE = re.compile(
+    r'^https?://(?:i\d?\.ytimg\.com|img\.youtube\.com)/vi(?:_webp)?/([0-9A-Za-z_-]{11})/[^/?#]+$'
+)
+
+# Letterbox-free 16:9 variants that YouTube serves for every video, smallest first
+THUMBNAIL_VARIANTS = (
+    ('mqdefault.jpg', 320, 180),
+)
+
+
+def thumbnail_variant(url: str, size: ThumbnailSize) -> str:
+    """Return the smallest YouTube thumbnail variant that covers size.
+
+    Falls back to url itself for non-YouTube images or targets larger than
+    every variant (e.g. the maxresdefault.jpg most info dicts point at).
+    """
+    match = YTIMG_URL_RE.match(url)
+    if not match:
+        return url
+    width, height = size
+    for name, variant_width, variant_height in THUMBNAIL_VARIANTS:
+        if width <= variant_width and (height is None or height <= variant_height):
+            return f"https://i.ytimg.com/vi/{match.group(1)}/{name}"
+    return url
+
+
+class ThumbnailService:
+    """Loads, resizes and caches video thumbnails for every page.
+
+    Decoded images are kept in an in-memory LRU per target size, so showing a
+    thumbnail again is instant. The original bytes live in an on-disk cache
+    next to their ETag/Last-Modified validators; entries older than
+    revalidate_after are revalidated with a conditional GET. Loading runs on
+    a small worker pool and callbacks are delivered on the Tk thread.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        memory_entries: int = 64,
+        disk_max_bytes: int = 100 * 1024 * 1024,
+        revalidate_after: float = 24 * 60 * 60,
+        max_workers: int = 4,
+    ) -> None:
+        if cache_dir is None:
+            data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+            cache_dir = os.path.join(data_dir, 'thumbnails')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.revalidate_after = revalidate_after
+
+        self._lock = threading.Lock()
+        self._memory: Dict[Tuple, OrderedDict] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='thumbnail')
+        self._fetches = SingleFlight()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'revalidated': 0,
+            'downloads': 0,
+            'errors': 0,
+            'decodes': 0,
+            'decode_time': 0.0,
+            'peak_decoded_bytes': 0,
+        }
+        self._last_decode: Optional[Dict] = None
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_cached(self, url: str, size: ThumbnailSize, pad: bool = False) -> Optional[Image.Image]:
+        """Return the decoded thumbnail if it is already in memory"""
+        with self._lock:
+            images = self._memory.get((size, pad))
+            if images is None or url not in images:
+                return None
+            images.move_to_end(url)
+            self._stats['memory_hits'] += 1
+            return images[url]
+
+    def _remember(self, url: str, size: ThumbnailSize, pad: bool, image: Image.Image) -> None:
+        with self._lock:
+            images = self._memory.setdefault((size, pad), OrderedDict())
+            images[url] = image
+            images.move_to_end(url)
+            while len(images) > self.memory_entries:
+                images.popitem(last=False)
+
+    def load(
+        self,
+        url: str,
+        size: ThumbnailSize,
+        widget,
+        callback: Callable[[Optional[Image.Image]], None],
+        pad: bool = False,
+    ) -> None:
+        """Load a thumbnail resized to size and pass it to callback on widget's Tk thread.
+
+        A memory hit calls back immediately; otherwise the image is loaded in
+        the background and callback receives None if it could not be loaded.
+        pad letterboxes the image into size instead of stretching it.
+        """
+        if not url:
+            callback(None)
+            return
+        image = self.get_cached(url, size, pad)
+        if image is not None:
+            callback(image)
+            return
+
+        def run():
+            image = None
+            try:
+                image = self._load_image(url, size, pad)
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"Error loading thumbnail {url}: {e}")
+            try:
+                widget.after(0, lambda: callback(image))
+            except RuntimeError:
+                # The widget was destroyed while the thumbnail was loading
+                pass
+
+        self._executor.submit(run)
+
+    def _load_image(self, url: str, size: ThumbnailSize, pad: bool) -> Image.Image:
+        source_url = thumbnail_variant(url, size)
+        try:
+            data = self._fetches.do(source_url, lambda: self._get_bytes(source_url))
+        except Exception:
+            if source_url == url:
+                raise
+            # Not every video has every variant; fall back to the URL we were given
+            data = self._fetches.do(url, lambda: self._get_bytes(url))
+        image = self._decode(data, size, pad)
+        self._remember(url, size, pad, image)
+        return image
+
+    def _decode(self, data: bytes, size: ThumbnailSize, pad: bool) -> Image.Image:
+        started = time.perf_counter()
+        image = Image.open(BytesIO(data))
+        source_size = image.size
+        width, height = size
+        if height is None:
+            height = max(1, round(width * image.height / image.width))
+
+        # Decode JPEGs at the smallest power-of-two scale that still covers the target
+        UIHelper.draft_image(image, (width, height))
+        image.load()
+        decoded_size = image.size
+        if pad:
+            result = UIHelper.resize_image(image, (width, height))
+        else:
+            result = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+        elapsed = time.perf_counter() - started
+        # The decoded pixel buffer is the largest allocation made per thumbnail
+        decoded_bytes = decoded_size[0] * decoded_size[1] * len(image.getbands())
+        with self._lock:
+            self._stats['decodes'] += 1
+            self._stats['decode_time'] += elapsed
+            self._stats['peak_decoded_bytes'] = max(self._stats['peak_decoded_bytes'], decoded_bytes)
+            self._last_decode = {
+                'source_size': source_size,
+                'decoded_size': decoded_size,
+                'decoded_bytes': decoded_bytes,
+                'decode_ms': round(elapsed * 1000, 2),
+            }
+        return result
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, name)
+        return base + '.img', base + '.json'
+
+    def _get_bytes(self, url: str) -> bytes:
+        """Return the original image bytes, from disk when still valid"""
+        data_path, meta_path = self._paths(url)
+        meta = None
+        data = None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(data_path, 'rb') as f:
+                data = f.read()
+        except (OSError, json.JSONDecodeError):
+            meta = data = None
+
+        if data is not None and time.time() - meta.get('fetched_at', 0) < self.revalidate_after:
+            self._count('disk_hits')
+            self._touch(data_path)
+            return data
+
+        headers = {}
+        if data is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            response = http_client.get(url, headers=headers)
+        except requests.RequestException:
+            if data is not None:
+                # Offline: an old thumbnail beats no thumbnail
+                self._count('disk_hits')
+                return data
+            raise
+
+        if response.status_code == 304 and data is not None:
+            self._count('revalidated')
+            meta['fetched_at'] = time.time()
+            self._write_meta(meta_path, meta)
+            self._touch(data_path)
+            return data
+
+        response.raise_for_status()
+        self._count('downloads')
+        self._store(url, response)
+        return response.content
+
+    def _touch(self, data_path: str) -> None:
+        """Mark a disk entry as recently used so trimming keeps it"""
+        try:
+            os.utime(data_path)
+        except OSError:
+            pass
+
+    def _write_meta(self, meta_path: str, meta: Dict) -> None:
+        tmp_path = meta_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, meta_path)
+        except OSError as e:
+            logger.warning(f"Could not write thumbnail metadata {meta_path}: {e}")
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        data_path, meta_path = self._paths(url)
+        try:
+            tmp_path = data_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_path, data_path)
+            self._write_meta(meta_path, {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            })
+            self._trim_disk()
+        except OSError as e:
+            logger.warning(f"Could not cache thumbnail {url}: {e}")
+
+    def _trim_disk(self) -> None:
+        """Remove the least recently used thumbnails beyond disk_max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.img'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.disk_max_bytes:
+                break
+            for stale in (path, path[:-len('.img')] + '.json'):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            total -= size
+
+    def get_stats(self) -> Dict:
+        """Cache counters plus decode time and memory per thumbnail"""
+        with self._lock:
+            decodes = self._stats['decodes']
+            return dict(
+                self._stats,
+                memory_entries=sum(len(images) for images in self._memory.values()),
+                avg_decode_ms=round(self._stats['decode_time'] / decodes * 1000, 2) if decodes else None,
+                last_decode=self._last_decode,
+            )
+
+
+# Global instance
+thumbnail_service = ThumbnailService()
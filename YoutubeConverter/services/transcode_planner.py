@@ -0,0 +1,210 @@
+import os
+import re
+import subprocess
+import logging
+import threading
+from typing import Dict, List, Optional
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+from services.cancellation import CancelToken, TrackedPopen, bind_token
+
+logger = logging.getLogger(__name__)
+
+# Codec prefixes (as yt-dlp reports them) that an mp4 container can carry
+# and common players decode
+MP4_VIDEO_CODECS = ('avc1', 'avc3', 'h264', 'hvc1', 'hev1', 'hevc', 'h265', 'av01', 'vp09', 'vp9')
+MP4_AUDIO_CODECS = ('mp4a', 'aac', 'mp3', 'ac-3', 'ec-3')
+
+# Audio-only outputs: file extension, source codec prefixes that can be stream
+# copied into it, the encoder used otherwise and whether a bitrate applies
+AUDIO_OUTPUTS = {
+    'mp3': {'ext': 'mp3', 'codecs': ('mp3',), 'encoder': 'libmp3lame', 'lossless': False},
+    'm4a': {'ext': 'm4a', 'codecs': ('mp4a', 'aac'), 'encoder': 'aac', 'lossless': False},
+    'aac': {'ext': 'aac', 'codecs': ('mp4a', 'aac'), 'encoder': 'aac', 'lossless': False},
+    'opus': {'ext': 'opus', 'codecs': ('opus',), 'encoder': 'libopus', 'lossless': False},
+    'flac': {'ext': 'flac', 'codecs': ('flac',), 'encoder': 'flac', 'lossless': True},
+    'wav': {'ext': 'wav', 'codecs': ('pcm_s16le',), 'encoder': 'pcm_s16le', 'lossless': True},
+}
+DEFAULT_AUDIO_BITRATE = 320
+BITRATE_RE = re.compile(r'(\d+)\s*kbps', re.IGNORECASE)
+
+BENCH_RE = re.compile(r'bench: utime=([\d.]+)s stime=([\d.]+)s')
+
+
+def audio_format_selector(codec: str) -> str:
+    """yt-dlp format selector preferring an audio stream that can be stream copied into codec"""
+    preferred = [f"bestaudio[acodec^={prefix}]" for prefix in AUDIO_OUTPUTS[codec]['codecs']]
+    return '/'.join([*preferred, 'bestaudio', 'best'])
+
+
+def parse_bitrate(quality: str) -> int:
+    """Kilobits per second from an audio quality setting such as 320kbps"""
+    match = BITRATE_RE.search(quality or '')
+    return int(match.group(1)) if match else DEFAULT_AUDIO_BITRATE
+
+
+class TranscodePlanner:
+    """Makes a finished download an mp4 with the least work possible.
+
+    The codecs and container of the formats yt-dlp selected decide the path:
+    "noop" when the file already is a compatible mp4, "remux" when only the
+    container is wrong, "audio" when just the audio track needs re-encoding
+    and "full" when the video codec cannot go into mp4. Every job's path and
+    the ffmpeg CPU seconds it used are recorded.
+
+    Audio-only jobs are planned the same way: "copy" when the downloaded
+    stream already is the requested codec and "encode" otherwise.
+    """
+
+    def __init__(self, crf: int = 20, preset: str = 'veryfast', audio_bitrate: str = '192k') -> None:
+        self.crf = crf
+        self.preset = preset
+        self.audio_bitrate = audio_bitrate
+        self._lock = threading.Lock()
+        self._stats = {path: {'jobs': 0, 'cpu_seconds': 0.0} for path in (
+            'noop', 'remux', 'audio', 'full', 'audio_copy', 'audio_encode')}
+
+    @staticmethod
+    def _codecs(info: Dict) -> Dict:
+        vcodec = acodec = None
+        for fmt in info.get('requested_formats') or [info]:
+            if fmt.get('vcodec') not in (None, 'none'):
+                vcodec = fmt['vcodec']
+            if fmt.get('acodec') not in (None, 'none'):
+                acodec = fmt['acodec']
+        return {'vcodec': vcodec, 'acodec': acodec}
+
+    def plan(self, info: Dict) -> Dict:
+        """Choose the transcode path for a downloaded (merged) info dict"""
+        codecs = self._codecs(info)
+        vcodec, acodec = (codecs['vcodec'] or '').lower(), (codecs['acodec'] or '').lower()
+        video_ok = not vcodec or vcodec.startswith(MP4_VIDEO_CODECS)
+        audio_ok = not acodec or acodec.startswith(MP4_AUDIO_CODECS)
+        is_mp4 = (info.get('ext') or '').lower() == 'mp4'
+
+        if not video_ok:
+            path, reason = 'full', f"video codec {vcodec} does not fit mp4"
+        elif not audio_ok:
+            path, reason = 'audio', f"audio codec {acodec} does not fit mp4"
+        elif not is_mp4:
+            path, reason = 'remux', f"{info.get('ext')} container with mp4-compatible codecs"
+        else:
+            path, reason = 'noop', "already an mp4 with compatible codecs"
+        return {'path': path, 'reason': reason, **codecs}
+
+    def _options(self, plan: Dict) -> List[str]:
+        audio = ['-c:a', 'aac', '-b:a', self.audio_bitrate]
+        if plan['path'] == 'remux':
+            return ['-c', 'copy']
+        if plan['path'] == 'audio':
+            return ['-c:v', 'copy', *audio]
+        video = ['-c:v', 'libx264', '-preset', self.preset, '-crf', str(self.crf), '-pix_fmt', 'yuv420p']
+        audio_ok = (plan['acodec'] or '').lower().startswith(MP4_AUDIO_CODECS)
+        return [*video, *(['-c:a', 'copy'] if audio_ok else audio)]
+
+    def _run_ffmpeg(self, filepath: str, options: List[str], tmp_path: str,
+                    cancel_token: Optional[CancelToken]) -> float:
+        """Run ffmpeg from filepath into tmp_path and return the CPU seconds it used"""
+        if cancel_token:
+            cancel_token.track_path(tmp_path)
+        ffmpeg = FFmpegPostProcessor()
+        if not ffmpeg.available:
+            raise Exception("ffmpeg is required to convert this file")
+        args = [
+            # -benchmark reports at info level
+            ffmpeg.executable, '-y', '-hide_banner', '-nostats', '-loglevel', 'info', '-benchmark',
+            '-i', filepath, *options, tmp_path,
+        ]
+        with bind_token(cancel_token):
+            _, stderr, returncode = TrackedPopen.run(
+                args, text=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        if returncode != 0:
+            raise Exception(f"ffmpeg failed: {stderr.strip()[-500:]}")
+
+        match = BENCH_RE.search(stderr or '')
+        return float(match.group(1)) + float(match.group(2)) if match else 0.0
+
+    def _finish(self, path: str, result: Dict) -> Dict:
+        with self._lock:
+            stats = self._stats[path]
+            stats['jobs'] += 1
+            stats['cpu_seconds'] += result['cpu_seconds']
+        logger.info(f"Transcode path for {os.path.basename(result['filepath'])}: {result}")
+        return result
+
+    def apply(self, info: Dict, filepath: str, cancel_token: Optional[CancelToken] = None) -> Dict:
+        """Run the planned path on filepath and return the plan with its result.
+
+        The result has the final filepath and the CPU seconds ffmpeg spent
+        (from its -benchmark report, so it works on every platform).
+        """
+        plan = self.plan(info)
+        result = dict(plan, filepath=filepath, cpu_seconds=0.0)
+        if plan['path'] != 'noop':
+            base, _ = os.path.splitext(filepath)
+            tmp_path = base + '.transcode.mp4'
+            final_path = base + '.mp4'
+            options = ['-map', '0:v:0?', '-map', '0:a:0?', *self._options(plan), '-movflags', '+faststart']
+            try:
+                result['cpu_seconds'] = self._run_ffmpeg(filepath, options, tmp_path, cancel_token)
+            except Exception as e:
+                raise Exception(f"{plan['path']}: {e}")
+            os.replace(tmp_path, final_path)
+            if final_path != filepath:
+                os.remove(filepath)
+            result['filepath'] = final_path
+        return self._finish(plan['path'], result)
+
+    def plan_audio(self, info: Dict, codec: str) -> Dict:
+        """Choose between stream copy and encoding for an audio-only output"""
+        output = AUDIO_OUTPUTS[codec]
+        acodec = (self._codecs(info)['acodec'] or '').lower()
+        if acodec.startswith(output['codecs']):
+            path, reason = 'copy', f"source audio is already {acodec}"
+        else:
+            path, reason = 'encode', f"source audio {acodec or 'unknown'} is not {codec}"
+        return {'path': path, 'reason': reason, 'acodec': acodec or None, 'codec': codec}
+
+    def apply_audio(self, info: Dict, filepath: str, codec: str, quality: str = '',
+                    cancel_token: Optional[CancelToken] = None) -> Dict:
+        """Extract the audio of filepath as codec, stream copying when possible.
+
+        quality is the audio quality setting (e.g. "320kbps"); lossless
+        codecs ignore it.
+        """
+        output = AUDIO_OUTPUTS[codec]
+        plan = self.plan_audio(info, codec)
+        result = dict(plan, filepath=filepath, cpu_seconds=0.0)
+        base, ext = os.path.splitext(filepath)
+        final_path = f"{base}.{output['ext']}"
+        # A copy into the container the stream already sits in has nothing to do
+        if not (plan['path'] == 'copy' and ext.lower() == '.' + output['ext']):
+            if plan['path'] == 'copy':
+                options = ['-c:a', 'copy']
+            else:
+                options = ['-c:a', output['encoder']]
+                if not output['lossless']:
+                    options += ['-b:a', f"{parse_bitrate(quality)}k"]
+            if codec == 'm4a':
+                options += ['-movflags', '+faststart']
+            tmp_path = f"{base}.extract.{output['ext']}"
+            options = ['-map', '0:a:0', '-vn', *options]
+            try:
+                result['cpu_seconds'] = self._run_ffmpeg(filepath, options, tmp_path, cancel_token)
+            except Exception as e:
+                raise Exception(f"audio {plan['path']}: {e}")
+            os.replace(tmp_path, final_path)
+            if final_path != filepath:
+                os.remove(filepath)
+            result['filepath'] = final_path
+        return self._finish(f"audio_{plan['path']}", result)
+
+    def get_stats(self) -> Dict:
+        """Jobs and ffmpeg CPU seconds per transcode path"""
+        with self._lock:
+            return {path: dict(stats) for path, stats in self._stats.items()}
+
+
+# Global instance
+transcode_planner = TranscodePlanner()
@@ -0,0 +1,286 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+import itertools
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Callable, Iterator
+import yt_dlp
+from utils.settings_manager import SettingsManager
+
+logger = logging.getLogger(__name__)
+
+# Leases held next to the download workers' (one each, for a whole download):
+# playlist expansions, preview lookups, batch prefetches (4 at a time) and clips
+LEASE_HEADROOM = 8
+
+# Options that are read by yt-dlp at call time and may be swapped per lease
+# without rebuilding the session (everything else is baked in at __init__).
+LEASE_OVERRIDABLE_OPTS = (
+    'paths', 'noplaylist', 'playlist_items', 'ratelimit', 'download_ranges',
+    'concurrent_fragment_downloads', 'retry_sleep_functions',
+)
+
+
+def options_fingerprint(opts: Dict) -> str:
+    """Return a stable fingerprint for a set of yt-dlp options"""
+    blob = json.dumps(opts, sort_keys=True, default=repr)
+    return hashlib.sha1(blob.encode('utf-8')).hexdigest()[:16]
+
+
+class PooledSession:
+    """A long-lived YoutubeDL instance plus its usage metrics"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, key: str, opts: Dict):
+        self.id = next(PooledSession._ids)
+        self.key = key
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.busy_time = 0.0
+        self.healthy = True
+
+        # Hooks are bound once at construction and dispatched to whoever
+        # currently holds the lease.
+        self._progress_hooks: List[Callable] = []
+        self._postprocessor_hooks: List[Callable] = []
+        opts = dict(opts)
+        opts['progress_hooks'] = [self._dispatch_progress]
+        opts['postprocessor_hooks'] = [self._dispatch_postprocessor]
+        self.ydl = yt_dlp.YoutubeDL(opts)
+
+    def _dispatch_progress(self, d: Dict) -> None:
+        for hook in list(self._progress_hooks):
+            hook(d)
+
+    def _dispatch_postprocessor(self, d: Dict) -> None:
+        for hook in list(self._postprocessor_hooks):
+            hook(d)
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def close(self) -> None:
+        try:
+            self.ydl.close()
+        except Exception as e:
+            logger.debug(f"Error closing yt-dlp session {self.id}: {e}")
+
+    def metrics(self) -> Dict:
+        return {
+            'id': self.id,
+            'key': self.key,
+            'age': round(self.age(), 1),
+            'uses': self.uses,
+            'errors': self.errors,
+            'busy_time': round(self.busy_time, 3),
+            'healthy': self.healthy,
+        }
+
+
+class YoutubeDLPool:
+    """Thread-safe pool of reusable YoutubeDL sessions keyed by option fingerprint"""
+
+    def __init__(
+        self,
+        max_size: int = 6,
+        max_idle_per_key: int = 2,
+        max_uses: int = 250,
+        max_age: float = 30 * 60,
+        max_consecutive_errors: int = 3,
+        acquire_timeout: float = 120.0,
+    ) -> None:
+        self.max_size = max_size
+        self.max_idle_per_key = max_idle_per_key
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.max_consecutive_errors = max_consecutive_errors
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: Dict[str, List[PooledSession]] = {}
+        self._busy: Dict[int, PooledSession] = {}
+        self._cond = threading.Condition()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'discarded': 0, 'waits': 0}
+
+    def _total(self) -> int:
+        return len(self._busy) + sum(len(s) for s in self._idle.values())
+
+    def _is_fit(self, session: PooledSession) -> bool:
+        """Health check run before a session is handed out or returned"""
+        return (
+            session.healthy
+            and session.uses < self.max_uses
+            and session.age() < self.max_age
+        )
+
+    def _evict_one_idle(self) -> Optional[PooledSession]:
+        """Pop the least recently used idle session from any key"""
+        oldest = None
+        for sessions in self._idle.values():
+            for session in sessions:
+                if oldest is None or session.last_used < oldest.last_used:
+                    oldest = session
+        if oldest is not None:
+            self._idle[oldest.key].remove(oldest)
+            self._stats['evictions'] += 1
+        return oldest
+
+    def _acquire(self, key: str, opts: Dict) -> PooledSession:
+        to_close = []
+        deadline = time.monotonic() + self.acquire_timeout
+        try:
+            with self._cond:
+                while True:
+                    idle = self._idle.get(key, [])
+                    while idle:
+                        session = idle.pop()
+                        if self._is_fit(session):
+                            self._stats['hits'] += 1
+                            self._busy[session.id] = session
+                            return session
+                        self._stats['discarded'] += 1
+                        to_close.append(session)
+
+                    if self._total() < self.max_size:
+                        break
+                    evicted = self._evict_one_idle()
+                    if evicted is not None:
+                        to_close.append(evicted)
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a yt-dlp session")
+                    self._stats['waits'] += 1
+                    self._cond.wait(remaining)
+
+                self._stats['misses'] += 1
+                # Reserve the slot before building outside the lock
+                placeholder = object()
+                self._busy[id(placeholder)] = placeholder
+        finally:
+            for session in to_close:
+                session.close()
+
+        try:
+            session = PooledSession(key, opts)
+        except Exception:
+            with self._cond:
+                del self._busy[id(placeholder)]
+                self._cond.notify()
+            raise
+        with self._cond:
+            del self._busy[id(placeholder)]
+            self._busy[session.id] = session
+        logger.debug(f"Created yt-dlp session {session.id} for key {key}")
+        return session
+
+    def set_max_size(self, max_size: int) -> None:
+        """Resize the pool; surplus sessions close as they are returned"""
+        with self._cond:
+            self.max_size = max(1, max_size)
+            self._cond.notify_all()
+
+    def _release(self, session: PooledSession) -> None:
+        close = False
+        with self._cond:
+            self._busy.pop(session.id, None)
+            idle = self._idle.setdefault(session.key, [])
+            if self._is_fit(session) and len(idle) < self.max_idle_per_key and self._total() < self.max_size:
+                idle.append(session)
+            else:
+                self._stats['discarded'] += 1
+                close = True
+            self._cond.notify()
+        if close:
+            session.close()
+
+    @contextmanager
+    def session(
+        self,
+        opts: Dict,
+        overrides: Optional[Dict] = None,
+        progress_hooks: Optional[List[Callable]] = None,
+        postprocessor_hooks: Optional[List[Callable]] = None,
+    ) -> Iterator[yt_dlp.YoutubeDL]:
+        """Lease a YoutubeDL built from opts for the duration of the block.
+
+        Only options in LEASE_OVERRIDABLE_OPTS may be passed as overrides; they
+        are applied for this lease and restored afterwards.
+        """
+        overrides = overrides or {}
+        unsupported = set(overrides) - set(LEASE_OVERRIDABLE_OPTS)
+        if unsupported:
+            raise ValueError(f"Options cannot be overridden per lease: {sorted(unsupported)}")
+
+        key = options_fingerprint(opts)
+        session = self._acquire(key, opts)
+        params = session.ydl.params
+        saved = {name: params[name] for name in overrides if name in params}
+        params.update(overrides)
+        session._progress_hooks = list(progress_hooks or [])
+        session._postprocessor_hooks = list(postprocessor_hooks or [])
+        started = time.monotonic()
+        try:
+            yield session.ydl
+            session.consecutive_errors = 0
+        except yt_dlp.utils.DownloadCancelled:
+            # A user cancel says nothing about the session's health
+            raise
+        except Exception:
+            session.errors += 1
+            session.consecutive_errors += 1
+            if session.consecutive_errors >= self.max_consecutive_errors:
+                session.healthy = False
+            raise
+        finally:
+            session._progress_hooks = []
+            session._postprocessor_hooks = []
+            for name in overrides:
+                if name in saved:
+                    params[name] = saved[name]
+                else:
+                    params.pop(name, None)
+            session.uses += 1
+            session.last_used = time.monotonic()
+            session.busy_time += session.last_used - started
+            self._release(session)
+
+    def invalidate(self) -> None:
+        """Drop every idle session and retire busy ones when they are returned"""
+        with self._cond:
+            idle = [s for sessions in self._idle.values() for s in sessions]
+            self._idle.clear()
+            for session in self._busy.values():
+                if isinstance(session, PooledSession):
+                    session.healthy = False
+            self._stats['discarded'] += len(idle)
+        for session in idle:
+            session.close()
+
+    def get_metrics(self) -> Dict:
+        """Return pool-wide counters and per-session metrics"""
+        with self._cond:
+            busy = [s for s in self._busy.values() if isinstance(s, PooledSession)]
+            idle = [s for sessions in self._idle.values() for s in sessions]
+            return {
+                **self._stats,
+                'size': self._total(),
+                'busy': len(self._busy),
+                'idle': len(idle),
+                'sessions': [s.metrics() for s in busy + idle],
+            }
+
+    def close(self) -> None:
+        """Close all idle sessions (busy ones close when released)"""
+        self.invalidate()
+
+
+# Global instance
+_settings = SettingsManager()
+ydl_pool = YoutubeDLPool(max_size=int(_settings.get_setting('max_concurrent_downloads')) + LEASE_HEADROOM)
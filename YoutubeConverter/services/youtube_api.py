@@ -1,14 +1,48 @@
 import os
+import re
+import copy
+import time
 import logging
+import threading
 import yt_dlp
 import json
-from typing import Dict, Optional, Tuple, Callable
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Callable, Iterator, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.cookie_manager import cookie_manager
 from utils.browser_automation import BrowserAutomation
+from utils.url_parser import parse_youtube_url, canonical_video_url
+from services.ydl_pool import ydl_pool
+from services.metadata_cache import metadata_cache
+from services.cancellation import CancelToken, bind_token
+from services.singleflight import SingleFlight
+from services.bandwidth_scheduler import bandwidth_scheduler
+from services.fragment_tuner import fragment_tuner, HTTP_CHUNK_SIZE
+from services.transcode_planner import transcode_planner, AUDIO_OUTPUTS, audio_format_selector
+
+# Cache lifetimes in seconds. Full metadata carries signed stream URLs that
+# expire, so it is never served stale.
+INFO_CACHE_TTL = 24 * 60 * 60
+INFO_CACHE_STALE_TTL = 7 * 24 * 60 * 60
+METADATA_CACHE_TTL = 30 * 60
+
+# Default number of concurrent lookups for batch prefetches
+PREFETCH_WORKERS = 4
+
+# Full extractions kept in memory so a download can reuse the preview's formats
+EXTRACTION_CACHE_SIZE = 16
+# Re-extract when the signed stream URLs expire within this many seconds
+STREAM_URL_EXPIRY_MARGIN = 10 * 60
+STREAM_EXPIRE_RE = re.compile(r'[?&/]expire[=/](\d+)')
 
 class YouTubeAPI:
     def __init__(self) -> None:
         """Initialize YouTubeAPI with settings.json."""
+        # Concurrent lookups of the same video share one extraction
+        self._info_flight = SingleFlight()
+        self._extractions: OrderedDict = OrderedDict()
+        self._extractions_lock = threading.Lock()
+        self._handoff_stats = {'reused': 0, 'expired': 0, 'extracted': 0}
         settings_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'settings.json')
         self.api_key: Optional[str] = None
         try:
@@ -50,11 +84,25 @@ class YouTubeAPI:
 
         return opts
 
+    def _cache_key(self, url: str) -> str:
+        """Get the cache key for a URL, preferring its video ID"""
+        parsed = parse_youtube_url(url)
+        if parsed and parsed.video_id:
+            return parsed.video_id
+        if parsed and parsed.playlist_id:
+            return f"playlist:{parsed.playlist_id}"
+        return url
+
     def get_video_metadata(self, video_id: str) -> Dict:
         """Get video metadata using yt-dlp"""
         try:
             url = f"https://www.youtube.com/watch?v={video_id}"
-            return self._extract_info(url)
+            return metadata_cache.get_or_fetch(
+                'metadata',
+                video_id,
+                lambda: yt_dlp.YoutubeDL.sanitize_info(self._extract_info(url)),
+                ttl=METADATA_CACHE_TTL,
+            )
         except Exception as e:
             logging.error(f"Error getting video metadata: {e}")
             return self._get_fallback_data(video_id)
@@ -72,7 +120,10 @@ class YouTubeAPI:
         }
 
     def extract_video_id(self, url: str) -> Optional[str]:
-        """Extract video ID from YouTube URL using yt-dlp"""
+        """Extract video ID from YouTube URL, falling back to yt-dlp for unknown forms"""
+        parsed = parse_youtube_url(url)
+        if parsed and parsed.video_id:
+            return parsed.video_id
         try:
             info = self._extract_info(url)
             return info.get('id')
@@ -80,22 +131,31 @@ class YouTubeAPI:
             logging.error(f"Error extracting video ID: {e}")
             return None
 
+    def _is_access_restricted(self, error: Exception) -> bool:
+        """Check whether an extractor error is caused by sign-in or bot checks"""
+        error_msg = str(error).lower()
+        return any(msg in error_msg for msg in ["sign in", "age", "confirm your age", "bot"])
+
+    def _reset_sessions(self) -> None:
+        """Clear cookies and drop pooled sessions holding the stale cookie jar"""
+        cookie_manager.clear_cookies()
+        ydl_pool.invalidate()
+
     def _extract_info(self, url: str, download: bool = False) -> Dict:
-        """Extract video information using yt-dlp."""
+        """Extract video information using a pooled yt-dlp session."""
         ydl_opts = self._get_yt_dlp_opts(download)
         
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with ydl_pool.session(ydl_opts) as ydl:
                 return ydl.extract_info(url, download=download)
         except yt_dlp.utils.ExtractorError as e:
-            error_msg = str(e).lower()
-            if any(msg in error_msg for msg in ["sign in", "age", "confirm your age", "bot"]):
+            if self._is_access_restricted(e):
                 logging.warning("Access restricted or bot detection. Clearing cookies and retrying...")
                 # Clear cookies to force refresh
-                cookie_manager.clear_cookies()
+                self._reset_sessions()
                 # Retry with fresh options
                 ydl_opts = self._get_yt_dlp_opts(download)
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                with ydl_pool.session(ydl_opts) as ydl:
                     return ydl.extract_info(url, download=download)
             raise
 
@@ -154,74 +214,116 @@ class YouTubeAPI:
             logging.error(f"Error saving temporary cookies: {e}")
             return None
 
+    def _get_info_opts(self) -> Dict:
+        """Get yt-dlp options for lightweight metadata lookups"""
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'dump_single_json': True,  # Just get metadata as JSON
+            'skip_download': True,
+            'no_playlist': True,
+            'extract_flat': True,
+            'format': None,
+            'force_generic_extractor': False,
+            'ignoreerrors': True,
+        }
+
+        # Try to get cookies from cookie manager
+        cookie_file = cookie_manager.get_cookies()
+        if cookie_file and os.path.exists(cookie_file):
+            ydl_opts['cookiefile'] = cookie_file
+        else:
+            ydl_opts['cookiesfrombrowser'] = ('chrome',)
+        return ydl_opts
+
+    def _to_video_info(self, basic_info: Dict) -> Dict:
+        """Reduce a raw yt-dlp info dict to the fields used by the UI"""
+        video_info = {
+            'title': basic_info.get('title', 'Unknown Title'),
+            'author': basic_info.get('uploader', basic_info.get('channel', 'Unknown Channel')),
+            'duration': basic_info.get('duration', 0),
+            'thumbnail': basic_info.get('thumbnail', '')
+        }
+
+        # If no thumbnail, try to get it from video ID
+        if not video_info['thumbnail'] and basic_info.get('id'):
+            video_info['thumbnail'] = f"https://img.youtube.com/vi/{basic_info['id']}/maxresdefault.jpg"
+        return video_info
+
     def get_video_info(self, url: str) -> Optional[Dict]:
-        """Get video information from URL"""
-        try:
-            logging.info(f"Starting to fetch video info for URL: {url}")
-            
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'dump_single_json': True,  # Just get metadata as JSON
-                'skip_download': True,
-                'no_playlist': True,
-                'extract_flat': True,
-                'format': None,
-                'force_generic_extractor': False,
-                'ignoreerrors': True,
+        """Get video information from URL, served from the metadata cache when possible"""
+        key = self._cache_key(url)
+        return self._info_flight.do(key, lambda: metadata_cache.get_or_fetch(
+            'info',
+            key,
+            lambda: self._fetch_video_info(url),
+            ttl=INFO_CACHE_TTL,
+            stale_ttl=INFO_CACHE_STALE_TTL,
+        ))
+
+    def prefetch_video_info(self, urls: Iterable[str], max_workers: int = PREFETCH_WORKERS) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Resolve video info for many URLs concurrently.
+
+        Yields (url, info) pairs in completion order, with info None on
+        failure. URLs naming the same video are looked up once, and lookups
+        already in flight elsewhere are joined rather than repeated.
+        """
+        urls_by_key: Dict[str, list] = {}
+        for url in urls:
+            urls_by_key.setdefault(self._cache_key(url), []).append(url)
+        if not urls_by_key:
+            return
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls_by_key)))) as executor:
+            futures = {
+                executor.submit(self.get_video_info, key_urls[0]): key_urls
+                for key_urls in urls_by_key.values()
             }
+            try:
+                for future in as_completed(futures):
+                    try:
+                        info = future.result()
+                    except Exception as e:
+                        logging.error(f"Error prefetching video info for {futures[future][0]}: {e}")
+                        info = None
+                    for url in futures[future]:
+                        yield url, info
+            finally:
+                # Stop lookups that have not started if the caller stops early
+                for future in futures:
+                    future.cancel()
 
-            # Try to get cookies from cookie manager
-            cookie_file = cookie_manager.get_cookies()
-            if cookie_file and os.path.exists(cookie_file):
-                logging.info(f"Using cookie file: {cookie_file}")
-                ydl_opts['cookiefile'] = cookie_file
-            else:
-                logging.info("No cookie file found, using browser cookies")
-                ydl_opts['cookiesfrombrowser'] = ('chrome',)
+    def get_prefetch_stats(self) -> Dict:
+        """Lookups executed vs. lookups that joined one already in flight"""
+        return self._info_flight.get_stats()
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                logging.info("Extracting video info...")
-                try:
-                    # First try to just extract the video ID and basic info
+    def _fetch_video_info(self, url: str) -> Optional[Dict]:
+        """Fetch video information from the network"""
+        try:
+            logging.info(f"Starting to fetch video info for URL: {url}")
+
+            try:
+                with ydl_pool.session(self._get_info_opts()) as ydl:
+                    logging.info("Extracting video info...")
+                    # Just extract the video ID and basic info
                     basic_info = ydl.extract_info(url, download=False, process=False)
-                    logging.info(f"Basic info extracted: {basic_info}")
-                    
-                    if basic_info:
-                        video_info = {
-                            'title': basic_info.get('title', 'Unknown Title'),
-                            'author': basic_info.get('uploader', basic_info.get('channel', 'Unknown Channel')),
-                            'duration': basic_info.get('duration', 0),
-                            'thumbnail': basic_info.get('thumbnail', '')
-                        }
-                        
-                        # If no thumbnail, try to get it from video ID
-                        if not video_info['thumbnail'] and basic_info.get('id'):
-                            video_info['thumbnail'] = f"https://img.youtube.com/vi/{basic_info['id']}/maxresdefault.jpg"
-                        
-                        logging.info(f"Successfully extracted video info: {video_info}")
-                        return video_info
-                    else:
-                        logging.error("No basic info found")
-                        return None
-                        
-                except yt_dlp.utils.ExtractorError as e:
-                    if any(msg in str(e).lower() for msg in ["sign in", "age", "confirm your age", "bot"]):
-                        logging.warning("Access restricted or bot detection. Clearing cookies and retrying...")
-                        cookie_manager.clear_cookies()
-                        ydl_opts['cookiesfrombrowser'] = ('chrome',)
-                        basic_info = ydl.extract_info(url, download=False, process=False)
-                        if basic_info:
-                            video_info = {
-                                'title': basic_info.get('title', 'Unknown Title'),
-                                'author': basic_info.get('uploader', basic_info.get('channel', 'Unknown Channel')),
-                                'duration': basic_info.get('duration', 0),
-                                'thumbnail': basic_info.get('thumbnail', '')
-                            }
-                            if not video_info['thumbnail'] and basic_info.get('id'):
-                                video_info['thumbnail'] = f"https://img.youtube.com/vi/{basic_info['id']}/maxresdefault.jpg"
-                            return video_info
+            except yt_dlp.utils.ExtractorError as e:
+                if not self._is_access_restricted(e):
                     raise
+                logging.warning("Access restricted or bot detection. Clearing cookies and retrying...")
+                self._reset_sessions()
+                with ydl_pool.session(self._get_info_opts()) as ydl:
+                    basic_info = ydl.extract_info(url, download=False, process=False)
+
+            if not basic_info:
+                logging.error("No basic info found")
+                return None
+
+            if basic_info.get('formats'):
+                self._remember_extraction(url, basic_info)
+            video_info = self._to_video_info(basic_info)
+            logging.info(f"Successfully extracted video info: {video_info}")
+            return video_info
 
         except Exception as e:
             logging.error(f"Error getting video info: {str(e)}")
@@ -229,6 +331,97 @@ class YouTubeAPI:
             logging.error(f"Error details: {str(e)}")
             return None
 
+    def _remember_extraction(self, url: str, info: Dict) -> None:
+        with self._extractions_lock:
+            key = self._cache_key(url)
+            self._extractions[key] = info
+            self._extractions.move_to_end(key)
+            while len(self._extractions) > EXTRACTION_CACHE_SIZE:
+                self._extractions.popitem(last=False)
+
+    def get_extracted_info(self, url: str) -> Optional[Dict]:
+        """Return the full extraction made for url's preview, if its stream URLs are still valid.
+
+        Pass it to download_video as extracted_info to skip extracting again.
+        """
+        with self._extractions_lock:
+            info = self._extractions.get(self._cache_key(url))
+        return info if info is not None and self.is_extraction_fresh(info) else None
+
+    @staticmethod
+    def stream_urls_expire(info: Dict) -> Optional[int]:
+        """Earliest expiry (unix time) of the signed format URLs in info, if they carry one"""
+        expiries = []
+        for fmt in info.get('formats') or []:
+            for url in (fmt.get('url'), fmt.get('manifest_url')):
+                match = STREAM_EXPIRE_RE.search(url or '')
+                if match:
+                    expiries.append(int(match.group(1)))
+        return min(expiries) if expiries else None
+
+    def is_extraction_fresh(self, info: Dict) -> bool:
+        """Check whether info's stream URLs stay valid long enough to download"""
+        expires = self.stream_urls_expire(info)
+        # Without a known expiry the URLs cannot be trusted
+        return expires is not None and expires - time.time() > STREAM_URL_EXPIRY_MARGIN
+
+    def get_handoff_stats(self) -> Dict:
+        """Downloads that reused a preview extraction vs. ones that extracted again"""
+        with self._extractions_lock:
+            return dict(self._handoff_stats, held=len(self._extractions))
+
+    def _count_handoff(self, name: str) -> None:
+        with self._extractions_lock:
+            self._handoff_stats[name] += 1
+
+    def iter_playlist_entries(self, url: str, cancel_token: Optional[CancelToken] = None) -> Iterator[Dict]:
+        """Lazily yield the videos of a playlist or channel URL.
+
+        Uses flat extraction, so entries are produced page by page as YouTube
+        returns them instead of being collected into a list first. Stops early
+        (raising DownloadCancelled) once cancel_token is cancelled.
+        """
+        ydl_opts = self._get_yt_dlp_opts(download=False)
+        ydl_opts.update({
+            'extract_flat': 'in_playlist',
+            'lazy_playlist': True,
+            'skip_download': True,
+        })
+        with ydl_pool.session(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+            yield from self._iter_flat_entries(ydl, info, cancel_token)
+
+    def _iter_flat_entries(self, ydl, info: Optional[Dict], cancel_token: Optional[CancelToken],
+                           depth: int = 0) -> Iterator[Dict]:
+        """Walk a flat ie_result, following channel tabs and nested playlists"""
+        if not info:
+            return
+        result_type = info.get('_type', 'video')
+
+        if result_type in ('playlist', 'multi_video'):
+            for entry in info.get('entries') or []:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                if entry:
+                    yield from self._iter_flat_entries(ydl, entry, cancel_token, depth + 1)
+            return
+
+        if result_type in ('url', 'url_transparent') and info.get('ie_key') != 'Youtube':
+            # Channel roots and tabs resolve to further playlists
+            if depth >= 3:
+                return
+            nested = ydl.extract_info(info['url'], download=False, process=False)
+            yield from self._iter_flat_entries(ydl, nested, cancel_token, depth + 1)
+            return
+
+        video_id = info.get('id')
+        yield {
+            'id': video_id,
+            'url': canonical_video_url(video_id) if video_id else info.get('url'),
+            'title': info.get('title') or 'Unknown Title',
+            'duration': info.get('duration') or 0,
+        }
+
     def validate_url(self, url: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
         """Validate YouTube URL and get video info"""
         try:
@@ -245,24 +438,25 @@ class YouTubeAPI:
             return False, None, str(e)
 
     def _configure_download(self, format: str, quality: str) -> Tuple[str, list]:
-        """Configure format based on quality and format type"""
-        if format.lower() == 'mp3':
-            format_str = 'bestaudio/best'
-            postprocessors = [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '320',
-            }]
+        """Configure format based on quality and format type.
+
+        format is "mp4" or one of the AUDIO_OUTPUTS codecs, for which quality is
+        the audio quality setting (e.g. "320kbps").
+        """
+        if format.lower() in AUDIO_OUTPUTS:
+            # Prefer a stream that can be copied into the requested codec; the
+            # audio is extracted after the download (see transcode_planner)
+            format_str = audio_format_selector(format.lower())
+            postprocessors = []
         else:
             if quality.lower() in ['best', 'highest']:
                 format_str = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'
             else:
                 height = quality.replace('p', '')
                 format_str = f'bestvideo[height<={height}][ext=mp4]+bestaudio[ext=m4a]/best[height<={height}][ext=mp4]/best'
-            postprocessors = [{
-                'key': 'FFmpegVideoConvertor',
-                'preferedformat': 'mp4',
-            }]
+            # Conversion to mp4 is planned per file after the download
+            # (see transcode_planner) instead of always re-encoding
+            postprocessors = []
         return format_str, postprocessors
 
     def download_video(
@@ -272,13 +466,87 @@ class YouTubeAPI:
         format: str = 'mp4',
         quality: str = 'best',
         progress_callback: Optional[Callable[[float], None]] = None,
+        cancel_token: Optional[CancelToken] = None,
+        phase_callback: Optional[Callable[[str, Dict], None]] = None,
+        progress_hook: Optional[Callable[[Dict], None]] = None,
+        extracted_info: Optional[Dict] = None,
+        interactive: bool = False,
+        info_callback: Optional[Callable[[Dict], None]] = None,
     ) -> str:
-        """Download video using yt-dlp with an optional progress callback."""
+        """Download video using yt-dlp with an optional progress callback.
+
+        If cancel_token is cancelled the transfer is aborted from the progress
+        hook, running ffmpeg processes are killed, partial files are removed and
+        yt_dlp.utils.DownloadCancelled is raised.
+
+        phase_callback(phase, details) is called when the job moves between the
+        "extracting", "downloading" and "postprocessing" phases, and again for
+        every new file that starts downloading. progress_hook receives the raw
+        yt-dlp progress dicts; it must be cheap since it runs for every chunk.
+
+        extracted_info is a full extraction of url (see get_extracted_info);
+        while its stream URLs are valid the download starts from it instead
+        of extracting the video again.
+
+        DASH/HLS formats are fetched over several connections chosen by
+        fragment_tuner; progress dicts of fragmented files carry the job's
+        counters under 'fragment_stats'.
+
+        The transfer is paced by bandwidth_scheduler; interactive downloads
+        (ones the user is waiting on) preempt background ones. Progress dicts
+        carry the job's allocated and measured rate under 'bandwidth'.
+
+        info_callback receives the final yt-dlp info dict (id, title,
+        channel, uploader, ...) of a successful download before the output
+        path is returned.
+        """
+        fragments = fragment_tuner.acquire()
+        bandwidth = bandwidth_scheduler.register(interactive=interactive)
         try:
             os.makedirs(output_path, exist_ok=True)
             format_str, postprocessors = self._configure_download(format, quality)
+            # Checked now rather than when queued: the job may have waited a while
+            handoff = None
+            if extracted_info is not None:
+                if self.is_extraction_fresh(extracted_info):
+                    handoff = extracted_info
+                else:
+                    self._count_handoff('expired')
+            current_file = {'tmpfilename': None, 'ydl': None}
+
+            def report_phase(phase: str, details: Dict) -> None:
+                if phase_callback:
+                    try:
+                        phase_callback(phase, details)
+                    except Exception as e:
+                        logging.error(f"Error in phase callback: {e}")
 
-            def progress_hook(d):
+            def ydl_progress_hook(d):
+                if cancel_token:
+                    cancel_token.track_path(d.get('tmpfilename'))
+                    cancel_token.track_path(d.get('filename'))
+                    cancel_token.raise_if_cancelled()
+                bandwidth_scheduler.throttle(bandwidth, d, cancel_token)
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                d['bandwidth'] = bandwidth_scheduler.job_stats(bandwidth)
+                connections = fragment_tuner.record_progress(fragments, d)
+                if connections and current_file['ydl'] is not None:
+                    # Read by yt-dlp when the next file (e.g. the audio stream) starts
+                    current_file['ydl'].params['concurrent_fragment_downloads'] = connections
+                if d.get('fragment_count'):
+                    d['fragment_stats'] = fragment_tuner.job_stats(fragments)
+                if d['status'] == 'downloading' and d.get('tmpfilename') != current_file['tmpfilename']:
+                    current_file['tmpfilename'] = d.get('tmpfilename')
+                    report_phase('downloading', {
+                        'filename': d.get('filename'),
+                        'tmpfilename': d.get('tmpfilename'),
+                    })
+                if progress_hook:
+                    try:
+                        progress_hook(d)
+                    except Exception as e:
+                        logging.error(f"Error in progress hook: {e}")
                 if d['status'] == 'downloading' and progress_callback:
                     try:
                         total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
@@ -289,44 +557,230 @@ class YouTubeAPI:
                     except Exception as e:
                         logging.error(f"Error in progress callback: {e}")
 
-            ydl_opts = self._get_yt_dlp_opts(download=True)
-            ydl_opts.update({
-                'format': format_str,
-                'outtmpl': os.path.join(output_path, '%(title)s.%(ext)s'),
-                'progress_hooks': [progress_hook],
-                'postprocessors': postprocessors,
-                'merge_output_format': 'mp4',
-                'sleep_interval': 1,
-                'max_sleep_interval': 5,
-                'ignoreerrors': True,
-                'fragment_retries': 10,
-            })
+            def build_opts() -> Dict:
+                ydl_opts = self._get_yt_dlp_opts(download=True)
+                ydl_opts.update({
+                    'format': format_str,
+                    'outtmpl': '%(title)s.%(ext)s',
+                    'postprocessors': postprocessors,
+                    'merge_output_format': 'mp4',
+                    'sleep_interval': 1,
+                    'max_sleep_interval': 5,
+                    'ignoreerrors': True,
+                    'fragment_retries': 10,
+                    'http_chunk_size': HTTP_CHUNK_SIZE,
+                })
+                return ydl_opts
 
-            try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
+            def postprocessor_hook(d):
+                if cancel_token:
+                    cancel_token.track_path(d.get('info_dict', {}).get('filepath'))
+                    cancel_token.raise_if_cancelled()
+                if d.get('status') == 'started':
+                    report_phase('postprocessing', {'postprocessor': d.get('postprocessor')})
+
+            def run_download(ydl_opts: Dict, handoff: Optional[Dict] = None) -> str:
+                with ydl_pool.session(
+                    ydl_opts,
+                    overrides={
+                        'paths': {'home': output_path},
+                        'concurrent_fragment_downloads': fragments.connections,
+                        # yt-dlp calls the sleep function once per fragment retry
+                        'retry_sleep_functions': {'fragment': lambda n: fragment_tuner.record_retry(fragments)},
+                    },
+                    progress_hooks=[ydl_progress_hook],
+                    postprocessor_hooks=[postprocessor_hook],
+                ) as ydl, bind_token(cancel_token):
+                    current_file['ydl'] = ydl
+                    if handoff is not None:
+                        self._count_handoff('reused')
+                        # Processing mutates the dict; keep the held extraction intact
+                        info = ydl.process_ie_result(copy.deepcopy(handoff), download=True)
+                    else:
+                        self._count_handoff('extracted')
+                        info = ydl.extract_info(url, download=True)
+                    # A killed ffmpeg is reported as a postprocessing error,
+                    # which ignoreerrors swallows
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
                     if not info:
                         raise Exception("Failed to download video")
-                    ext = "mp3" if format.lower() == "mp3" else "mp4"
-                    return os.path.join(output_path, f"{info['title']}.{ext}")
+                    download = (info.get('requested_downloads') or [info])[0]
+                    if format.lower() in AUDIO_OUTPUTS:
+                        plan = transcode_planner.plan_audio(download, format.lower())
+                        report_phase('postprocessing', {'postprocessor': f"Extract audio ({plan['path']})"})
+                        result = transcode_planner.apply_audio(
+                            download, download['filepath'], format.lower(), quality, cancel_token)
+                    else:
+                        plan = transcode_planner.plan(download)
+                        report_phase('postprocessing', {'postprocessor': f"Transcode ({plan['path']})"})
+                        result = transcode_planner.apply(download, download['filepath'], cancel_token)
+                    if info_callback:
+                        try:
+                            info_callback(info)
+                        except Exception as e:
+                            logging.error(f"Error in info callback: {e}")
+                    return result['filepath']
+
+            if handoff is None:
+                report_phase('extracting', {})
+            try:
+                return run_download(build_opts(), handoff)
             except yt_dlp.utils.ExtractorError as e:
-                if any(msg in str(e).lower() for msg in ["sign in", "age", "confirm your age", "bot"]):
+                if self._is_access_restricted(e):
                     logging.warning("Access restricted or bot detection. Clearing cookies and retrying...")
                     # Clear cookies to force refresh
-                    cookie_manager.clear_cookies()
+                    self._reset_sessions()
                     # Retry with fresh options
-                    ydl_opts = self._get_yt_dlp_opts(download=True)
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        info = ydl.extract_info(url, download=True)
-                        if not info:
-                            raise Exception("Failed to download video")
-                        ext = "mp3" if format.lower() == "mp3" else "mp4"
-                        return os.path.join(output_path, f"{info['title']}.{ext}")
+                    return run_download(build_opts())
                 raise
 
+        except yt_dlp.utils.DownloadCancelled:
+            removed = cancel_token.cleanup_files() if cancel_token else 0
+            logging.info(f"Download cancelled for URL: {url}, removed {removed} partial file(s)")
+            raise
         except Exception as e:
             logging.error(f"Error downloading video from URL: {url}, error: {e}")
             raise
+        finally:
+            fragment_tuner.release(fragments)
+            bandwidth_scheduler.unregister(bandwidth)
+
+    def download_clip(
+        self,
+        url: str,
+        start: float,
+        end: float,
+        output_path: str,
+        quality: str = 'best',
+        cancel_token: Optional[CancelToken] = None,
+        progress_hook: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """Download only the start-end seconds of a video.
+
+        Returns a report with the clip's path, the bytes transferred and the
+        size of the full selected formats for comparison.
+        """
+        report = self.download_sections(url, [(start, end)], output_path, quality, cancel_token, progress_hook)
+        section = report['sections'][0]
+        return {
+            'filepath': section['filepath'],
+            'start': start,
+            'end': end,
+            'bytes_transferred': report['bytes_transferred'],
+            'full_size': report['full_size'],
+            'transfer_ratio': report['transfer_ratio'],
+            'elapsed': report['elapsed'],
+        }
+
+    def download_sections(
+        self,
+        url: str,
+        ranges: List[Tuple[float, float]],
+        output_path: str,
+        quality: str = 'best',
+        cancel_token: Optional[CancelToken] = None,
+        progress_hook: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """Download only the given (start, end) second ranges of a video.
+
+        yt-dlp hands time ranges to ffmpeg, which seeks in the remote streams
+        (HTTP range requests / only the covering fragments) and stream-copies
+        each section, so the rest of the video is never transferred. All
+        ranges share one extraction. Cuts land on the keyframes ffmpeg seeks
+        to.
+
+        Returns a report with one entry per section (filepath, start, end,
+        bytes), the total bytes transferred and the size of the full selected
+        formats for comparison.
+        """
+        if not ranges or any(end <= start for start, end in ranges):
+            raise ValueError("Every section must end after it starts")
+        # ffmpeg fetches the sections itself, so this job is not paced; it
+        # still holds background downloads to their minimum while it runs
+        bandwidth = bandwidth_scheduler.register(interactive=True)
+        try:
+            os.makedirs(output_path, exist_ok=True)
+            format_str, _ = self._configure_download('mp4', quality)
+            started = time.monotonic()
+
+            def ydl_progress_hook(d):
+                if cancel_token:
+                    cancel_token.track_path(d.get('tmpfilename'))
+                    cancel_token.track_path(d.get('filename'))
+                    cancel_token.raise_if_cancelled()
+                if progress_hook:
+                    try:
+                        progress_hook(d)
+                    except Exception as e:
+                        logging.error(f"Error in progress hook: {e}")
+
+            def build_opts() -> Dict:
+                ydl_opts = self._get_yt_dlp_opts(download=True)
+                ydl_opts.update({
+                    'format': format_str,
+                    'outtmpl': '%(title)s [%(section_start)d-%(section_end)d].%(ext)s',
+                    'merge_output_format': 'mp4',
+                    'noplaylist': True,
+                    'fragment_retries': 10,
+                })
+                return ydl_opts
+
+            def run_download(ydl_opts: Dict) -> Dict:
+                with ydl_pool.session(
+                    ydl_opts,
+                    overrides={
+                        'paths': {'home': output_path},
+                        'download_ranges': yt_dlp.utils.download_range_func(None, list(ranges)),
+                    },
+                    progress_hooks=[ydl_progress_hook],
+                ) as ydl, bind_token(cancel_token):
+                    info = ydl.extract_info(url, download=True)
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                if not info or len(info.get('requested_downloads') or []) < len(ranges):
+                    raise Exception("Failed to download clip sections")
+                return info
+
+            try:
+                info = run_download(build_opts())
+            except yt_dlp.utils.ExtractorError as e:
+                if not self._is_access_restricted(e):
+                    raise
+                logging.warning("Access restricted or bot detection. Clearing cookies and retrying...")
+                self._reset_sessions()
+                info = run_download(build_opts())
+
+            # Stream copy writes what it reads, so each section's size is what
+            # was transferred for it (give or take container overhead)
+            sections = [{
+                'filepath': download['filepath'],
+                'start': download.get('section_start') or 0,
+                'end': download.get('section_end'),
+                'bytes': os.path.getsize(download['filepath']),
+            } for download in info['requested_downloads']]
+            transferred = sum(section['bytes'] for section in sections)
+            formats = info.get('requested_formats') or [info]
+            full_size = sum(f.get('filesize') or f.get('filesize_approx') or 0 for f in formats) or None
+            report = {
+                'sections': sections,
+                'bytes_transferred': transferred,
+                'full_size': full_size,
+                'transfer_ratio': transferred / full_size if full_size else None,
+                'elapsed': time.monotonic() - started,
+            }
+            logging.info(f"Sections downloaded: {report}")
+            return report
+
+        except yt_dlp.utils.DownloadCancelled:
+            removed = cancel_token.cleanup_files() if cancel_token else 0
+            logging.info(f"Clip cancelled for URL: {url}, removed {removed} partial file(s)")
+            raise
+        except Exception as e:
+            logging.error(f"Error downloading clip from URL: {url}, error: {e}")
+            raise
+        finally:
+            bandwidth_scheduler.unregister(bandwidth)
 
 # Global instance
 api = YouTubeAPI()
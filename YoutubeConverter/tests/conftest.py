@@ -0,0 +1,47 @@
+import os
+import sys
+import subprocess
+import pytest
+
+# Modules import each other from the application directory (from services.x import y)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeProcesses:
+    """Scripted stand-ins for the processes subprocess.Popen would start.
+
+    respond(args) returns (stdout, stderr, returncode) for a command. Like a
+    real process, output only reaches the caller through the streams that
+    were piped; the rest would have gone to the console.
+    """
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.respond = lambda args: ('', '', 0)
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    fake = FakeProcesses()
+
+    def init(self, args, *remaining, **kwargs):
+        self.args = args
+        self.pid = 0
+        self.stdin = self.stdout = self.stderr = None
+        self._child_created = False
+        self._kwargs = kwargs
+        fake.calls.append((args, kwargs))
+        self._output, self._errors, self.returncode = fake.respond(args)
+
+    def communicate(self, input=None, timeout=None):
+        return (
+            self._output if self._kwargs.get('stdout') == subprocess.PIPE else None,
+            self._errors if self._kwargs.get('stderr') == subprocess.PIPE else None,
+        )
+
+    monkeypatch.setattr(subprocess.Popen, '__init__', init)
+    monkeypatch.setattr(subprocess.Popen, 'communicate', communicate)
+    monkeypatch.setattr(subprocess.Popen, 'wait', lambda self, timeout=None: self.returncode)
+    monkeypatch.setattr(subprocess.Popen, 'poll', lambda self: self.returncode)
+    monkeypatch.setattr(subprocess.Popen, 'kill', lambda self, *args, **kwargs: None)
+    return fake
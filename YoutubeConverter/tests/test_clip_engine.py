@@ -0,0 +1,39 @@
+import json
+import subprocess
+import pytest
+from services.clip_engine import ClipEngine, ClipEngineError
+
+STREAMS = json.dumps({'streams': [
+    {'index': 0, 'codec_type': 'video', 'codec_name': 'h264', 'pix_fmt': 'yuv420p'},
+    {'index': 1, 'codec_type': 'audio', 'codec_name': 'aac'},
+]})
+PACKETS = "0.000000,K__\n0.033367,___\n2.002000,K__\n2.035367,___\n4.004000,K_\nN/A,K__\n"
+
+
+@pytest.fixture
+def engine():
+    engine = ClipEngine()
+    engine._ffmpeg = ('ffmpeg', 'ffprobe')
+    return engine
+
+
+def ffprobe(args):
+    if 'stream=index,codec_type,codec_name,pix_fmt' in args:
+        return STREAMS, '', 0
+    return PACKETS, '', 0
+
+
+def test_probe_reads_streams_and_keyframes(engine, processes):
+    processes.respond = ffprobe
+    probe = engine.probe('clip.mp4')
+    assert probe['video']['codec_name'] == 'h264'
+    assert probe['has_audio']
+    assert probe['keyframes'] == [0.0, 2.002, 4.004]
+    for _, kwargs in processes.calls:
+        assert kwargs['stdin'] == subprocess.DEVNULL
+
+
+def test_failure_reports_stderr(engine, processes):
+    processes.respond = lambda args: ('', 'clip.mp4: Invalid data found when processing input\n', 1)
+    with pytest.raises(ClipEngineError, match='ffprobe failed: clip.mp4: Invalid data'):
+        engine.probe('clip.mp4')
@@ -0,0 +1,54 @@
+import queue
+from utils.debounced_lookup import DebouncedLookup
+
+
+class FakeWidget:
+    """Collects after() callbacks so a test runs the Tk event loop by hand"""
+
+    def __init__(self) -> None:
+        self.timers = {}
+        self.idle = queue.Queue()
+
+    def after(self, ms, callback):
+        if ms == 0:
+            # Posted from the lookup thread
+            self.idle.put(callback)
+            return None
+        timer = f"after#{len(self.timers)}"
+        self.timers[timer] = callback
+        return timer
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def fire_timers(self):
+        timers, self.timers = self.timers, {}
+        for callback in timers.values():
+            callback()
+
+    def run_delivery(self):
+        self.idle.get(timeout=5)()
+
+
+def test_only_the_settled_value_is_looked_up():
+    widget, results = FakeWidget(), []
+    lookup = DebouncedLookup(widget, str.upper, lambda value, result: results.append(result))
+    for value in ('a', 'ab', 'abc'):
+        lookup.submit(value)
+    widget.fire_timers()
+    widget.run_delivery()
+    assert results == ['ABC']
+
+
+def test_editing_back_to_the_shown_value_shows_it_again():
+    widget, results = FakeWidget(), []
+    lookup = DebouncedLookup(widget, str.upper, lambda value, result: results.append((value, result)))
+    lookup.submit('abc')
+    widget.fire_timers()
+    widget.run_delivery()
+
+    # A new value starts waiting (the caller shows its loading state), then the edit is undone
+    lookup.submit('abcd')
+    lookup.submit('abc')
+    assert widget.timers == {}
+    assert results == [('abc', 'ABC'), ('abc', 'ABC')]
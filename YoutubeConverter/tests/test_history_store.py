@@ -0,0 +1,48 @@
+import sqlite3
+import pytest
+from services.history_store import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / 'history.db'), str(tmp_path / 'downloads.json'))
+
+
+def entry(path, title, channel='', timestamp=1.0):
+    return {'path': path, 'title': title, 'channel': channel, 'format': 'Video', 'timestamp': timestamp}
+
+
+def test_search_ranks_title_matches_first_and_pages(store):
+    store.add_many([
+        entry('/a', 'Studio session', channel='Jazz radio', timestamp=1),
+        entry('/b', 'Jazz night', timestamp=2),
+        entry('/c', 'Rock night', timestamp=3),
+    ] + [entry(f'/x{i}', f'Jazz standards {i}', timestamp=10 + i) for i in range(5)])
+    results = store.search('jaz')
+    assert len(results) == 7
+    titles = [row['title'] for row in results.page(0, 7)]
+    assert titles[-1] == 'Studio session'
+    assert [row['title'] for row in results.page(2, 2)] == titles[2:4]
+
+
+def test_search_follows_adds_and_removes(store):
+    assert not len(store.search('caf'))
+    store.add(entry('/a', 'Café live'))
+    results = store.search('cafe')
+    assert [row['path'] for row in results.page(0, 10)] == ['/a']
+    store.remove('/a')
+    assert not len(store.search('cafe'))
+
+
+def test_history_without_the_fts_table_is_indexed(tmp_path):
+    db_path = str(tmp_path / 'history.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE downloads (id INTEGER PRIMARY KEY, video_id TEXT, title TEXT NOT NULL, channel TEXT, "
+        "format TEXT, quality TEXT, size INTEGER, path TEXT NOT NULL UNIQUE, url TEXT, timestamp REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO downloads (title, path, timestamp) VALUES ('Old upload', '/old', 1)")
+    conn.commit()
+    conn.close()
+    store = HistoryStore(db_path, str(tmp_path / 'downloads.json'))
+    assert [row['path'] for row in store.search('old').page(0, 10)] == ['/old']
@@ -0,0 +1,12 @@
+import json
+from utils.settings_manager import SettingsManager
+
+
+def test_old_mp3_default_format_loads_as_audio(tmp_path):
+    settings_file = tmp_path / 'settings.json'
+    settings_file.write_text(json.dumps({'default_format': 'MP3', 'audio_format': 'MP3'}))
+    manager = SettingsManager()
+    manager.settings_file = str(settings_file)
+    assert manager.get_setting('default_format') == 'Audio'
+    # Only the renamed format option changes
+    assert manager.get_setting('audio_format') == 'MP3'
@@ -0,0 +1,25 @@
+from io import BytesIO
+from PIL import Image
+from services.thumbnail_service import ThumbnailService, thumbnail_variant
+
+
+def jpeg(size):
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def test_jpeg_is_decoded_near_the_target_size(tmp_path):
+    service = ThumbnailService(cache_dir=str(tmp_path))
+    image = service._decode(jpeg((1280, 720)), (180, 120), False)
+    assert image.size == (180, 120)
+    decoded = service.get_stats()['last_decode']
+    # The draft scale stays at or above the target, a fraction of the source
+    assert decoded['decoded_size'] == (320, 180)
+    assert decoded['decoded_bytes'] == 320 * 180 * 3
+
+
+def test_small_targets_use_the_small_youtube_variant():
+    url = 'https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg'
+    assert thumbnail_variant(url, (180, 120)) == 'https://i.ytimg.com/vi/dQw4w9WgXcQ/mqdefault.jpg'
+    assert thumbnail_variant(url, (640, 360)) == url
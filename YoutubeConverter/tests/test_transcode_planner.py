@@ -0,0 +1,88 @@
+import pytest
+from services.transcode_planner import TranscodePlanner, audio_format_selector, parse_bitrate
+
+
+def audio_info(acodec, ext):
+    return {'vcodec': 'none', 'acodec': acodec, 'ext': ext}
+
+
+class FakeFFmpeg:
+    available = True
+    executable = 'ffmpeg'
+
+
+def ffmpeg(args):
+    # The output file is the last argument
+    open(args[-1], 'wb').close()
+    return '', 'bench: utime=1.250s stime=0.250s rtime=0.800s\n', 0
+
+
+@pytest.fixture
+def planner(monkeypatch, processes):
+    monkeypatch.setattr('services.transcode_planner.FFmpegPostProcessor', FakeFFmpeg)
+    processes.respond = ffmpeg
+    planner = TranscodePlanner()
+    planner.ffmpeg_runs = processes.calls
+    return planner
+
+
+@pytest.mark.parametrize('codec', ['m4a', 'aac'])
+def test_aac_stream_is_copied_into_m4a_and_aac(planner, codec):
+    plan = planner.plan_audio(audio_info('mp4a.40.2', 'm4a'), codec)
+    assert plan['path'] == 'copy'
+
+
+def test_opus_stream_is_copied_into_opus(planner):
+    assert planner.plan_audio(audio_info('opus', 'webm'), 'opus')['path'] == 'copy'
+
+
+def test_mp3_from_opus_is_encoded(planner):
+    plan = planner.plan_audio(audio_info('opus', 'webm'), 'mp3')
+    assert plan['path'] == 'encode'
+    assert plan['acodec'] == 'opus'
+
+
+def test_copy_into_the_same_container_runs_no_ffmpeg(planner, tmp_path):
+    source = tmp_path / 'song.m4a'
+    source.write_bytes(b'audio')
+    result = planner.apply_audio(audio_info('mp4a.40.2', 'm4a'), str(source), 'm4a', '320kbps')
+    assert result['path'] == 'copy'
+    assert result['filepath'] == str(source)
+    assert planner.ffmpeg_runs == []
+    assert planner.get_stats()['audio_copy']['jobs'] == 1
+
+
+def test_copy_into_another_container_stream_copies(planner, tmp_path):
+    source = tmp_path / 'song.webm'
+    source.write_bytes(b'audio')
+    result = planner.apply_audio(audio_info('opus', 'webm'), str(source), 'opus', '320kbps')
+    assert result['filepath'] == str(tmp_path / 'song.opus')
+    assert planner.ffmpeg_runs[0][0][-3:-1] == ['-c:a', 'copy']
+    assert result['cpu_seconds'] == 1.5
+    assert not source.exists()
+
+
+def test_encode_uses_the_quality_setting(planner, tmp_path):
+    source = tmp_path / 'song.webm'
+    source.write_bytes(b'audio')
+    result = planner.apply_audio(audio_info('opus', 'webm'), str(source), 'mp3', '192kbps')
+    assert result['path'] == 'encode'
+    assert ['-c:a', 'libmp3lame', '-b:a', '192k'] == planner.ffmpeg_runs[0][0][-5:-1]
+
+
+def test_ffmpeg_failure_reports_stderr(planner, processes, tmp_path):
+    processes.respond = lambda args: ('', 'Unknown encoder libmp3lame\n', 1)
+    source = tmp_path / 'song.webm'
+    source.write_bytes(b'audio')
+    with pytest.raises(Exception, match='audio encode: ffmpeg failed: Unknown encoder libmp3lame'):
+        planner.apply_audio(audio_info('opus', 'webm'), str(source), 'mp3', '192kbps')
+
+
+def test_format_selector_prefers_copyable_streams():
+    assert audio_format_selector('m4a') == 'bestaudio[acodec^=mp4a]/bestaudio[acodec^=aac]/bestaudio/best'
+    assert audio_format_selector('opus') == 'bestaudio[acodec^=opus]/bestaudio/best'
+
+
+@pytest.mark.parametrize('quality, expected', [('320kbps', 320), ('128 kbps', 128), ('', 320), (None, 320)])
+def test_parse_bitrate(quality, expected):
+    assert parse_bitrate(quality) == expected
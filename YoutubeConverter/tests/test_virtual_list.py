@@ -0,0 +1,46 @@
+import tkinter
+import pytest
+import customtkinter as ctk
+from components.virtual_list import VirtualList
+
+COUNT = 1000
+
+
+@pytest.fixture
+def root():
+    try:
+        root = ctk.CTk()
+    except tkinter.TclError as e:
+        pytest.skip(f"no display: {e}")
+    root.geometry("400x300")
+    yield root
+    root.destroy()
+
+
+def make_list(root):
+    virtual_list = VirtualList(
+        root,
+        row_height=20,
+        create_row=lambda parent: ctk.CTkLabel(parent, text=""),
+        bind_row=lambda row, item: row.configure(text=item['title']),
+    )
+    virtual_list.pack(fill="both", expand=True)
+    virtual_list.set_source(COUNT, lambda offset, limit: [
+        {'title': f"Download {i}"} for i in range(offset, min(offset + limit, COUNT))
+    ])
+    return virtual_list
+
+
+def test_destroying_a_list_keeps_the_other_wheel_bindings(root):
+    other_scrolls = []
+    # Like a scrollable frame elsewhere in the app
+    root.bind_all("<Button-5>", lambda event: other_scrolls.append(event), add="+")
+    first, second = make_list(root), make_list(root)
+    root.update()
+
+    first.destroy()
+    root.update()
+    second.viewport.event_generate("<Button-5>")
+
+    assert second._top == 60
+    assert len(other_scrolls) == 1
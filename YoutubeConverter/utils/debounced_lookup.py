@@ -0,0 +1,102 @@
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+
+class DebouncedLookup:
+    """Runs a slow lookup for the latest input only, once it has settled.
+
+    submit() restarts a delay_ms timer on every call; when input stops
+    changing, fetch(value) runs on a background thread. Each started lookup
+    gets a generation number and only the newest generation's result is
+    handed to on_result (on the Tk thread); results of superseded lookups are
+    dropped. Editing the input back to the value already shown hands its
+    result to on_result again. All methods must be called from the Tk thread.
+    """
+
+    def __init__(
+        self,
+        widget,
+        fetch: Callable[[str], Any],
+        on_result: Callable[[str, Any], None],
+        delay_ms: int = 400,
+    ) -> None:
+        self.widget = widget
+        self.fetch = fetch
+        self.on_result = on_result
+        self.delay_ms = delay_ms
+        self._pending_after: Optional[str] = None
+        self._pending_value: Optional[str] = None
+        self._current_value: Optional[str] = None
+        self._generation = 0
+        # Generation and result of the lookup last handed to on_result
+        self._delivered_generation = 0
+        self._delivered_result: Any = None
+
+    def submit(self, value: str, immediate: bool = False) -> None:
+        """Schedule a lookup for value, replacing any lookup not yet started"""
+        if not immediate and self.is_tracking(value):
+            # Keys that do not change the text (arrows, modifiers) end up here
+            if value == self._current_value and self._pending_value not in (None, value):
+                # Edited back to the running or shown value: drop the newer lookup
+                self.widget.after_cancel(self._pending_after)
+                self._pending_after = None
+                self._pending_value = None
+                if self._delivered_generation == self._generation:
+                    # Already shown, so no running lookup will restore it
+                    self.on_result(value, self._delivered_result)
+            return
+        if self._pending_after is not None:
+            self.widget.after_cancel(self._pending_after)
+            self._pending_after = None
+
+        if immediate:
+            self._pending_value = None
+            self._start(value)
+        else:
+            self._pending_value = value
+            self._pending_after = self.widget.after(self.delay_ms, lambda: self._start(value))
+
+    def is_tracking(self, value: str) -> bool:
+        """Check whether value is already pending, running or shown"""
+        return value in (self._pending_value, self._current_value)
+
+    def cancel(self) -> None:
+        """Drop the pending lookup and ignore the result of the running one"""
+        if self._pending_after is not None:
+            self.widget.after_cancel(self._pending_after)
+        self._pending_after = None
+        self._pending_value = None
+        self._current_value = None
+        self._generation += 1
+
+    def _start(self, value: str) -> None:
+        self._pending_after = None
+        self._pending_value = None
+        self._current_value = value
+        self._generation += 1
+        generation = self._generation
+
+        def run():
+            try:
+                result = self.fetch(value)
+            except Exception as e:
+                logging.error(f"Error looking up {value}: {e}")
+                result = None
+            try:
+                self.widget.after(0, lambda: self._deliver(generation, value, result))
+            except RuntimeError:
+                # The widget was destroyed while the lookup was running
+                pass
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _deliver(self, generation: int, value: str, result: Any) -> None:
+        if generation != self._generation:
+            return
+        self._delivered_generation = generation
+        self._delivered_result = result
+        if result is None:
+            # Let the same input be retried after a failed lookup
+            self._current_value = None
+        self.on_result(value, result)
@@ -0,0 +1,150 @@
+import time
+import logging
+import threading
+from typing import Dict, Optional, Callable
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds applied when a caller gives none
+DEFAULT_TIMEOUT = (5, 15)
+
+
+class HttpClient:
+    """Shared keep-alive HTTP client for everything that is not yt-dlp.
+
+    One requests.Session with a bounded connection pool per host, so repeated
+    thumbnail and asset fetches reuse TCP/TLS connections. Idempotent requests
+    are retried with exponential backoff on connection errors and 429/5xx
+    responses, every request gets a timeout, and bytes and latency are
+    counted for get_stats().
+    """
+
+    def __init__(
+        self,
+        pool_hosts: int = 10,
+        pool_size_per_host: int = 4,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout=DEFAULT_TIMEOUT,
+    ) -> None:
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # pool_block keeps each host at pool_size_per_host connections
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_size_per_host,
+            max_retries=retry,
+            pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        })
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'errors': 0,
+            'retries': 0,
+            'bytes_received': 0,
+            'latency_total': 0.0,
+        }
+        self._hosts: Dict[str, int] = {}
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session.
+
+        Non-streamed bodies are read (and counted) before returning; for
+        stream=True use iter_content() so the bytes are counted as read.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._stats['requests'] += 1
+                self._stats['errors'] += 1
+            raise
+
+        retries = response.raw.retries.history if getattr(response.raw, 'retries', None) else ()
+        received = 0 if kwargs.get('stream') else len(response.content)
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['retries'] += len(retries)
+            self._stats['bytes_received'] += received
+            # Time until the headers (and, when not streaming, the body) arrived
+            self._stats['latency_total'] += time.monotonic() - started
+            if response.status_code >= 400:
+                self._stats['errors'] += 1
+            self._hosts[host] = self._hosts.get(host, 0) + 1
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def iter_content(self, response: requests.Response, chunk_size: int = 64 * 1024):
+        """Iterate a streamed response body, counting the bytes received"""
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            with self._lock:
+                self._stats['bytes_received'] += len(chunk)
+            yield chunk
+
+    def download_file(
+        self,
+        url: str,
+        path: str,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> int:
+        """Stream url into path and return the number of bytes written"""
+        with self.get(url, stream=True) as response:
+            response.raise_for_status()
+            total = int(response.headers.get('Content-Length') or 0) or None
+            written = 0
+            with open(path, 'wb') as f:
+                for chunk in self.iter_content(response):
+                    f.write(chunk)
+                    written += len(chunk)
+                    if progress_callback:
+                        progress_callback(written, total)
+        return written
+
+    def get_stats(self) -> Dict:
+        """Request, byte and latency counters plus connections opened per host"""
+        with self._lock:
+            stats = dict(self._stats, hosts=dict(self._hosts))
+        latency_total = stats.pop('latency_total')
+        stats['avg_latency'] = round(latency_total / stats['requests'], 4) if stats['requests'] else None
+        # Connections opened by the pooled hosts; far below 'requests' when keep-alive works
+        pools = self._adapter.poolmanager.pools
+        connections = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        stats['connections_opened'] = connections
+        return stats
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# Global instance
+http_client = HttpClient()
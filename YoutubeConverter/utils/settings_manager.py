@@ -1,6 +1,12 @@
 import json
 import os
 
+# Values older versions saved that are no longer among a setting's options
+LEGACY_VALUES = {
+    # The format choices became MP4 and Audio; the audio codec is its own setting
+    'default_format': {'MP3': 'Audio'},
+}
+
 class SettingsManager:
     def __init__(self):
         self.settings_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'settings.json')
@@ -10,7 +16,10 @@ class SettingsManager:
             'audio_format': 'MP3',
             'audio_quality': '320kbps',
             'theme': 'Dark',
-            'always_on_top': False
+            'always_on_top': False,
+            'max_concurrent_downloads': 3,
+            'max_downloads_per_host': 3,
+            'bandwidth_limit': 'Unlimited'
         }
         self.ensure_settings_file()
         
@@ -24,9 +33,13 @@ class SettingsManager:
         """Load settings from file"""
         try:
             with open(self.settings_file, 'r') as f:
-                return json.load(f)
+                settings = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return self.default_settings.copy()
+        for key, renamed in LEGACY_VALUES.items():
+            if settings.get(key) in renamed:
+                settings[key] = renamed[settings[key]]
+        return settings
     
     def save_settings(self, settings):
         """Save settings to file"""
@@ -1,5 +1,5 @@
 import os
-import requests
+from utils.http_client import http_client
 import zipfile
 from pathlib import Path
 import shutil
@@ -16,13 +16,8 @@ def download_ffmpeg():
         url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
         print("Downloading ffmpeg...")
         
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
         zip_path = os.path.join(ffmpeg_dir, "ffmpeg.zip")
-        with open(zip_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        http_client.download_file(url, zip_path)
         
         # Extract ffmpeg
         print("Extracting ffmpeg...")
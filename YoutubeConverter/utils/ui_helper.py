@@ -177,6 +177,27 @@ class UIHelper:
         """
         return t * (2 - t)
 
+    @staticmethod
+    def draft_image(image: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
+        """
+        Prepare a not yet decoded image to be decoded close to target size
+        
+        JPEG images are decoded at 1/2, 1/4 or 1/8 scale when that still
+        covers target_size, which is much faster and smaller than decoding
+        the full image and shrinking it afterwards. Other images are returned
+        unchanged.
+        
+        Args:
+            image: PIL Image object fresh from Image.open
+            target_size: Tuple of (width, height) the image will be resized to
+            
+        Returns:
+            The same PIL Image object
+        """
+        if image.format == 'JPEG':
+            image.draft('RGB', target_size)
+        return image
+
     @staticmethod
     def resize_image(image: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
         """
@@ -205,8 +226,10 @@ class UIHelper:
             new_height = target_height
             new_width = int(target_height * original_aspect)
             
-        # Resize the image
-        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Decode near the final size, then shrink with a cheap integer
+        # reduce before the LANCZOS pass
+        UIHelper.draft_image(image, (new_width, new_height))
+        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=2.0)
         
         # Create a new blank image with the target size
         final_image = Image.new("RGB", target_size, (0, 0, 0))
@@ -0,0 +1,137 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit, parse_qs
+
+# Precompiled patterns, shared by every lookup
+VIDEO_ID_RE = re.compile(r'^[0-9A-Za-z_-]{11}$')
+PLAYLIST_ID_RE = re.compile(r'^[0-9A-Za-z_-]{2,64}$')
+PATH_ID_RE = re.compile(r'^/(?:shorts|embed|live|v|e)/([0-9A-Za-z_-]{11})(?:[/?#]|$)')
+SHORT_PATH_ID_RE = re.compile(r'^/([0-9A-Za-z_-]{11})(?:[/?#]|$)')
+CLOCK_TIME_RE = re.compile(r'^(?:(\d+):)?(\d{1,2}):(\d{1,2})$')
+UNIT_TIME_RE = re.compile(r'^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?$')
+SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*://')
+CHANNEL_PATH_RE = re.compile(
+    r'^/(?:@[\w.-]+|channel/UC[0-9A-Za-z_-]{22}|c/[^/]+|user/[^/]+)'
+    r'(?:/(?:videos|shorts|streams|playlists|featured))?/?$'
+)
+
+YOUTUBE_HOSTS = frozenset({
+    'youtube.com',
+    'www.youtube.com',
+    'm.youtube.com',
+    'music.youtube.com',
+    'gaming.youtube.com',
+    'youtube-nocookie.com',
+    'www.youtube-nocookie.com',
+})
+SHORT_HOSTS = frozenset({'youtu.be', 'www.youtu.be'})
+
+
+class CanonicalURL(NamedTuple):
+    """Normalized identity of a YouTube URL"""
+    video_id: Optional[str]
+    playlist_id: Optional[str]
+    start_time: Optional[int]
+
+
+def parse_timestamp(value: str) -> Optional[int]:
+    """Parse a YouTube timestamp ("90", "90s", "1m30s", "1:30") into seconds"""
+    if not value:
+        return None
+    value = value.strip().lower()
+    match = CLOCK_TIME_RE.match(value)
+    if match:
+        hours, minutes, seconds = match.groups()
+        return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    match = UNIT_TIME_RE.match(value)
+    if match and any(match.groups()):
+        hours, minutes, seconds = match.groups()
+        return int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds or 0)
+    return None
+
+
+@lru_cache(maxsize=2048)
+def parse_youtube_url(url: str) -> Optional[CanonicalURL]:
+    """Parse a YouTube URL without touching the network.
+
+    Handles watch, youtu.be, shorts, embed, live, music, nocookie and playlist
+    URLs plus t/start/time_continue timestamps. Returns None if the URL is not
+    a recognizable YouTube video or playlist link.
+    """
+    if not url or not isinstance(url, str):
+        return None
+    url = url.strip()
+    if not SCHEME_RE.match(url):
+        url = 'https://' + url
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    host = (parts.hostname or '').lower()
+    query = parse_qs(parts.query)
+    # Timestamps may also live in the fragment (#t=1m30s)
+    fragment = parse_qs(parts.fragment)
+
+    video_id = None
+    if host in SHORT_HOSTS:
+        match = SHORT_PATH_ID_RE.match(parts.path)
+        if match:
+            video_id = match.group(1)
+    elif host in YOUTUBE_HOSTS:
+        if parts.path in ('/watch', '/watch/'):
+            video_id = (query.get('v') or [None])[0]
+        else:
+            match = PATH_ID_RE.match(parts.path)
+            if match:
+                video_id = match.group(1)
+    else:
+        return None
+
+    if video_id is not None and not VIDEO_ID_RE.match(video_id):
+        video_id = None
+
+    playlist_id = (query.get('list') or [None])[0]
+    if playlist_id is not None and not PLAYLIST_ID_RE.match(playlist_id):
+        playlist_id = None
+
+    if video_id is None and playlist_id is None:
+        return None
+
+    start_time = None
+    for name in ('t', 'start', 'time_continue'):
+        raw = (query.get(name) or fragment.get(name) or [None])[0]
+        if raw:
+            start_time = parse_timestamp(raw)
+            if start_time is not None:
+                break
+
+    return CanonicalURL(video_id, playlist_id, start_time)
+
+
+def is_collection_url(url: str) -> bool:
+    """Check whether a URL names a playlist or channel rather than one video"""
+    parsed = parse_youtube_url(url)
+    if parsed is not None:
+        return parsed.video_id is None and parsed.playlist_id is not None
+    if not url or not isinstance(url, str):
+        return False
+    url = url.strip()
+    if not SCHEME_RE.match(url):
+        url = 'https://' + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    return (parts.hostname or '').lower() in YOUTUBE_HOSTS and bool(CHANNEL_PATH_RE.match(parts.path))
+
+
+def canonical_video_url(video_id: str) -> str:
+    """Build the canonical watch URL for a video ID"""
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def canonical_playlist_url(playlist_id: str) -> str:
+    """Build the canonical playlist URL for a playlist ID"""
+    return f"https://www.youtube.com/playlist?list={playlist_id}"